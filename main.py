@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from models.AI_Judge.routerai_judgemock import router as judge_router
@@ -6,12 +8,38 @@ from models.MockDebate.routermockdebate import router as mock_debate_router
 from models.POI_Engine.routerpoiengine import router as poi_router
 from models.Speech_Engine.routerspeechengine import router as speech_router
 from models.Body.routerbody import router as body_router
+from models.Motions.routermotions import router as motions_router
+from models.Data.routerdata import router as round_router
+from models.LLM_Engine.clients import close_clients
+from models.LLM_Engine.resilience import LLMError, llm_error_handler
+from models.LLM_Engine import trace
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await close_clients()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(judge_router)
 app.include_router(asian_par_router)
 app.include_router(mock_debate_router)
 app.include_router(poi_router)
 app.include_router(speech_router)
-app.include_router(body_router)
\ No newline at end of file
+app.include_router(body_router)
+app.include_router(motions_router)
+app.include_router(round_router)
+
+app.add_exception_handler(LLMError, llm_error_handler)
+
+
+@app.middleware("http")
+async def report_served_models(request, call_next):
+    """Tells the client which model (or the cache) served each generation in the request."""
+    served = trace.start_trace()
+    response = await call_next(request)
+    if served:
+        response.headers["X-LLM-Served"] = trace.describe(served)
+    return response
@@ -4,17 +4,19 @@ import re
 from rich.console import Console
 from webscout import Llama3Mitril, exceptions
 # from webscout import LLAMA
-from webscout import Sambanova
 from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QLineEdit, QPushButton, QListWidget, QListWidgetItem, QVBoxLayout, QWidget, QHBoxLayout, QTextEdit, QScrollArea
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor, QFont, QTextCursor
 # import fitz  # PyMuPDFimport os
 from rich.console import Console
-from webscout import Sambanova, GoogleSearch
 from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QLineEdit, QPushButton, QListWidget, QListWidgetItem, QVBoxLayout, QWidget, QHBoxLayout, QTextEdit, QScrollArea
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor, QFont, QTextCursor
 
+from models.LLM_Engine.cache import cached_generation, prompt_version
+from models.LLM_Engine.routing import for_call
+from models.LLM_Engine.sanitize import sanitize
+
 console = Console()
 
 import asyncio
@@ -96,40 +98,14 @@ def TextToSpeech(Text, func=lambda r=None:True):
     #
 
     
-    TTS(Text.replace("*", ""), func)
+    TTS(sanitize(Text), func)
     
 BASE_SAVE_DIR = os.getcwd()
 
-def fetch_latest_info(motion):
-    """
-    Fetch recent, real-world facts on the motion using GoogleSearch from webscout.
-    """
-    console.print(f"[bold cyan]Fetching latest facts for:[/bold cyan] {motion}")
-
-    try:
-        google = GoogleSearch(timeout=10, proxies=None, verify=True)
-        text_results = google.text(
-            keywords=motion + " site:un.org OR site:amnesty.org OR site:bbc.com OR site:guardian.com OR site:humanrightswatch.org",
-            region="us",
-            safesearch="moderate",
-            max_results=5
-        )
-
-        if not text_results:
-            return "No recent information available."
-
-        facts = ""
-        for result in text_results[:3]:
-            facts += f"\nTitle: {result.title}\nSummary: {result.description[:300]}\nSource: {result.url}\n---\n"
-        return facts.strip()
-    except Exception as e:
-        console.print(f"[bold red]Error during web search:[/bold red] {e}")
-        return "Could not fetch the latest facts due to an error."
 
-def Speech_Gen(Motion, opening_statement_text, role,rebuttal_speech_text):
+def build_prompt(Motion, opening_statement_text, role,rebuttal_speech_text):
     # time =  int(input("enter the time of the motion : "))
     # side = "Opposition"
-    latest_context = fetch_latest_info(Motion)
     # information = str(information)
 
     system_prompt = f"""
@@ -186,21 +162,48 @@ Now generate your feedback directly to the speaker.
     """
     # Q&A Performance (optional): {qa_text}
 
-    LLAMA3_client_model_1 = Sambanova(
-        is_conversation=True,
-        timeout=1000000,
+    return system_prompt
+
+
+PROMPT_VERSION = prompt_version(build_prompt)
+
+
+@cached_generation("feedback", version=PROMPT_VERSION)
+def Feedback_Gen(Motion, opening_statement_text, role, rebuttal_speech_text):
+    system_prompt = build_prompt(Motion, opening_statement_text, role, rebuttal_speech_text)
+
+    completion = for_call("feedback").chat(
+        messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": Motion}],
         max_tokens=8028,
-        intro=system_prompt,
-        system_prompt=system_prompt,
-        model='Meta-Llama-3.1-8B-Instruct',
-        api_key="8bb1f2ae-f908-42cb-878e-cafacb8fb893"
     )
 
-    speech = LLAMA3_client_model_1.chat(Motion)
-    speech = speech.replace("**", "")
-    speech = speech.replace("*","")
+    return sanitize(completion.text)
+
+
+@cached_generation("feedback", version=PROMPT_VERSION)
+async def Feedback_Gen_async(Motion, opening_statement_text, role, rebuttal_speech_text):
+    system_prompt = build_prompt(Motion, opening_statement_text, role, rebuttal_speech_text)
+
+    completion = await for_call("feedback").achat(
+        messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": Motion}],
+        max_tokens=8028,
+    )
+
+    return sanitize(completion.text)
+
+
+def Speech_Gen(Motion, opening_statement_text, role, rebuttal_speech_text, bypass_cache=False):
+    speech = Feedback_Gen(Motion, opening_statement_text, role, rebuttal_speech_text, bypass_cache=bypass_cache)
     print(speech)
     TTS(speech)
+    return speech
+
+
+async def Speech_Gen_async(Motion, opening_statement_text, role, rebuttal_speech_text, bypass_cache=False):
+    speech = await Feedback_Gen_async(Motion, opening_statement_text, role, rebuttal_speech_text, bypass_cache=bypass_cache)
+    await asyncio.to_thread(TTS, speech)
+    return speech
+
 
 if __name__ == "__main__":
     Motion = input("enter the motion : ")
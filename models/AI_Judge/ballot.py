@@ -0,0 +1,302 @@
+"""
+Typed ballots for the AI judges.
+
+The judges answer in JSON (see `schema_prompt`) with ratings only. `parse_ballot` checks that
+answer and turns it into a Ballot; the totals, winner and ranking are computed from the
+ratings by `models.AI_Judge.scoring`, so callers read them as numbers.
+The emoji-decorated text the judges used to write is rendered from the Ballot on demand.
+
+`judge()` / `ajudge()` make the call in JSON mode and, if the answer does not parse, ask once
+more with the error. A second bad answer is raised as an LLMError ("rejected", HTTP 502).
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+
+from models.LLM_Engine.resilience import LLMError
+
+# Speakers and sides of each judged format. Criteria are rated 1-10 and weighted (in % of
+# the speaker score) by the rubric.
+FORMATS = {
+    "par": {
+        "title": "Debate Evaluation",
+        "sides": ("government", "opposition"),
+        "speakers": {
+            "pm": ("Prime Minister", "government"),
+            "lo": ("Leader of Opposition", "opposition"),
+            "dpm": ("Deputy Prime Minister", "government"),
+            "dlo": ("Deputy Leader of Opposition", "opposition"),
+            "gw": ("Government Whip", "government"),
+            "ow": ("Opposition Whip", "opposition"),
+        },
+        "rubric": {"content": 30, "style": 20, "strategy": 30, "responsiveness": 20},
+        "summary": "Committee Summary",
+    },
+    "mock": {
+        "title": "Mock Debate Evaluation",
+        "sides": ("proposition", "opposition"),
+        "speakers": {
+            "proposition": ("Proposition", "proposition"),
+            "opposition": ("Opposition", "opposition"),
+        },
+        "rubric": {"content": 30, "style": 20, "rebuttals": 30, "responsiveness": 20},
+        "summary": "QnA Round Summary",
+    },
+}
+
+
+class BallotError(ValueError):
+    """The judge's answer is not a valid ballot."""
+
+
+@dataclass
+class ClashSide:
+    result: int
+    reason: str = ""
+
+
+@dataclass
+class Clash:
+    title: str
+    weight: int
+    sides: dict
+
+
+@dataclass
+class SpeakerScore:
+    speaker: str
+    side: str
+    scores: dict
+    reason: str = ""
+
+
+@dataclass
+class Ballot:
+    """The judge's ratings. Totals, the winner and ranks are computed by `scoring`.
+
+    `called` is the side the judge gave the debate to; it only decides level debates.
+    """
+
+    kind: str
+    motion: str
+    clashes: list
+    speakers: list
+    called: str
+    reason: str = ""
+    summary: str = ""
+    rubric: dict = field(default=None)
+
+    def __post_init__(self):
+        if self.rubric is None:
+            self.rubric = dict(FORMATS[self.kind]["rubric"])
+
+    @property
+    def sides(self):
+        return FORMATS[self.kind]["sides"]
+
+    def result(self):
+        """Team totals, winner and speaker ranking, computed from the ratings."""
+        from models.AI_Judge.scoring import rescore
+
+        scores = rescore([self], self.rubric)
+        speakers = FORMATS[self.kind]["speakers"]
+        keys = list(speakers)
+        return {
+            "team_scores": {side: int(total) for side, total in zip(self.sides, scores.teams[0])},
+            "winner": self.sides[scores.winner[0]],
+            "ranking": [
+                {"rank": rank, "speaker": keys[i], "side": speakers[keys[i]][1], "score": float(scores.speakers[0, i])}
+                for rank, i in enumerate(scores.order[0], 1)
+            ],
+        }
+
+    def to_dict(self):
+        return {**asdict(self), **self.result()}
+
+    @classmethod
+    def from_dict(cls, data):
+        data = {key: value for key, value in data.items() if key not in ("team_scores", "winner", "ranking")}
+        data["clashes"] = [
+            Clash(c["title"], c["weight"], {side: ClashSide(**result) for side, result in c["sides"].items()})
+            for c in data["clashes"]
+        ]
+        data["speakers"] = [SpeakerScore(**speaker) for speaker in data["speakers"]]
+        return cls(**data)
+
+    def render(self):
+        """The ballot as the judges used to write it."""
+        spec = FORMATS[self.kind]
+        result = self.result()
+        speakers = {speaker.speaker: speaker for speaker in self.speakers}
+        lines = [
+            "==============================",
+            f"🏛️ {spec['title']}: {self.motion}",
+            "==============================",
+            "",
+            f"🧾 {spec['summary']}:",
+            self.summary or "-",
+            "",
+            "🔍 Clash Analysis:",
+        ]
+        for i, clash in enumerate(self.clashes, 1):
+            lines.append(f"{i}. {clash.title} – Weight: {clash.weight}")
+            for side in self.sides:
+                outcome = clash.sides[side]
+                lines.append(f"   - {side.title()}: {outcome.result:+d} → {outcome.reason}".replace("+0", "0"))
+        lines += ["", "📊 Weighted Team Scores:"]
+        lines += [f"- {side.title()}: {score}" for side, score in result["team_scores"].items()]
+        lines += ["", "🎙️ Speaker Rankings:"]
+        for entry in result["ranking"]:
+            speaker = speakers[entry["speaker"]]
+            criteria = ", ".join(f"{name.title()} {speaker.scores[name]}/10" for name in self.rubric)
+            name = spec["speakers"][entry["speaker"]][0]
+            lines.append(f"{entry['rank']}. {name} – {entry['score']:g}/100 – {speaker.reason} ({criteria})")
+        lines += ["", f"🏆 Verdict: {result['winner'].title()}", f"Reason: {self.reason}"]
+        return "\n".join(lines)
+
+
+def schema_prompt(kind):
+    """The JSON shape the judge must answer with, for its system prompt."""
+    spec = FORMATS[kind]
+    side_a, side_b = spec["sides"]
+    criteria = ", ".join(f'"{name}": 1-10' for name in spec["rubric"])
+    speakers = ",\n    ".join(f'"{key}": {{{criteria}, "reason": "one line"}}' for key in spec["speakers"])
+    return f"""Answer with one JSON object only, no markdown and no text around it, in exactly this shape:
+{{
+  "clashes": [
+    {{"title": "short name of the clash", "weight": 1-5,
+     "{side_a}": {{"result": 1 | 0 | -1, "reason": "brief reason"}},
+     "{side_b}": {{"result": 1 | 0 | -1, "reason": "brief reason"}}}}
+  ],
+  "speakers": {{
+    {speakers}
+  }},
+  "verdict": {{"winner": "{side_a}" | "{side_b}", "reason": "1-2 sentences"}}
+}}
+Weights: 1 = marginal to the motion, 5 = decides the debate. Results: +1 the side won the clash, 0 tie, -1 lost.
+Criteria are rated 1 (very poor) to 10 (outstanding).
+Do not add up scores or rank the speakers: totals, speaker scores and ranks are computed from your ratings."""
+
+
+def _json_object(text):
+    text = text.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise BallotError("no JSON object in the answer")
+    try:
+        return json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise BallotError(f"invalid JSON: {e}") from e
+
+
+def _number(value, low, high, what):
+    try:
+        number = round(float(value))
+    except (TypeError, ValueError):
+        raise BallotError(f"{what} is not a number: {value!r}") from None
+    return max(low, min(high, number))
+
+
+def rubric_override(kind, rubric):
+    """The format's rubric with the weights in `rubric` replaced. Raises ValueError unless
+    `rubric` is a non-empty object of the format's criteria with weights from 0 to 100 that
+    still add up to 100."""
+    default = FORMATS[kind]["rubric"]
+    if not isinstance(rubric, dict) or not rubric:
+        raise ValueError("rubric must be a non-empty object of criterion weights")
+    unknown = [name for name in rubric if name not in default]
+    if unknown:
+        raise ValueError(f"unknown rubric criteria {', '.join(map(repr, unknown))}; expected {', '.join(default)}")
+    for name, weight in rubric.items():
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not 0 <= weight <= 100:
+            raise ValueError(f"rubric weight of {name!r} must be a number from 0 to 100, not {weight!r}")
+    merged = {**default, **rubric}
+    if abs(sum(merged.values()) - 100) > 1e-6:
+        raise ValueError(f"rubric weights must add up to 100, not {sum(merged.values()):g}: {merged}")
+    return merged
+
+
+def parse_ballot(text, kind, motion="", summary=""):
+    """Checks a judge's JSON answer and returns it as a Ballot. Raises BallotError."""
+    spec = FORMATS[kind]
+    data = _json_object(text)
+    if not isinstance(data, dict):
+        raise BallotError("the answer is not a JSON object")
+
+    clashes = []
+    for i, raw in enumerate(data.get("clashes") or [], 1):
+        try:
+            sides = {
+                side: ClashSide(
+                    _number(raw[side]["result"], -1, 1, f"clash {i} {side} result"),
+                    str(raw[side].get("reason", "")),
+                )
+                for side in spec["sides"]
+            }
+            clashes.append(Clash(str(raw.get("title") or f"Clash {i}"), _number(raw["weight"], 1, 5, f"clash {i} weight"), sides))
+        except (KeyError, TypeError, AttributeError) as e:
+            raise BallotError(f"clash {i} is incomplete: {e}") from None
+    if not clashes:
+        raise BallotError("no clashes")
+
+    speakers = []
+    raw_speakers = data.get("speakers") or {}
+    for key, (_, side) in spec["speakers"].items():
+        raw = raw_speakers.get(key)
+        if not isinstance(raw, dict):
+            raise BallotError(f"no scores for {key}")
+        scores = {name: _number(raw.get(name), 1, 10, f"{key} {name}") for name in spec["rubric"]}
+        speakers.append(SpeakerScore(key, side, scores, str(raw.get("reason", ""))))
+
+    verdict = data.get("verdict") or {}
+    called = str(verdict.get("winner", "")).strip().lower()
+    if called not in spec["sides"]:
+        raise BallotError(f"the verdict names no side: {called!r}")
+
+    return Ballot(kind, motion, clashes, speakers, called, str(verdict.get("reason", "")), summary)
+
+
+REPAIR_PROMPT = "Your answer was not a valid ballot ({error}). Answer again with the JSON object only, in exactly the shape given."
+
+
+def _repair(messages, completion, error):
+    return messages + [
+        {"role": "assistant", "content": completion.text},
+        {"role": "user", "content": REPAIR_PROMPT.format(error=error)},
+    ]
+
+
+def _rejected(completion, error):
+    return LLMError("rejected", completion.provider, completion.model, f"invalid ballot: {error}")
+
+
+def judge(call, messages, kind, motion="", summary="", **options):
+    """Asks a RoutedCall for a ballot in JSON mode and parses it."""
+    options.setdefault("response_format", {"type": "json_object"})
+    completion = call.chat(messages, **options)
+    try:
+        return parse_ballot(completion.text, kind, motion, summary)
+    except BallotError as e:
+        completion = call.chat(_repair(messages, completion, e), **options)
+    try:
+        return parse_ballot(completion.text, kind, motion, summary)
+    except BallotError as e:
+        raise _rejected(completion, e) from e
+
+
+async def ajudge(call, messages, kind, motion="", summary="", **options):
+    """Async version of `judge`."""
+    options.setdefault("response_format", {"type": "json_object"})
+    completion = await call.achat(messages, **options)
+    try:
+        return parse_ballot(completion.text, kind, motion, summary)
+    except BallotError as e:
+        completion = await call.achat(_repair(messages, completion, e), **options)
+    try:
+        return parse_ballot(completion.text, kind, motion, summary)
+    except BallotError as e:
+        raise _rejected(completion, e) from e
@@ -1,91 +1,126 @@
-# routers/ai_judge_router.py
-
-from fastapi import APIRouter
-
-from models.AI_Judge import AI_Judge_Mock, AI_Judge_Par, FeedbackAsian, FeedbackMock
-
-from models.AI_Judge.AI_Judge_Par import Speech_Gen
-
-from models.AI_Judge.FeedbackAsian import Speech_Gen
-
-from models.AI_Judge.FeedbackMock import Speech_Gen
-
-router = APIRouter(prefix="/judge", tags=["AI Judge"])
-
-@router.post("/MockDebate_Judge")
-def judge_mock(data: dict):  # Replace with Pydantic model later
-    def judge_mock(data: dict):  # Replace with Pydantic model later
-    # Extract fields from data dict
-    motion = data.get("motion")
-    opening_prop = data.get("opening_prop")
-    opening_opp = data.get("opening_opp")
-    rebuttal_prop = data.get("rebuttal_prop")
-    rebuttal_opp = data.get("rebuttal_opp")
-    qna_summary = data.get("qna_summary")
-
-    result = MockDebate_Judge(
-        motion,
-        opening_prop,
-        opening_opp,
-        rebuttal_prop,
-        rebuttal_opp,
-        qna_summary
-    )
-    return {"result": result}
-
-router = APIRouter(prefix="/par", tags=["AI Judge Parli"])
-
-@router.post("/speech_gen")
-def speech_gen(data: dict):  # Replace with Pydantic model for production
-    motion = data.get("motion")
-    pm = data.get("pm")
-    ol = data.get("ol")
-    dpm = data.get("dpm")
-    dlo = data.get("dlo")
-    gw = data.get("gw")
-    ow = data.get("ow")
-    committee_summary = data.get("committee_summary")
-
-    result = Speech_Gen(
-        motion,
-        pm,
-        ol,
-        dpm,
-        dlo,
-        gw,
-        ow,
-        committee_summary
-    )
-    return {"result": result}
-
-router = APIRouter(prefix="/feedback/asian", tags=["Feedback Asian"])
-
-@router.post("/speech_gen")
-def feedback_asian_speech_gen(data: dict):  # Replace with Pydantic model for production
-    motion = data.get("motion")
-    information = data.get("information")
-    role = data.get("role")
-
-    result = Speech_Gen(
-        motion,
-        information,
-        role
-    )
-    return {"result": result}
-
-router = APIRouter(prefix="/feedback/mock", tags=["Feedback Mock"])
-
-@router.post("/speech_gen")
-def feedback_mock_speech_gen(data: dict):  # Replace with Pydantic model for production
-    motion = data.get("motion")
-    opening_statement_text = data.get("opening_statement_text")
-    role = data.get("role")
-    rebuttal_speech_text = data.get("rebuttal_speech_text")
-
-    result = Speech_Gen(
-        motion,
-        opening_statement_text,
-        role,
-        rebuttal_speech_text
-    )
-    return {"result": result}
+# routers/ai_judge_router.py
+
+from fastapi import APIRouter, HTTPException
+
+from models.AI_Judge import AI_Judge_Mock, AI_Judge_Par, FeedbackAsian, FeedbackMock
+from models.AI_Judge.ballot import rubric_override
+from models.LLM_Engine.admission import priority
+
+
+def requested_rubric(kind, data):
+    """The rubric the request asks for, or None; a bad one is a 422, before the judge is asked."""
+    if data.get("rubric") is None:
+        return None
+    try:
+        return rubric_override(kind, data["rubric"])
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+def ballot_response(ballot, data, rubric=None):
+    """The ballot's numbers, plus the written-out evaluation unless "render" is false.
+
+    A "rubric" in the request (e.g. {"content": 40, "style": 10}) rescores the ballot under
+    other criterion weights without asking the judge again.
+    """
+    if rubric:
+        ballot.rubric = rubric
+    response = {"ballot": ballot.to_dict()}
+    if data.get("render", True):
+        response["result"] = ballot.render()
+    return response
+
+
+mock_router = APIRouter(prefix="/judge", tags=["AI Judge"])
+
+@mock_router.post("/MockDebate_Judge")
+async def judge_mock(data: dict):  # Replace with Pydantic model later
+    rubric = requested_rubric("mock", data)
+    # Extract fields from data dict
+    motion = data.get("motion")
+    opening_prop = data.get("opening_prop")
+    opening_opp = data.get("opening_opp")
+    rebuttal_prop = data.get("rebuttal_prop")
+    rebuttal_opp = data.get("rebuttal_opp")
+    qna_summary = data.get("qna_summary")
+
+    ballot = await AI_Judge_Mock.MockDebate_Judge_async(
+        motion,
+        opening_prop,
+        opening_opp,
+        rebuttal_prop,
+        rebuttal_opp,
+        qna_summary,
+        bypass_cache=data.get("no_cache", False),
+    )
+    return ballot_response(ballot, data, rubric)
+
+par_router = APIRouter(prefix="/par", tags=["AI Judge Parli"])
+
+@par_router.post("/speech_gen")
+async def speech_gen(data: dict):  # Replace with Pydantic model for production
+    rubric = requested_rubric("par", data)
+    motion = data.get("motion")
+    pm = data.get("pm")
+    ol = data.get("ol")
+    dpm = data.get("dpm")
+    dlo = data.get("dlo")
+    gw = data.get("gw")
+    ow = data.get("ow")
+    committee_summary = data.get("committee_summary")
+
+    ballot = await AI_Judge_Par.Speech_Gen_async(
+        motion,
+        pm,
+        ol,
+        dpm,
+        dlo,
+        gw,
+        ow,
+        committee_summary,
+        bypass_cache=data.get("no_cache", False),
+    )
+    return ballot_response(ballot, data, rubric)
+
+feedback_asian_router = APIRouter(prefix="/feedback/asian", tags=["Feedback Asian"])
+
+@feedback_asian_router.post("/speech_gen")
+async def feedback_asian_speech_gen(data: dict):  # Replace with Pydantic model for production
+    motion = data.get("motion")
+    information = data.get("information")
+    role = data.get("role")
+
+    # Feedback is read after the speech, so it yields to anything a user is waiting on.
+    with priority("batch"):
+        result = await FeedbackAsian.Speech_Gen_async(
+            motion,
+            information,
+            role,
+            bypass_cache=data.get("no_cache", False),
+        )
+    return {"result": result}
+
+feedback_mock_router = APIRouter(prefix="/feedback/mock", tags=["Feedback Mock"])
+
+@feedback_mock_router.post("/speech_gen")
+async def feedback_mock_speech_gen(data: dict):  # Replace with Pydantic model for production
+    motion = data.get("motion")
+    opening_statement_text = data.get("opening_statement_text")
+    role = data.get("role")
+    rebuttal_speech_text = data.get("rebuttal_speech_text")
+
+    with priority("batch"):
+        result = await FeedbackMock.Speech_Gen_async(
+            motion,
+            opening_statement_text,
+            role,
+            rebuttal_speech_text,
+            bypass_cache=data.get("no_cache", False),
+        )
+    return {"result": result}
+
+router = APIRouter()
+router.include_router(mock_router)
+router.include_router(par_router)
+router.include_router(feedback_asian_router)
+router.include_router(feedback_mock_router)
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Local, vectorized scoring of judge ballots.
+
+The judge only rates: a weight and a per-side result for each clash, and a 1-10 rating per
+rubric criterion for each speaker. Everything derived from those is computed here, for a
+whole batch of ballots of one format at once:
+
+    team totals     sum of weight x result per side
+    winner          the side with the higher total; level totals go to the side whose
+                    speakers scored more, then to the judge's own call
+    speaker scores  ratings weighted by the rubric, out of 100
+    ranks           by score; ties go to the higher rating on the heaviest rubric criterion
+                    (then the next heaviest...), then to the winning side, then to the
+                    earlier speaker
+
+Ballots are packed into arrays once (`pack`), so rescoring a tournament under other rubric
+weights is one `score(batch, rubric)` call.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from models.AI_Judge.ballot import FORMATS
+
+
+@dataclass
+class Batch:
+    """Ballots of one format packed into arrays. Clashes are zero-padded to the longest ballot."""
+
+    kind: str
+    weights: np.ndarray    # (ballots, clashes)
+    results: np.ndarray    # (ballots, clashes, sides)
+    ratings: np.ndarray    # (ballots, speakers, criteria)
+    called: np.ndarray     # (ballots,) side index of the judge's own verdict
+
+    def __len__(self):
+        return len(self.called)
+
+
+@dataclass
+class Scores:
+    kind: str
+    teams: np.ndarray      # (ballots, sides) weighted clash totals
+    winner: np.ndarray     # (ballots,) side index
+    speakers: np.ndarray   # (ballots, speakers) score out of 100, in speaking order
+    order: np.ndarray      # (ballots, speakers) speaker indices, best first
+    ranks: np.ndarray      # (ballots, speakers) rank of each speaker, 1 = best
+
+
+def pack(ballots):
+    """Packs Ballots of one format into a Batch."""
+    if not ballots:
+        raise ValueError("no ballots to pack")
+    kind = ballots[0].kind
+    spec = FORMATS[kind]
+    sides, speakers, criteria = spec["sides"], list(spec["speakers"]), list(spec["rubric"])
+    width = max(len(ballot.clashes) for ballot in ballots)
+
+    weights = np.zeros((len(ballots), width), dtype=np.int8)
+    results = np.zeros((len(ballots), width, len(sides)), dtype=np.int8)
+    ratings = np.zeros((len(ballots), len(speakers), len(criteria)), dtype=np.float64)
+    called = np.zeros(len(ballots), dtype=np.int8)
+    for b, ballot in enumerate(ballots):
+        if ballot.kind != kind:
+            raise ValueError(f"cannot pack {ballot.kind} ballots with {kind} ballots")
+        for c, clash in enumerate(ballot.clashes):
+            weights[b, c] = clash.weight
+            results[b, c] = [clash.sides[side].result for side in sides]
+        for speaker in ballot.speakers:
+            ratings[b, speakers.index(speaker.speaker)] = [speaker.scores[name] for name in criteria]
+        called[b] = sides.index(ballot.called)
+    return Batch(kind, weights, results, ratings, called)
+
+
+def rubric_vector(kind, rubric=None):
+    """Rubric weights (in % of the speaker score) in the format's criterion order."""
+    rubric = rubric or FORMATS[kind]["rubric"]
+    return np.array([rubric[name] for name in FORMATS[kind]["rubric"]], dtype=np.float64)
+
+
+def score(batch, rubric=None):
+    """Team totals, winners, speaker scores and ranks of every ballot in `batch`."""
+    spec = FORMATS[batch.kind]
+    weights = rubric_vector(batch.kind, rubric)
+    side_of = np.array([spec["sides"].index(side) for _, side in spec["speakers"].values()])
+
+    teams = np.einsum("bc,bcs->bs", batch.weights.astype(np.int64), batch.results.astype(np.int64))
+    speakers = np.round(batch.ratings @ (weights / 10), 1)
+
+    # Per-side sum of speaker scores: the first tie-break for level team totals.
+    side_scores = np.stack([speakers[:, side_of == s].sum(axis=1) for s in range(len(spec["sides"]))], axis=1)
+    winner = np.where(teams[:, 0] != teams[:, 1], np.argmax(teams, axis=1),
+                      np.where(side_scores[:, 0] != side_scores[:, 1], np.argmax(side_scores, axis=1), batch.called))
+
+    # np.lexsort sorts by the last key first, ascending: negate what should rank high.
+    n_ballots, n_speakers = speakers.shape
+    position = np.broadcast_to(np.arange(n_speakers), (n_ballots, n_speakers))
+    on_winner = side_of[None, :] == winner[:, None]
+    by_weight = np.argsort(-weights, kind="stable")
+    keys = [position, ~on_winner]
+    keys += [-batch.ratings[:, :, k] for k in by_weight[::-1]]
+    keys.append(-speakers)
+    order = np.lexsort(np.stack(keys), axis=-1)
+
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, n_speakers + 1)[None, :].repeat(n_ballots, axis=0), axis=1)
+    return Scores(batch.kind, teams, winner, speakers, order, ranks)
+
+
+def rescore(ballots, rubric=None):
+    """Scores a list of Ballots of one format (under `rubric` if given)."""
+    return score(pack(ballots), rubric)
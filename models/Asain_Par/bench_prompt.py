@@ -0,0 +1,79 @@
+"""
+Report: input tokens of one Asian Parliamentary speech request, per role.
+
+Compares the request each speaker is sent now with the request the role modules sent at the
+baseline revision (BASELINE). The old prompt is read from git and filled in without running
+the module: its format guide constant, and the speech prompt f-string of Speech_Gen, which
+embedded that guide twice. No network calls are made; the research context is a stand-in of
+the usual three search results.
+
+    python -m models.Asain_Par.bench_prompt [revision]
+"""
+
+import ast
+import subprocess
+import sys
+
+from models.Asain_Par.templates import ORDER, ROLE_GUIDES, ROLES, STATIC_PREFIX, build_messages
+from models.LLM_Engine.tokens import count_message_tokens, count_tokens
+
+BASELINE = "6ee07d5"
+MODULES = {
+    "pm": "PrimeMinister",
+    "lo": "OppositionLeader",
+    "dpm": "DPM",
+    "dlo": "DLO",
+    "gw": "GovtWhip",
+    "ow": "OppWhip",
+}
+
+MOTION = "This House would ban social media for under-16s"
+CONTEXT = "\n---\n".join(f"Title: Result {i}\nSummary: {'x' * 300}\nSource: https://www.un.org/{i}" for i in range(3))
+
+# What the old RealtimeInformation() returned, for a fixed moment.
+REALTIME = (
+    "Please use this real-time information if needed, \n"
+    "Day : Sunday\nDate : 18\nMonth : October\nYear : 2026\n"
+    "Hour : 11\nMinute : 04\nSecond : 48.\n"
+)
+
+
+def baseline_source(role_key, revision):
+    path = f"models/Asain_Par/{MODULES[role_key]}.py"
+    return subprocess.run(["git", "show", f"{revision}:{path}"], capture_output=True, text=True, check=True).stdout
+
+
+def fill(node, names):
+    if isinstance(node, ast.Constant):
+        return node.value
+    return "".join(
+        value.value if isinstance(value, ast.Constant) else str(names[value.value.id])
+        for value in node.values
+    )
+
+
+def baseline_request(role_key, revision):
+    """The messages the old Speech_Gen sent, with an empty chat log."""
+    names = {"Motion": MOTION, "latest_context": CONTEXT}
+    tree = ast.parse(baseline_source(role_key, revision))
+    speech_gen = next(node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == "Speech_Gen")
+    for node in tree.body + speech_gen.body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            if isinstance(node.value, (ast.Constant, ast.JoinedStr)):
+                names[node.targets[0].id] = fill(node.value, names)
+    return [{"role": "system", "content": REALTIME}, {"role": "user", "content": names["system_prompt"]}]
+
+
+if __name__ == "__main__":
+    revision = sys.argv[1] if len(sys.argv) > 1 else BASELINE
+    print(f"Shared static prefix: {count_tokens(STATIC_PREFIX):,} tokens\n")
+    print(f"{'role':<6} {'role guide':>10} {'request':>8} {'now':>8} {revision:>9} {'saved':>7}")
+
+    for key in ORDER:
+        messages = build_messages(key, MOTION, CONTEXT)
+        now = count_message_tokens(messages)
+        before = count_message_tokens(baseline_request(key, revision))
+        print(
+            f"{ROLES[key].short:<6} {count_tokens(ROLE_GUIDES[key]):>10,} {count_message_tokens(messages[-1:]):>8,}"
+            f" {now:>8,} {before:>9,} {1 - now / before:>7.0%}"
+        )
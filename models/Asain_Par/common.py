@@ -0,0 +1,159 @@
+"""
+What the six Asian Parliamentary speaker modules share: text-to-speech and the cached,
+single-flight speech generation, with research from the shared research service. Each
+speaker module only names its role.
+"""
+
+import asyncio
+import os
+
+import edge_tts
+import pygame
+
+from models.Asain_Par.templates import ROLES, TEMPLATE_VERSION, TTS_RATE, build_messages, length_target
+from models.LLM_Engine import trace
+from models.LLM_Engine.cache import cached_generation, generation_cache
+from models.LLM_Engine.conversation import conversations
+from models.LLM_Engine.length import TimedStream, atimed_chat, timed_chat
+from models.LLM_Engine.routing import for_call
+from models.LLM_Engine.sanitize import Sanitizer, sanitize
+from models.LLM_Engine.singleflight import async_flights
+from models.Research_Engine.research import afetch_latest_info, fetch_latest_info
+
+BASE_SAVE_DIR = os.getcwd()
+AUDIO_DIR = os.path.join(BASE_SAVE_DIR, "Data")
+
+TTS_ATTEMPTS = 3
+
+
+def audio_path(role_key):
+    return os.path.join(AUDIO_DIR, ROLES[role_key].audio_file)
+
+
+async def TextToSpeechAudioFile(text, role_key, path=None) -> None:
+    """Saves the speech read in the role's voice, to `path` or the role's audio file."""
+    path = path or audio_path(role_key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    communicate = edge_tts.Communicate(text, ROLES[role_key].voice, pitch='+5Hz', rate=TTS_RATE)
+    await communicate.save(path)
+
+
+def TTS(Text, role_key, func=lambda r=None:True):
+    for _ in range(TTS_ATTEMPTS):
+        try:
+            asyncio.run(TextToSpeechAudioFile(Text, role_key))
+
+            pygame.mixer.init()
+            pygame.mixer.music.load(audio_path(role_key))
+            pygame.mixer.music.play()
+
+            while pygame.mixer.music.get_busy():
+                if func() == False:
+                    break
+
+                pygame.time.Clock().tick(10)
+
+            return True
+
+        except Exception as e:
+            print(f"Error in TTS : {e}")
+
+        finally:
+            try:
+                func(False)
+                pygame.mixer.music.stop()
+                pygame.mixer.quit()
+
+            except Exception as e:
+                print(f"Error in TTS : {e}")
+
+    return False
+
+
+def _options():
+    return dict(temperature=0.7, top_p=1)
+
+
+def _remember(conversation, Motion, Answer):
+    # Only the motion is kept for the user side; the instructions are rebuilt on every request.
+    conversation.add_turn(f"Motion: {Motion}", Answer)
+
+
+# The session's history comes from the conversation store and is an argument of the cached
+# generators, so it is part of the cache key. The turn is added by the callers below, on a
+# cache hit or a joined generation as much as on a fresh one.
+@cached_generation("speech", version=TEMPLATE_VERSION)
+def _speech(role_key, Motion, history, earlier):
+    messages = build_messages(role_key, Motion, fetch_latest_info(Motion), history, earlier)
+
+    completion = timed_chat(for_call("ap_speech"), messages, length_target(role_key), **_options())
+
+    return sanitize(completion.text)
+
+
+@cached_generation("speech", version=TEMPLATE_VERSION)
+async def _speech_async(role_key, Motion, history, earlier):
+    latest_context = await afetch_latest_info(Motion)
+    messages = build_messages(role_key, Motion, latest_context, history, earlier)
+
+    completion = await atimed_chat(for_call("ap_speech"), messages, length_target(role_key), **_options())
+
+    return sanitize(completion.text)
+
+
+def generate_speech(role_key, Motion, session_id=None, earlier=(), bypass_cache=False):
+    """The role's speech. `earlier`, the (role key, speech) pairs a round has had so far, is
+    given to the speaker to answer; it is part of the cache key like any argument."""
+    conversation = conversations.get(session_id)
+    Answer = _speech(role_key, Motion, conversation.messages(), tuple(earlier), bypass_cache=bypass_cache)
+    _remember(conversation, Motion, Answer)
+    return Answer
+
+
+async def generate_speech_async(role_key, Motion, session_id=None, earlier=(), bypass_cache=False):
+    conversation = conversations.get(session_id)
+    Answer = await _speech_async(role_key, Motion, conversation.messages(), tuple(earlier), bypass_cache=bypass_cache)
+    _remember(conversation, Motion, Answer)
+    return Answer
+
+
+async def stream_speech(role_key, Motion, session_id=None, bypass_cache=False):
+    """Yields the speech as it is generated, already cleaned up by the sanitizer.
+
+    Concurrent streams of the same role, motion and history share one upstream generation.
+    The turn is added to the session once the whole speech has been yielded.
+    """
+    conversation = conversations.get(session_id)
+    history = conversation.messages()
+    key = _speech.cache_key(role_key, Motion, history, ())
+    cached = None if bypass_cache else await generation_cache.aget(key)
+    if cached is not None:
+        trace.record({"call": "speech", "source": "cache"})
+        yield cached
+        _remember(conversation, Motion, cached)
+        return
+
+    chunks = []
+    async for chunk in async_flights.stream(key, lambda: _stream(key, role_key, Motion, history)):
+        chunks.append(chunk)
+        yield chunk
+    _remember(conversation, Motion, "".join(chunks).rstrip())
+
+
+async def _stream(key, role_key, Motion, history):
+    latest_context = await afetch_latest_info(Motion)
+    messages = build_messages(role_key, Motion, latest_context, history)
+
+    completion = TimedStream(for_call("ap_speech"), messages, length_target(role_key), _options())
+
+    # The same cleanup as _speech, applied as the chunks arrive.
+    sanitizer = Sanitizer()
+    async for chunk in completion:
+        chunk = sanitizer.feed(chunk)
+        if chunk:
+            yield chunk
+    chunk = sanitizer.finish()
+    if chunk:
+        yield chunk
+
+    await generation_cache.aset(key, sanitize(completion.text))
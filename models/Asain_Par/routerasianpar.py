@@ -1,72 +1,67 @@
 from fastapi import APIRouter
-from models.Asain_Par.DLO import Speech_Gen
-from models.Asain_Par.DPM import Speech_Gen
-from models.Asain_Par.GovtWhip import Speech_Gen
+from models.Asain_Par import DLO, DPM, GovtWhip, OppositionLeader, OppWhip, PrimeMinister
+from models.LLM_Engine.streaming import sse_response
 
 router = APIRouter(prefix="/asian_par", tags=["Asian Parliamentary"])
 
 @router.post("/dlo_speech")
-def generate_dlo_speech(data: dict):  # For production, use a Pydantic model
+async def generate_dlo_speech(data: dict):  # For production, use a Pydantic model
     motion = data.get("motion")
-    result = Speech_Gen(motion)
+    result = await DLO.Speech_Gen_async(motion, session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False))
     return {"result": result}
 
-from fastapi import APIRouter
-
-
-router = APIRouter(prefix="/asian_par", tags=["Asian Parliamentary"])
-
 @router.post("/dpm_speech")
-def generate_dpm_speech(data: dict):  # For production, use a Pydantic model
+async def generate_dpm_speech(data: dict):  # For production, use a Pydantic model
     motion = data.get("motion")
-    result = Speech_Gen(motion)
+    result = await DPM.Speech_Gen_async(motion, session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False))
     return {"result": result}
 
-from models.Asain_Par.GovtWhip import Speech_Gen
-
-router = APIRouter(prefix="/asian_par", tags=["Asian Parliamentary"])
-
 @router.post("/govtwhip_speech")
-def generate_govtwhip_speech(data: dict):  # For production, use a Pydantic model
+async def generate_govtwhip_speech(data: dict):  # For production, use a Pydantic model
     motion = data.get("motion")
-    result = Speech_Gen(motion)
+    result = await GovtWhip.Speech_Gen_async(motion, session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False))
     return {"result": result}
 
-from fastapi import APIRouter
-from models.Asain_Par.OppositionLeader import Speech_Gen
-
-router = APIRouter(prefix="/asian_par", tags=["Asian Parliamentary"])
-
 @router.post("/opposition_leader_speech")
-def generate_opposition_leader_speech(data: dict):  # For production, use a Pydantic model
+async def generate_opposition_leader_speech(data: dict):  # For production, use a Pydantic model
     motion = data.get("motion")
-    result = Speech_Gen(motion)
+    result = await OppositionLeader.Speech_Gen_async(motion, session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False))
     return {"result": result}
 
-from fastapi import APIRouter
-from models.Asain_Par.OppWhip import Speech_Gen
-
-router = APIRouter(prefix="/asian_par", tags=["Asian Parliamentary"])
-
 @router.post("/oppwhip_speech")
-def generate_oppwhip_speech(data: dict):  # For production, use a Pydantic model
+async def generate_oppwhip_speech(data: dict):  # For production, use a Pydantic model
     motion = data.get("motion")
-    result = Speech_Gen(motion)
+    result = await OppWhip.Speech_Gen_async(motion, session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False))
     return {"result": result}
 
-from fastapi import APIRouter
-from models.Asain_Par.PrimeMinister import Speech_Gen
-
-router = APIRouter(prefix="/asian_par", tags=["Asian Parliamentary"])
-
 @router.post("/prime_minister_speech")
-def generate_prime_minister_speech(data: dict):  # For production, use a Pydantic model
+async def generate_prime_minister_speech(data: dict):  # For production, use a Pydantic model
     motion = data.get("motion")
-    result = Speech_Gen(motion)
+    result = await PrimeMinister.Speech_Gen_async(motion, session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False))
     return {"result": result}
 
+# Token-streaming variants: the same speeches, sent as Server-Sent Events while they are generated.
+
+@router.post("/dlo_speech/stream")
+async def stream_dlo_speech(data: dict):
+    return sse_response(DLO.Speech_Stream(data.get("motion"), session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False)))
 
+@router.post("/dpm_speech/stream")
+async def stream_dpm_speech(data: dict):
+    return sse_response(DPM.Speech_Stream(data.get("motion"), session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False)))
 
+@router.post("/govtwhip_speech/stream")
+async def stream_govtwhip_speech(data: dict):
+    return sse_response(GovtWhip.Speech_Stream(data.get("motion"), session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False)))
 
+@router.post("/opposition_leader_speech/stream")
+async def stream_opposition_leader_speech(data: dict):
+    return sse_response(OppositionLeader.Speech_Stream(data.get("motion"), session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False)))
 
+@router.post("/oppwhip_speech/stream")
+async def stream_oppwhip_speech(data: dict):
+    return sse_response(OppWhip.Speech_Stream(data.get("motion"), session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False)))
 
+@router.post("/prime_minister_speech/stream")
+async def stream_prime_minister_speech(data: dict):
+    return sse_response(PrimeMinister.Speech_Stream(data.get("motion"), session_id=data.get("session_id"), bypass_cache=data.get("no_cache", False)))
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""
+Compiled prompt templates for the six Asian Parliamentary speakers.
+
+The roles are data (ROLES). Every speech prompt is laid out as
+    [system: STATIC_PREFIX] [system: role guide] + conversation history + [user: date, motion, facts]
+and, within a round, the user message starts with the earlier speeches, each labelled with
+its speaker and side.
+STATIC_PREFIX - an overview of the format, the writing rules and the sample speech - is built
+once at import and is byte-identical for every role and motion, so the providers can reuse
+its prefix across requests. The role guide is the speaker's objectives plus only the slices
+of the format guide that apply to their role; it is fixed per role. TEMPLATE_VERSION hashes
+everything that shapes the prompt and is part of every speech's cache key.
+"""
+
+import datetime
+from dataclasses import dataclass
+
+from models.LLM_Engine.budget import message_with_parts, shrink_parts
+from models.LLM_Engine.cache import prompt_version
+from models.LLM_Engine.length import LengthTarget
+
+# Slices of the AP format guide. A speaker is sent the overview plus the parts that apply to
+# their role (ROLE_SECTIONS), not the whole rulebook.
+GUIDE_SECTIONS = {
+    "overview": """Asian Parliamentary (AP) debate is a three-on-three format: the Government (Proposition) and the Opposition, each with three speakers, alternate speeches in the order PM, LO, DPM, DLO, GW, OW. Teams must defend their assigned side regardless of personal belief. Points of Information (POIs) are allowed during unprotected time; the first and last minute are protected.""",
+    "introduction": """Introduction
+-Set the tone and present the team’s stance.
+-Clarify definitions and give a roadmap of the speech.""",
+    "rebuttal": """Rebuttal
+-Address and dismantle previous opposing arguments.
+-Group related ideas and provide logical responses.""",
+    "constructive": """Constructive Arguments
+-Present new material if the speaker is allowed to do so.
+-Use structured format (Claim → Reasoning → Impact).
+-Ensure argument alignment with the team line.""",
+    "argument": """Structure of an Argument:
+Claim
+-The main point being made.
+E.g., “Social media fosters civic engagement.”
+
+Mechanism / Reasoning
+-How and why the claim holds.
+-Use logical reasoning, theories, or processes.
+E.g., “Platforms allow easy access to political content and engagement.”
+
+Impact
+-The significance or consequences of the claim.
+-Tie to real-world outcomes or debate values.
+E.g., “This increases political participation, especially among youth.”
+
+Examples
+-Support with real-world data, analogies, or case studies.""",
+    "weighing": """Comparison and Weighing
+-Highlight clashes in the debate.
+-Compare ideas and explain why your side is more impactful or valid.
+-Weigh based on scale, harm, benefit, probability, and reversibility.""",
+    "conclusion": """Conclusion
+-Summarize your team’s strongest points.
+-Reinforce how your team wins the debate.
+-End with a clear and confident closing statement.""",
+}
+
+# Which slices each role's speech is written from, in order.
+ROLE_SECTIONS = {
+    "pm": ("introduction", "constructive", "argument", "conclusion"),
+    "lo": ("introduction", "rebuttal", "constructive", "argument", "conclusion"),
+    "dpm": ("rebuttal", "constructive", "argument", "weighing", "conclusion"),
+    "dlo": ("rebuttal", "constructive", "argument", "weighing", "conclusion"),
+    "gw": ("rebuttal", "weighing", "conclusion"),
+    "ow": ("rebuttal", "weighing", "conclusion"),
+}
+
+# Key strategies that apply to every speaker, and the ones that apply to some roles only.
+STRATEGIES = (
+    "-Always engage with the opposition—rebut effectively.\n"
+    "-Maintain consistent team lines and logical flow.\n"
+    "-Weigh arguments in your favor and compare the impact."
+)
+ROLE_STRATEGIES = {
+    "pm": "-Set clear definitions.",
+    "lo": "-Set clear definitions; challenge the PM's if they are unfair.",
+    "gw": "-Summarize and reinforce the winning narrative.",
+    "ow": "-Summarize and reinforce the winning narrative.",
+}
+
+GUIDELINES = """Use the following guidelines strictly:
+
+1. FORMAT & STYLE:
+    - The entire speech must be written in the **same tone, structure, and human-style language** as the sample speech provided by the user.
+    - Use simple, easy-to-pronounce words and avoid overly academic or robotic phrasing.
+    - Prioritize clarity, conviction, and rhythm – like an actual human debater would.
+
+2. STRUCTURE:
+    - Start with a powerful **hook** that grabs attention.
+    - Clearly state your **stance** on the motion right after the hook.
+    - Follow all key elements of a good AP opening speech:
+        • Context/Framing
+        • Stakeholders
+        • Problem Statement
+        • Mechanism (if Gov)
+        • Burden (if Opp)
+        • Arguments with logic
+        • World impacts and examples
+
+3. FACTUAL ROASTING:
+    - Indirectly roast the opposing bench using **real-world examples** such as:
+        • Articles from the United Nations
+        • Reports by global organizations (e.g. WHO, Amnesty, Human Rights Watch)
+        • Case studies and verified news headlines
+    - Go beyond naming the fact — **explain its logic** and how it contradicts the opposition’s likely stance.
+
+4. BLUNDER ANALYSIS:
+    - Mention known **blunders** (policy failures, contradictions, hypocrisies) of the opposing side, and **expose them logically** to the Chair.
+    - Do not make it personal — make it persuasive.
+
+5. TONE:
+    - Confident, factual, and indirect in your takedown of the opponent.
+    - Avoid AI-sounding lines — focus on debate-style transitions, persuasive techniques, and natural delivery.
+    - End with a sharp reiteration of your stance and why your side is the **only viable choice** for today’s house.
+
+6. DELIVERY:
+    - Speech must match the flow and sentence structure of the human-written sample speech shared by the user.
+    - No robotic formatting or generic expressions."""
+
+SAMPLE_SPEECH = """Now this is a sample speech
+
+2) Addressing Human trafficking in migrant worker populations
+
+Sir around 70% of all trafficking victims are women and girls.
+trafficking in persons has obviously become a major issue and the concerning part about this is many countries have worsening scores in trafficking as per the Organized crime index.
+
+Another surprising issue since we're emphasising on women protection is that Finding number 11 of the UNODC's global report on trafficking in persons 2022 highlighted that women are far more likely to be prosecuted than men.
+
+We obviously support convicting the guilty but why such an imbalance?
+
+Sir regarding prevention of trafficking in persons the solutions are very simple
+
+Firstly for countries with a lot of trafficking incidents, fast track courts should be set up that only hear cases of trafficking in order to expedite the conviction or the release and so that the victim is brought to justice as soon as possible.
+
+Secondly, as I highlighted earlier, we need legislative updates in some member states and in others, we need a major improvement of the executive since the legislature is useless if the executive and judiciary does not work.
+
+To truly assess the damage done every year, member states must carry out thorough surveys and to some extent collaborate with NGOs in order to provide rehabilitation and humanitarian aid to victims.
+
+Even the Joy Ezeilo emphasis in the Special Rapporteur report stated that trafficked persons have a right to an effective remedy for recovery from the ordeal of trafficking and it is an essential component."""
+
+STATIC_PREFIX = f"""You are a professional debate speechwriter and expert in Asian Parliamentary Debate format. You write the speech of one speaker in an Asian Parliamentary round; their role, side and motion, today's date and the most recent facts are given at the end.
+
+this is the asain parliamentary debate format : {GUIDE_SECTIONS['overview']}
+
+generate the speech based on your role and check the part of the asain parliamentry format for your role (given after this message) about what does your role speak about and then generate the speech in human way not ai generated
+
+and in the speech never mention about that what do i need to speak as my role, just generate the speech related to the topic about how the speaker would speak.
+
+{GUIDELINES}
+
+see the asain parliamentary format and your role's part of it and according to that generate the speech, like see all of the rules etc and then generate the speech
+
+
+{SAMPLE_SPEECH}
+
+Now i want the same format as the sample speech like sir or other words in human laguage 
+
+and this is the most important part ***there should be no mentions of the facts which u have taken after the speech is generated ***
+and this is the most important part, just generate the speech, i dont want any starting like, 
+here is your speech as the speaker or phrases like (Sir, pause for emphasis) in middle of the speech
+
+i just want a proper speech of the asked length and that's it, no extra data required."""
+
+
+@dataclass(frozen=True)
+class Role:
+    key: str
+    name: str
+    short: str
+    side: str
+    objectives: str
+    voice: str
+    audio_file: str
+    minutes: int = 7
+
+
+ROLES = {
+    "pm": Role(
+        "pm", "Prime Minister", "PM", "Proposition",
+        "-Defines the motion and sets the debate’s scope.\n"
+        "-Clarifies key terms.\n"
+        "-Presents the team’s case and outlines main arguments (usually 2-3).\n"
+        "-May introduce a model or policy if required by the motion.",
+        "en-CA-LiamNeural", "PM.mp3",
+    ),
+    "lo": Role(
+        "lo", "Opposition Leader", "LO", "Opposition",
+        "-Responds directly to PM’s definitions and arguments.\n"
+        "-May offer counter-definitions if necessary.\n"
+        "-Presents the opposition’s main case and key arguments (usually 2-3).",
+        "en-US-AriaNeural", "oppLeader.mp3",
+    ),
+    "dpm": Role(
+        "dpm", "Deputy Prime Minister", "DPM", "Proposition",
+        "-Rebuilds and strengthens PM’s case.\n"
+        "-Refutes the Leader of Opposition’s arguments.\n"
+        "-May introduce additional arguments (usually 1-2).\n"
+        "-Ensures cohesion and consistency.",
+        "en-US-GuyNeural", "DP.mp3",
+    ),
+    "dlo": Role(
+        "dlo", "Deputy Leader of Opposition", "DLO", "Opposition",
+        "-Defends LO’s case and rebuts DPM.\n"
+        "-May introduce new arguments (1-2).\n"
+        "-Maintains logical consistency.",
+        "en-GB-RyanNeural", "DOL.mp3",
+    ),
+    "gw": Role(
+        "gw", "Government Whip", "GW", "Proposition",
+        "-Provides holistic rebuttal to all opposition arguments.\n"
+        "-Summarizes and reinforces the government’s case.\n"
+        "-Does not introduce new arguments.\n"
+        "-Frames the debate and emphasizes key clashes.",
+        "en-US-AndrewNeural", "govtwhip.mp3",
+    ),
+    "ow": Role(
+        "ow", "Opposition Whip", "OW", "Opposition",
+        "-Provides a complete summary of the debate from the opposition’s perspective.\n"
+        "-Rebuts all remaining government arguments.\n"
+        "-Does not present new arguments.\n"
+        "-Frames the round and emphasizes key points of the clash.",
+        "en-US-GuyNeural", "oppwhip.mp3",
+    ),
+}
+
+# Speaking order of the round.
+ORDER = ("pm", "lo", "dpm", "dlo", "gw", "ow")
+
+# edge-tts speaking rate the speeches are read at.
+TTS_RATE = "+13%"
+
+# Tokens the earlier speeches of a round may take in a speech prompt, all together: enough to
+# answer them, while the speech's own output reservation is left whole in an 8k window.
+EARLIER_TOKENS = 3072
+
+
+def length_target(role_key):
+    """How many words fill the role's speaking time at its voice's rate."""
+    role = ROLES[role_key]
+    return LengthTarget.for_voice(role.minutes, role.voice, TTS_RATE)
+
+
+def _role_guide(role):
+    sections = "\n\n".join(GUIDE_SECTIONS[name] for name in ROLE_SECTIONS[role.key])
+    strategies = STRATEGIES + ("\n" + ROLE_STRATEGIES[role.key] if role.key in ROLE_STRATEGIES else "")
+
+    return f"""You Are {role.name}
+
+your main objectives are {role.name} ({role.short}):
+{role.objectives}
+
+Structure of the {role.short} speech:
+{sections}
+
+Key strategies:
+{strategies}"""
+
+
+ROLE_GUIDES = {key: _role_guide(role) for key, role in ROLES.items()}
+
+
+def build_prompt(role_key, Motion, latest_context):
+    """The per-request message that follows the role guide and the conversation history."""
+    role = ROLES[role_key]
+    today = datetime.date.today().strftime("%A %d %B %Y")
+
+    return f"""Today is {today}.
+
+Write a {role.minutes} -minute speech on the motion: "{Motion}" for the speaker on the side: "{role.side}".
+
+make a proper {role.minutes} minute speech of about {length_target(role_key).words} words, not shorter
+
+START WITH THE MOST RECENT CONTEXT AVAILABLE:
+{latest_context}
+
+Write the speech now."""
+
+
+def earlier_speeches(earlier):
+    """Message parts for the round's earlier speeches, given as (role key, speech) pairs: each
+    labelled with its speaker and side, all cut in proportion to fit EARLIER_TOKENS."""
+    parts = ["The speeches so far in this round, in speaking order:"]
+    for role_key, speech in earlier:
+        role = ROLES[role_key]
+        parts += [f"\n\n{role.name} ({role.short}), {role.side}:\n", speech]
+    return shrink_parts(parts, EARLIER_TOKENS)
+
+
+def build_messages(role_key, Motion, latest_context, history=(), earlier=()):
+    """The speech prompt. `earlier` is the round's speeches so far, which the speaker answers."""
+    prompt = build_prompt(role_key, Motion, latest_context)
+    if earlier:
+        request = message_with_parts("user", earlier_speeches(earlier) + ["\n\n", prompt])
+    else:
+        request = {"role": "user", "content": prompt}
+    return (
+        [{"role": "system", "content": STATIC_PREFIX}, {"role": "system", "content": ROLE_GUIDES[role_key]}]
+        + list(history)
+        + [request]
+    )
+
+
+TEMPLATE_VERSION = prompt_version(
+    STATIC_PREFIX, *ROLE_GUIDES.values(), build_prompt, earlier_speeches, EARLIER_TOKENS, *map(length_target, ORDER)
+)
@@ -0,0 +1,213 @@
+"""
+A whole Asian Parliamentary round, generated as a DAG of steps behind /asian-par/generate.
+
+Only the speeches depend on each other: every speaker is given the speeches before theirs,
+each labelled with its speaker and side, to answer, so PM -> LO -> DPM -> DLO -> GW -> OW is
+a chain. Those speeches are an argument of the speech, and so part of its cache key. Nothing
+else needs to wait for the chain:
+
+    research        starts at once; the PM waits for it, and the later speakers read it
+                    from the cache
+    speech:<role>   after the previous speech (the PM after research)
+    tts:<role>      the speech's audio file, as soon as that speech is written
+    poi:<side>      the POIs for each side, from the motion alone
+
+so a round takes about as long as research plus its six LLM calls, with synthesis and POIs
+done alongside. Each step runs once all the steps it waits for have finished; a step whose
+dependency failed is skipped, and a failed speech stops the chain but not the steps
+already running. A round is background work, so every step runs at "batch" priority and
+yields to the speeches and POIs a user is waiting on. `Round.to_dict()` gives the speeches, audio files, POIs and step timings.
+The prompts use the motion as the user typed it; only the round's id is canonical.
+
+The rounds are kept in `rounds` for /asian-par/round: a finished round for ROUND_TTL (an
+hour), and at most MAX_ROUNDS finished rounds in all.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+
+from models.Asain_Par import common
+from models.Asain_Par.templates import ORDER, ROLES
+from models.LLM_Engine.admission import priority
+from models.LLM_Engine.motions import Motion, canonical_motion
+from models.POI_Engine.poi import Chatbot_async
+from models.Research_Engine.research import afetch_latest_info
+
+SIDES = ("Proposition", "Opposition")
+ROUNDS_DIR = os.path.join(common.AUDIO_DIR, "rounds")
+ROUND_TTL = 60 * 60
+MAX_ROUNDS = 100
+
+
+@dataclass
+class Step:
+    name: str
+    run: object            # async function of no arguments
+    after: tuple = ()
+    level: str = "interactive"
+    result: object = None
+    error: str = ""
+    started: float = None
+    finished: float = None
+
+    @property
+    def status(self):
+        if self.error:
+            return "failed"
+        if self.finished is not None:
+            return "done"
+        return "running" if self.started is not None else "waiting"
+
+
+async def run_dag(steps):
+    """Runs `steps` (each listed after the steps it waits for) as early as their dependencies allow."""
+    tasks = {}
+    by_name = {step.name: step for step in steps}
+    origin = time.perf_counter()
+
+    async def run(step):
+        for name in step.after:
+            await asyncio.wait([tasks[name]])
+            if by_name[name].status != "done":
+                step.error = f"skipped: {name} failed"
+                return
+        step.started = time.perf_counter() - origin
+        try:
+            with priority(step.level):
+                step.result = await step.run()
+        except Exception as e:
+            print(f"Error : {step.name} : {e}")
+            step.error = str(e) or type(e).__name__
+        step.finished = time.perf_counter() - origin
+
+    for step in steps:
+        unknown = [name for name in step.after if name not in tasks]
+        if unknown:
+            raise ValueError(f"{step.name} waits for {', '.join(unknown)}, which must come first")
+        tasks[step.name] = asyncio.create_task(run(step))
+    await asyncio.gather(*tasks.values())
+    return by_name
+
+
+@dataclass
+class Round:
+    motion: Motion
+    text: str
+    steps: dict = field(default_factory=dict)
+    started_at: float = field(default_factory=time.time)
+    finished_at: float = 0.0
+
+    def _results(self, prefix):
+        return {
+            name.split(":", 1)[1]: step.result
+            for name, step in self.steps.items()
+            if name.startswith(prefix) and step.status == "done"
+        }
+
+    @property
+    def status(self):
+        if not self.finished_at:
+            return "running"
+        speeches = [self.steps[f"speech:{role}"] for role in ORDER]
+        return "done" if all(step.status == "done" for step in speeches) else "failed"
+
+    def to_dict(self):
+        speech_seconds = [
+            step.finished - step.started
+            for name, step in self.steps.items()
+            if name.startswith("speech:") and step.status == "done"
+        ]
+        return {
+            "motion_id": self.motion.id,
+            "motion": self.text,
+            "status": self.status,
+            "speeches": self._results("speech:"),
+            "audio": self._results("tts:"),
+            "pois": self._results("poi:"),
+            "steps": {
+                name: {"status": step.status, "started": _round(step.started), "finished": _round(step.finished), "error": step.error}
+                for name, step in self.steps.items()
+            },
+            "seconds": round((self.finished_at or time.time()) - self.started_at, 2),
+            "speech_seconds": round(sum(speech_seconds), 2),
+        }
+
+
+def _round(seconds):
+    return None if seconds is None else round(seconds, 2)
+
+
+def round_steps(motion, bypass_cache=False, tts=True, pois=True):
+    """The steps of one round on `motion` (as typed), dependencies first."""
+    audio_dir = os.path.join(ROUNDS_DIR, canonical_motion(motion).id)
+    steps = [Step("research", lambda: afetch_latest_info(motion), (), "batch")]
+    speeches = []
+
+    def speech(role, before):
+        async def run():
+            earlier = tuple((role_key, step.result) for role_key, step in before)
+            return await common.generate_speech_async(role, motion, earlier=earlier, bypass_cache=bypass_cache)
+        return run
+
+    def synthesize(role, speech_step):
+        async def run():
+            path = os.path.join(audio_dir, ROLES[role].audio_file)
+            await common.TextToSpeechAudioFile(speech_step.result, role, path)
+            return path
+        return run
+
+    def poi(side):
+        return lambda: Chatbot_async(motion, side, bypass_cache=bypass_cache)
+
+    previous = "research"
+    for role in ORDER:
+        speech_step = Step(f"speech:{role}", speech(role, tuple(speeches)), (previous,), "batch")
+        speeches.append((role, speech_step))
+        steps.append(speech_step)
+        if tts:
+            steps.append(Step(f"tts:{role}", synthesize(role, speech_step), (speech_step.name,), "batch"))
+        previous = speech_step.name
+    if pois:
+        # Listed last, but they wait for nothing and so start with research.
+        steps += [Step(f"poi:{side.lower()}", poi(side), (), "batch") for side in SIDES]
+    return steps
+
+
+rounds = {}
+
+
+def _forget_old():
+    """Drops the finished rounds older than ROUND_TTL, then the oldest past MAX_ROUNDS."""
+    expired = time.time() - ROUND_TTL
+    finished = [key for key, current in rounds.items() if current.finished_at]
+    for i, key in enumerate(finished):
+        if rounds[key].finished_at < expired or len(finished) - i > MAX_ROUNDS:
+            del rounds[key]
+
+
+async def run_round(motion, bypass_cache=False, tts=True, pois=True):
+    """Generates a whole round on `motion` and returns it. The round can be followed in `rounds`."""
+    _forget_old()
+    current = Round(canonical_motion(motion), motion)
+    # Re-inserted, so that `rounds` stays in the order the rounds started.
+    rounds.pop(current.motion.id, None)
+    rounds[current.motion.id] = current
+    steps = round_steps(motion, bypass_cache, tts, pois)
+    current.steps = {step.name: step for step in steps}
+    await run_dag(steps)
+    current.finished_at = time.time()
+    return current
+
+
+async def generate_asian_parliamentary_debate(motion, bypass_cache=False):
+    """Background task of /asian-par/generate; a round already running on the motion is left to finish."""
+    running = rounds.get(canonical_motion(motion).id)
+    if running is not None and running.status == "running":
+        return running
+    return await run_round(motion, bypass_cache=bypass_cache)
+
+
+def get_round(motion):
+    return rounds.get(canonical_motion(motion).id)
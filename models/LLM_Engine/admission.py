@@ -0,0 +1,243 @@
+"""
+Priority admission for provider calls.
+
+Each client (provider + API key) hands out its concurrency slots to waiting calls in
+priority order - live > interactive > batch, oldest first within a level - and paces them
+through two token buckets, one for requests per minute and one for tokens per minute, so we
+stay under the provider's rate limits instead of collecting 429s. A live round's POIs and
+streamed speeches therefore never queue behind a batch of prefetches.
+
+The priority is ambient: wrap work in `with priority("batch"):` (or "live") and every
+call made inside it, including ones in threads and tasks started from there, is admitted
+at that level. Unwrapped work is "interactive".
+
+A generation shared by several callers (see singleflight) runs at its own `Urgency`, which
+a more urgent caller joining it raises with `promote`: its calls already waiting for a slot
+move up the queue, so a live request that joins a batch prefetch does not wait behind the
+batch.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+PRIORITIES = {"live": 0, "interactive": 1, "batch": 2}
+
+
+class Urgency:
+    """The level calls are admitted at, and the calls of it waiting for a slot."""
+
+    def __init__(self, level):
+        if level not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {level}")
+        self.level = level
+        self.waiters = set()
+        self._lock = threading.Lock()
+
+    def add(self, waiter):
+        with self._lock:
+            self.waiters.add(waiter)
+
+    def discard(self, waiter):
+        with self._lock:
+            self.waiters.discard(waiter)
+
+    def promote(self, level):
+        """Raises the level to `level` if that is more urgent, and requeues the waiting calls."""
+        with self._lock:
+            if PRIORITIES[level] >= PRIORITIES[self.level]:
+                return
+            self.level = level
+            waiters = list(self.waiters)
+        for waiter in waiters:
+            waiter.wake()
+
+
+_priority = contextvars.ContextVar("llm_priority", default=None)
+
+
+@contextmanager
+def priority(level):
+    """Admits the calls made inside at `level`, or at an Urgency shared with other work."""
+    urgency = level if isinstance(level, Urgency) else Urgency(level)
+    previous = _priority.get()
+    _priority.set(urgency)
+    try:
+        yield
+    finally:
+        # Not reset(): a streaming generator may be closed from another context.
+        _priority.set(previous)
+
+
+def current_priority():
+    urgency = _priority.get()
+    return urgency.level if urgency is not None else "interactive"
+
+
+def shared_urgency():
+    """A new Urgency at the current level, for work that others may join and promote."""
+    return Urgency(current_priority())
+
+
+def _urgency(level=None):
+    if level is not None:
+        return Urgency(level)
+    return _priority.get() or Urgency("interactive")
+
+
+class TokenBucket:
+    """`rate` units per minute, bursting up to `capacity`. A rate of 0 means unlimited."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate / 60.0
+        self.capacity = capacity or rate
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount):
+        """Seconds until `amount` can be taken."""
+        if not self.rate:
+            return 0.0
+        self._refill()
+        # A single call larger than the whole bucket waits for a full bucket, not forever.
+        missing = min(amount, self.capacity) - self.available
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount):
+        if self.rate:
+            self.available -= min(amount, self.capacity)
+
+
+class _Waiter:
+    def __init__(self, urgency, seq, tokens, loop=None):
+        self.urgency = urgency
+        self.seq = seq
+        self.tokens = tokens
+        self.loop = loop
+        self.event = asyncio.Event() if loop else threading.Event()
+
+    @property
+    def rank(self):
+        # Read on every admission: the urgency may be promoted while the call waits.
+        return (PRIORITIES[self.urgency.level], self.seq)
+
+    def __lt__(self, other):
+        return self.rank < other.rank
+
+    def wake(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.event.set)
+        else:
+            self.event.set()
+
+
+class AdmissionController:
+    """Grants one client's concurrency slots by priority, paced by request and token buckets."""
+
+    def __init__(self, name, concurrency, requests_per_minute=0, tokens_per_minute=0):
+        self.name = name
+        self.concurrency = concurrency
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.in_flight = 0
+        self._queue = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _enqueue(self, waiter):
+        with self._lock:
+            self._queue.append(waiter)
+        waiter.urgency.add(waiter)
+
+    def _admit(self, waiter):
+        """Under the lock: 0 if `waiter` got a slot, the seconds to wait if it is next but
+        rate-limited, or None if it is not its turn.
+
+        The queue is a plain list searched with min(), not a heap: a promoted urgency
+        changes the rank of waiters already queued.
+        """
+        if min(self._queue) is not waiter or self.in_flight >= self.concurrency:
+            return None
+        delay = max(self.requests.delay(1), self.tokens.delay(waiter.tokens))
+        if delay > 0:
+            return delay
+        self._queue.remove(waiter)
+        waiter.urgency.discard(waiter)
+        self.in_flight += 1
+        self.requests.take(1)
+        self.tokens.take(waiter.tokens)
+        self._wake_next()
+        return 0
+
+    def _wake_next(self):
+        if self._queue and self.in_flight < self.concurrency:
+            min(self._queue).wake()
+
+    def _abandon(self, waiter):
+        waiter.urgency.discard(waiter)
+        with self._lock:
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+                self._wake_next()
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake_next()
+
+    def acquire(self, tokens=0, level=None):
+        waiter = _Waiter(_urgency(level), next(self._seq), tokens)
+        self._enqueue(waiter)
+        try:
+            while True:
+                with self._lock:
+                    waiter.event.clear()
+                    delay = self._admit(waiter)
+                if delay == 0:
+                    return
+                waiter.event.wait(delay)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    async def aacquire(self, tokens=0, level=None):
+        waiter = _Waiter(_urgency(level), next(self._seq), tokens, asyncio.get_running_loop())
+        self._enqueue(waiter)
+        try:
+            while True:
+                with self._lock:
+                    waiter.event.clear()
+                    delay = self._admit(waiter)
+                if delay == 0:
+                    return
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    @contextmanager
+    def slot(self, tokens=0):
+        self.acquire(tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, tokens=0):
+        await self.aacquire(tokens)
+        try:
+            yield
+        finally:
+            self.release()
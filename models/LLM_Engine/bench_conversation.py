@@ -0,0 +1,64 @@
+"""
+Benchmark: prompt size per request across 1,000 sequential Asian Parliamentary requests.
+
+Compares the old module-level `messages` list (every prompt and answer appended and resent)
+with the session-scoped ConversationStore. No network calls are made; the speech
+generators' request shape is reproduced with fixed-size stand-in prompts and answers.
+
+    python -m models.LLM_Engine.bench_conversation
+"""
+
+import time
+
+from models.LLM_Engine.conversation import ConversationStore
+from models.LLM_Engine.tokens import count_message_tokens
+
+REQUESTS = 1000
+CHECKPOINTS = (1, 10, 100, 500, 1000)
+
+# Roughly the size of an AP system prompt (the format guide is embedded twice) and of a
+# max_tokens=1024 speech.
+SYSTEM_PROMPT = "Write a 7 minute Asian Parliamentary speech following the format guide. " * 200
+ANSWER = "Sir, the opposition bench would have you believe otherwise. " * 65
+REALTIME = [{"role": "system", "content": "Please use this real-time information if needed."}]
+
+
+def legacy_request(messages, motion):
+    messages.append({"role": "user", "content": SYSTEM_PROMPT + motion})
+    request = REALTIME + messages
+    messages.append({"role": "assistant", "content": ANSWER})
+    return request
+
+
+def store_request(store, session_id, motion):
+    conversation = store.get(session_id)
+    request = REALTIME + conversation.messages() + [{"role": "user", "content": SYSTEM_PROMPT + motion}]
+    conversation.add_turn(f"Motion: {motion}", ANSWER)
+    return request
+
+
+def run(label, make_request):
+    sizes = []
+    started = time.perf_counter()
+    for i in range(REQUESTS):
+        sizes.append(count_message_tokens(make_request(f"This House would ban motion number {i}")))
+    elapsed = time.perf_counter() - started
+
+    row = "  ".join(f"#{n}: {sizes[n - 1]:>9,}" for n in CHECKPOINTS)
+    print(f"{label:<28} {row}   max {max(sizes):>9,}   {elapsed * 1000 / REQUESTS:.3f} ms/request")
+    return sizes
+
+
+if __name__ == "__main__":
+    print(f"Prompt tokens per request over {REQUESTS} sequential requests\n")
+
+    legacy_messages = []
+    run("module-level list (old)", lambda motion: legacy_request(legacy_messages, motion))
+
+    store = ConversationStore()
+    one_session = run("store, one session", lambda motion: store_request(store, "class-1", motion))
+    run("store, no session id", lambda motion: store_request(store, None, motion))
+
+    steady = one_session[10:]
+    print(f"\nSingle-session spread after warm-up: {min(steady):,}-{max(steady):,} tokens "
+          f"(flat: {max(steady) - min(steady) <= 64})")
@@ -0,0 +1,174 @@
+"""
+Token budgeting: fits every routed call into its model's context window before it is sent.
+
+A request is read as four parts:
+    system  - the leading system messages (instructions, format guide)
+    history - the session's earlier turns, between the system messages and the request,
+              including the session summary (a system message marked "summary")
+    request - the final message (motion, research context, speeches to judge)
+    output  - the max_tokens reservation for the answer
+When they add up to more than the window, the lowest-priority part gives way first: the
+oldest history turns are dropped, then the output reservation shrinks down to `min_output`,
+then the longest message is cut, and the next longest, until the prompt fits; a prompt that
+cannot be cut to fit raises ValueError. Callers used to ask for max_tokens=8028 on 8k-window
+models, which the providers reject or cut short; now the reservation is clamped to what is
+left.
+
+A message that carries several texts the model must all see (a judge's six speeches) is
+built with `message_with_parts`: it is then cut part by part, every long part in proportion
+to its length, so each speech loses the same share of its middle and none disappears.
+Other messages are cut in the middle.
+
+Every call's breakdown is added to the request trace, and printed with LLM_LOG_TOKENS=1 in
+.env.
+"""
+
+from dataclasses import asdict, dataclass, field
+
+from dotenv import dotenv_values
+
+from models.LLM_Engine.tokens import MESSAGE_OVERHEAD, TRUNCATION_MARKER, count_message_tokens, count_tokens, truncate_tokens
+
+env_vars = dotenv_values(".env")
+
+LOG_TOKENS = (env_vars.get("LLM_LOG_TOKENS") or "0") != "0"
+# Room left for the chat template and tokenizer differences between our count and the provider's.
+SAFETY_MARGIN = int(env_vars.get("LLM_TOKEN_MARGIN") or 64)
+DEFAULT_WINDOW = 8192
+# Parts shorter than this (headings, labels) are never cut.
+PART_FLOOR = 64
+
+# Context windows as served by each provider (not the model's native maximum).
+CONTEXT_WINDOWS = {
+    ("groq", "llama3-70b-8192"): 8192,
+    ("groq", "llama-3.3-70b-versatile"): 32768,
+    ("groq", "llama-3.1-8b-instant"): 131072,
+    ("sambanova", "Meta-Llama-3.1-70B-Instruct"): 8192,
+    ("sambanova", "Meta-Llama-3.1-8B-Instruct"): 8192,
+}
+
+
+def context_window(provider, model):
+    override = env_vars.get(f"LLM_WINDOW_{provider.upper()}")
+    return int(override) if override else CONTEXT_WINDOWS.get((provider, model), DEFAULT_WINDOW)
+
+
+@dataclass
+class TokenBudget:
+    """How one request's tokens were spent, and what had to give way."""
+
+    model: str
+    window: int
+    system: int = 0
+    history: int = 0
+    request: int = 0
+    output: int = 0
+    requested_output: int = 0
+    trimmed: dict = field(default_factory=dict)
+
+    @property
+    def total(self):
+        return self.system + self.history + self.request + self.output
+
+    def to_dict(self):
+        return {**asdict(self), "total": self.total}
+
+    def describe(self):
+        trimmed = ", ".join(f"{part} -{tokens}" for part, tokens in self.trimmed.items())
+        return (
+            f"Tokens : {self.model} system={self.system} history={self.history} request={self.request} "
+            f"output={self.output}/{self.requested_output} total={self.total}/{self.window}"
+            + (f" trimmed: {trimmed}" if trimmed else "")
+        )
+
+
+def message_with_parts(role, parts):
+    """A message whose content is `parts` joined; `fit_messages` cuts each part in proportion."""
+    parts = [str(part) for part in parts]
+    return {"role": role, "content": "".join(parts), "parts": parts}
+
+
+def shrink_parts(parts, limit):
+    """`parts` cut to about `limit` tokens in all: every part longer than PART_FLOOR keeps the
+    same share of its tokens, its start and end."""
+    sizes = [count_tokens(part) for part in parts]
+    if sum(sizes) <= limit:
+        return list(parts)
+    long = [size for size in sizes if size > PART_FLOOR]
+    room = limit - (sum(sizes) - sum(long)) - len(long) * count_tokens(TRUNCATION_MARKER)
+    share = max(0.0, room / sum(long)) if long else 0.0
+    return [part if size <= PART_FLOOR else truncate_tokens(part, int(size * share)) for part, size in zip(parts, sizes)]
+
+
+def _shorten(message, limit):
+    if message.get("parts"):
+        parts = shrink_parts(message["parts"], limit)
+        return {**message, "content": "".join(parts), "parts": parts}
+    return {**message, "content": truncate_tokens(message["content"], limit)}
+
+
+def _split(messages):
+    """(system, history, request) parts of a message list."""
+    start = 0
+    while start < len(messages) - 1 and messages[start]["role"] == "system" and not messages[start].get("summary"):
+        start += 1
+    return list(messages[:start]), list(messages[start:-1]), list(messages[-1:])
+
+
+def fit_messages(messages, max_tokens, window, model="", min_output=None):
+    """Returns (messages, max_tokens, TokenBudget) trimmed to fit `window`.
+
+    Raises ValueError when the prompt cannot be cut to fit with `min_output` left for the answer.
+    """
+    min_output = min(max_tokens, min_output or 256)
+    system, history, request = _split(messages)
+    budget = TokenBudget(model, window, requested_output=max_tokens)
+    limit = window - SAFETY_MARGIN
+
+    def prompt_tokens():
+        return count_message_tokens(system) + count_message_tokens(history) + count_message_tokens(request)
+
+    # 1. The oldest history turns.
+    dropped = 0
+    while history and prompt_tokens() + max_tokens > limit:
+        dropped += count_message_tokens(history[:1])
+        history.pop(0)
+    if dropped:
+        budget.trimmed["history"] = dropped
+
+    # 2. The output reservation, down to its floor.
+    over = prompt_tokens() + max_tokens - limit
+    if over > 0:
+        cut = min(over, max_tokens - min_output)
+        max_tokens -= cut
+        budget.trimmed["output"] = cut
+
+    # 3. The longest message, part by part or from the middle, then the next longest.
+    uncut = system + request
+    trimmed = 0
+    while prompt_tokens() + max_tokens > limit:
+        # A message that did not get shorter (its parts are all at the floor) is left alone.
+        if not uncut:
+            raise ValueError(f"the prompt does not fit a {window} token window")
+        longest = max(uncut, key=lambda message: count_tokens(message.get("content")))
+        uncut.remove(longest)
+        over = prompt_tokens() + max_tokens - limit
+        before = count_tokens(longest["content"])
+        shortened = _shorten(longest, max(0, before - over - MESSAGE_OVERHEAD))
+        if count_tokens(shortened["content"]) < before:
+            uncut.append(shortened)
+        system = [shortened if message is longest else message for message in system]
+        request = [shortened if message is longest else message for message in request]
+        trimmed += before - count_tokens(shortened["content"])
+    if trimmed:
+        budget.trimmed["prompt"] = trimmed
+
+    budget.system = count_message_tokens(system)
+    budget.history = count_message_tokens(history)
+    budget.request = count_message_tokens(request)
+    budget.output = max_tokens
+    if LOG_TOKENS:
+        print(budget.describe())
+    # `parts` and `summary` are ours, not the API's.
+    messages = [{k: v for k, v in message.items() if k not in ("parts", "summary")} for message in system + history + request]
+    return messages, max_tokens, budget
@@ -0,0 +1,251 @@
+"""
+Content-addressed cache for generated speeches, POIs and judgements.
+
+Keys are a hash of what decides the output: the generator, its inputs (motion, role, side,
+speeches...), the model and the prompt version. Values sit in an in-memory LRU backed by a
+SQLite file, both with a TTL, and the file is trimmed to a byte budget. Any generator wrapped
+with `cached_generation` accepts `bypass_cache=True` to force a fresh generation, which then
+replaces the cached copy. Concurrent misses on the same key share a single generation.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import dotenv_values
+
+from models.LLM_Engine import trace
+from models.LLM_Engine.motions import motion_id
+from models.LLM_Engine.singleflight import async_flights, flights
+
+env_vars = dotenv_values(".env")
+
+CACHE_PATH = env_vars.get("CACHE_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data", "cache", "generations.sqlite3"
+)
+CACHE_TTL = float(env_vars.get("CACHE_TTL") or 7 * 24 * 60 * 60)
+CACHE_MEMORY_ENTRIES = int(env_vars.get("CACHE_MEMORY_ENTRIES") or 512)
+CACHE_MAX_BYTES = int(env_vars.get("CACHE_MAX_BYTES") or 256 * 1024 * 1024)
+MOTION_ARGUMENTS = frozenset(("Motion", "motion"))
+
+
+def normalize_text(text):
+    return " ".join(str(text).split()).lower()
+
+
+def cache_key(*scope, **parts):
+    """A stable hash of `scope` and `parts`. Strings are compared case- and whitespace-insensitively."""
+    def normalize(value):
+        if isinstance(value, str):
+            return normalize_text(value)
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+
+    payload = json.dumps([scope, normalize(parts)], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def prompt_version(*parts):
+    """A short hash of prompt templates. Pass template strings and the functions that build
+    prompts; editing any literal text in them changes the version and so the cache keys."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if callable(part):
+            code = part.__code__
+            digest.update(code.co_code)
+            for const in code.co_consts:
+                if isinstance(const, (str, int, float)):
+                    digest.update(repr(const).encode("utf-8"))
+        else:
+            digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+class GenerationCache:
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, memory_entries=CACHE_MEMORY_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS generations ("
+                "key TEXT PRIMARY KEY, value TEXT, size INTEGER, expires_at REAL, last_access REAL)"
+            )
+        return self._db
+
+    def _remember(self, key, value, expires_at):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    return value
+                del self._memory[key]
+
+            db = self._connect()
+            row = db.execute("SELECT value, expires_at FROM generations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                db.execute("DELETE FROM generations WHERE key = ?", (key,))
+                db.commit()
+                return None
+            db.execute("UPDATE generations SET last_access = ? WHERE key = ?", (now, key))
+            db.commit()
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            return value
+
+    def set(self, key, value, ttl=None):
+        if value is None:
+            return
+        now = time.time()
+        expires_at = now + (ttl or self.ttl)
+        encoded = json.dumps(value)
+        with self._lock:
+            self._remember(key, value, expires_at)
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO generations (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, len(encoded), expires_at, now),
+            )
+            self._trim(db, now)
+            db.commit()
+
+    def _trim(self, db, now):
+        db.execute("DELETE FROM generations WHERE expires_at <= ?", (now,))
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM generations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute("SELECT key, size FROM generations ORDER BY last_access").fetchall():
+            db.execute("DELETE FROM generations WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    async def aget(self, key):
+        # A memory hit is served on the event loop, but only if the lock is free right now:
+        # `get`/`set` hold it across SQLite I/O, and waiting for it here would block the loop.
+        if self._lock.acquire(blocking=False):
+            try:
+                entry = self._memory.get(key)
+                if entry is not None and entry[1] > time.time():
+                    self._memory.move_to_end(key)
+                    return entry[0]
+            finally:
+                self._lock.release()
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key, value, ttl=None):
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._connect().execute("DELETE FROM generations")
+            self._db.commit()
+
+
+generation_cache = GenerationCache()
+
+
+def cached_call(fn, key, bypass=False, ttl=None, label=None):
+    if not bypass:
+        value = generation_cache.get(key)
+        if value is not None:
+            trace.record({"call": label, "source": "cache"})
+            return value
+
+    def generate():
+        # Another caller may have stored it between our miss and taking the flight.
+        value = None if bypass else generation_cache.get(key)
+        if value is None:
+            value = fn()
+            generation_cache.set(key, value, ttl)
+        return value
+
+    return flights.do(key, generate)
+
+
+async def acached_call(fn, key, bypass=False, ttl=None, label=None):
+    if not bypass:
+        value = await generation_cache.aget(key)
+        if value is not None:
+            trace.record({"call": label, "source": "cache"})
+            return value
+
+    async def generate():
+        value = None if bypass else await generation_cache.aget(key)
+        if value is None:
+            value = await fn()
+            await generation_cache.aset(key, value, ttl)
+        return value
+
+    return await async_flights.do(key, generate)
+
+
+def cached_generation(name, version, model=None, ignore=(), ttl=None):
+    """Puts the generation cache in front of a sync or async generator function.
+
+    The key covers the calling module, `name`, `version`, `model` and every argument except
+    those in `ignore`, so the sync and async variants of a generator share entries. A
+    `Motion` argument is keyed on its canonical motion id, so every way of typing a motion
+    shares one entry.
+    State the prompt depends on (a session's history) must be an argument, not looked up
+    from one, so that it is part of the key.
+    The wrapped function takes an extra `bypass_cache` keyword and exposes `cache_key(...)`.
+    """
+    def decorate(fn):
+        signature = inspect.signature(fn)
+
+        def key_for(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            inputs = {k: v for k, v in bound.arguments.items() if k not in ignore}
+            for k in MOTION_ARGUMENTS & inputs.keys():
+                inputs[k] = motion_id(inputs[k])
+            return cache_key(fn.__module__, name, version=version, model=model, inputs=inputs)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, bypass_cache=False, **kwargs):
+                key = key_for(*args, **kwargs)
+                return await acached_call(lambda: fn(*args, **kwargs), key, bypass=bypass_cache, ttl=ttl, label=name)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, bypass_cache=False, **kwargs):
+                key = key_for(*args, **kwargs)
+                return cached_call(lambda: fn(*args, **kwargs), key, bypass=bypass_cache, ttl=ttl, label=name)
+
+        wrapper.cache_key = key_for
+        return wrapper
+
+    return decorate
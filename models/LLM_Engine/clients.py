@@ -0,0 +1,283 @@
+"""
+Process-wide registry of pooled LLM clients.
+
+Every generator talks to Groq and Sambanova through the clients kept here instead of
+building a new `Groq(...)` / `Sambanova(...)` object per request. Each provider gets one
+keep-alive connection pool, priority admission with rate limits (see `admission`) and real timeouts.
+Both providers speak the OpenAI chat-completions protocol, so one client class serves both.
+`chat()` is for blocking callers, `achat()` lets a single event loop hold many generations in flight.
+Calls are retried and circuit-broken per provider/model by `resilience`; failures surface as LLMError.
+"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+
+import httpx
+from dotenv import dotenv_values
+
+from models.LLM_Engine.admission import AdmissionController
+from models.LLM_Engine.resilience import aretry_call, aretry_stream, retry_call, retry_stream
+from models.LLM_Engine.tokens import count_message_tokens, count_tokens
+
+env_vars = dotenv_values(".env")
+
+# LLM_BASE_URL points both providers at one endpoint, e.g. the local fake_server.
+PROVIDERS = {
+    "groq": {
+        "base_url": env_vars.get("GROQ_BASE_URL") or env_vars.get("LLM_BASE_URL") or "https://api.groq.com/openai/v1",
+        "api_key": env_vars.get("GROQ") or env_vars.get("GROQ_API_KEY"),
+        "max_connections": int(env_vars.get("GROQ_MAX_CONNECTIONS") or 32),
+        "concurrency": int(env_vars.get("GROQ_CONCURRENCY") or 16),
+        # Rate limits of the API key; 0 leaves that bucket unlimited.
+        "requests_per_minute": int(env_vars.get("GROQ_RPM") or 0),
+        "tokens_per_minute": int(env_vars.get("GROQ_TPM") or 0),
+    },
+    "sambanova": {
+        "base_url": env_vars.get("SAMBANOVA_BASE_URL") or env_vars.get("LLM_BASE_URL") or "https://api.sambanova.ai/v1",
+        "api_key": env_vars.get("SAMBANOVA_API_KEY") or "8bb1f2ae-f908-42cb-878e-cafacb8fb893",
+        "max_connections": int(env_vars.get("SAMBANOVA_MAX_CONNECTIONS") or 32),
+        "concurrency": int(env_vars.get("SAMBANOVA_CONCURRENCY") or 16),
+        "requests_per_minute": int(env_vars.get("SAMBANOVA_RPM") or 0),
+        "tokens_per_minute": int(env_vars.get("SAMBANOVA_TPM") or 0),
+    },
+}
+
+# Connecting should be quick, a 7 minute speech is not. `read` is the gap allowed between
+# two streamed chunks (or the whole body when not streaming), not the total call time.
+TIMEOUT = httpx.Timeout(connect=5.0, read=90.0, write=10.0, pool=30.0)
+KEEPALIVE_EXPIRY = 60.0
+
+
+@dataclass
+class Completion:
+    text: str
+    provider: str
+    model: str
+    finish_reason: str = None
+    usage: dict = field(default_factory=dict)
+
+
+def _parse_event(line):
+    """Returns the JSON payload of one server-sent-event line, or None for keep-alives and [DONE]."""
+    if not line or not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if not data or data == "[DONE]":
+        return None
+    return json.loads(data)
+
+
+def _apply_event(stream, line):
+    """Records one streamed chunk on `stream` and returns its text delta, if any."""
+    chunk = _parse_event(line)
+    if not chunk:
+        return None
+    # Sent with the last chunk, or in a chunk of its own; Groq puts it under x_groq.
+    usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+    if usage:
+        stream.usage = usage
+    if not chunk.get("choices"):
+        return None
+    choice = chunk["choices"][0]
+    if choice.get("finish_reason"):
+        stream.finish_reason = choice["finish_reason"]
+    content = (choice.get("delta") or {}).get("content")
+    if content:
+        stream.text += content
+    return content
+
+
+def stream_usage(stream):
+    """The usage the provider sent at the end of `stream`, or one counted from its text."""
+    if stream.usage:
+        return stream.usage
+    prompt = count_message_tokens(stream.payload["messages"])
+    completion = count_tokens(stream.text)
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion, "estimated": True}
+
+
+class ChatStream:
+    """Iterates over the text deltas of a streamed completion.
+
+    `text`, `finish_reason` and `usage` are filled in as the stream is consumed.
+    """
+
+    def __init__(self, client, payload):
+        self.client = client
+        self.payload = payload
+        self.provider = client.name
+        self.model = payload["model"]
+        self.text = ""
+        self.finish_reason = None
+        self.usage = {}
+
+    def __iter__(self):
+        return retry_stream(self.provider, self.model, self._chunks)
+
+    def _chunks(self):
+        with self.client.admission.slot(_budget(self.payload)):
+            with self.client.http.stream("POST", "/chat/completions", json=self.payload) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    content = _apply_event(self, line)
+                    if content:
+                        yield content
+
+    def completion(self):
+        """Drains the stream and returns it as a single Completion."""
+        for _ in self:
+            pass
+        return Completion(self.text, self.provider, self.model, self.finish_reason, stream_usage(self))
+
+
+class AsyncChatStream:
+    """Async counterpart of ChatStream for `ChatClient.achat(..., stream=True)`."""
+
+    def __init__(self, client, payload):
+        self.client = client
+        self.payload = payload
+        self.provider = client.name
+        self.model = payload["model"]
+        self.text = ""
+        self.finish_reason = None
+        self.usage = {}
+
+    def __aiter__(self):
+        return aretry_stream(self.provider, self.model, self._chunks)
+
+    async def _chunks(self):
+        async with self.client.admission.aslot(_budget(self.payload)):
+            async with self.client.async_http.stream("POST", "/chat/completions", json=self.payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    content = _apply_event(self, line)
+                    if content:
+                        yield content
+
+    async def completion(self):
+        async for _ in self:
+            pass
+        return Completion(self.text, self.provider, self.model, self.finish_reason, stream_usage(self))
+
+
+def _budget(payload):
+    """Tokens a call may use against the provider's tokens-per-minute limit: prompt plus the most it can write."""
+    return count_message_tokens(payload["messages"]) + payload["max_tokens"]
+
+
+def _completion(provider, model, body):
+    choice = body["choices"][0]
+    return Completion(
+        text=choice["message"].get("content") or "",
+        provider=provider,
+        model=body.get("model", model),
+        finish_reason=choice.get("finish_reason"),
+        usage=body.get("usage") or {},
+    )
+
+
+class ChatClient:
+    """One provider's pooled HTTP client plus priority admission of its calls."""
+
+    def __init__(self, name, base_url, api_key, max_connections, concurrency,
+                 requests_per_minute=0, tokens_per_minute=0, timeout=TIMEOUT):
+        self.name = name
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        self.timeout = timeout
+        self.http = httpx.Client(base_url=base_url, headers=self.headers, limits=self.limits, timeout=timeout)
+        self.admission = AdmissionController(name, concurrency, requests_per_minute, tokens_per_minute)
+        self._async_http = None
+
+    @property
+    def async_http(self):
+        # Created lazily so it binds to the event loop that serves requests.
+        if self._async_http is None:
+            self._async_http = httpx.AsyncClient(
+                base_url=self.base_url, headers=self.headers, limits=self.limits, timeout=self.timeout
+            )
+        return self._async_http
+
+    def _payload(self, model, messages, max_tokens, temperature, top_p, stream, extra):
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "stream": stream,
+        }
+        if stream:
+            payload["stream_options"] = {"include_usage": True}
+        payload.update(extra)
+        return payload
+
+    def chat(self, model, messages, max_tokens=1024, temperature=0.7, top_p=1, stream=False, **extra):
+        """Sends a chat completion.
+
+        Returns a Completion, or a ChatStream of text deltas when `stream` is True.
+        """
+        payload = self._payload(model, messages, max_tokens, temperature, top_p, stream, extra)
+        if stream:
+            return ChatStream(self, payload)
+
+        def send():
+            with self.admission.slot(_budget(payload)):
+                response = self.http.post("/chat/completions", json=payload)
+            response.raise_for_status()
+            return response.json()
+
+        return _completion(self.name, model, retry_call(self.name, model, send))
+
+    async def achat(self, model, messages, max_tokens=1024, temperature=0.7, top_p=1, stream=False, **extra):
+        """Async version of `chat`. Returns a Completion, or an AsyncChatStream when `stream` is True."""
+        payload = self._payload(model, messages, max_tokens, temperature, top_p, stream, extra)
+        if stream:
+            return AsyncChatStream(self, payload)
+
+        async def send():
+            async with self.admission.aslot(_budget(payload)):
+                response = await self.async_http.post("/chat/completions", json=payload)
+            response.raise_for_status()
+            return response.json()
+
+        return _completion(self.name, model, await aretry_call(self.name, model, send))
+
+    async def aclose(self):
+        self.http.close()
+        if self._async_http is not None:
+            await self._async_http.aclose()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider):
+    """Returns the shared client for `provider` ("groq" or "sambanova"), creating it on first use."""
+    client = _clients.get(provider)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        if provider not in _clients:
+            if provider not in PROVIDERS:
+                raise KeyError(f"Unknown LLM provider: {provider}")
+            _clients[provider] = ChatClient(provider, **PROVIDERS[provider])
+        return _clients[provider]
+
+
+async def close_clients():
+    """Closes every pooled connection. Called when the FastAPI app shuts down."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        await client.aclose()
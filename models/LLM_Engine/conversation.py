@@ -0,0 +1,108 @@
+"""
+Bounded, session-scoped conversation history.
+
+The Asian Parliamentary generators used to append every prompt and answer to one
+module-level `messages` list and resend all of it on each request, so prompts grew without
+limit and every user's motions leaked into everyone else's context. History now lives per
+session, keeps at most `max_tokens` of recent turns, and folds older turns into a short
+running summary.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from models.LLM_Engine.tokens import count_tokens, count_message_tokens
+
+HISTORY_TOKENS = 1536
+SUMMARY_TOKENS = 256
+MAX_SESSIONS = 2000
+SESSION_TTL = 2 * 60 * 60
+
+
+def _first_sentence(text, limit=200):
+    text = " ".join(text.split())
+    match = re.match(r"(.+?[.!?])(\s|$)", text)
+    sentence = match.group(1) if match else text
+    return sentence[:limit]
+
+
+def summarize_turn(message):
+    """A one-line extractive summary of an evicted message. Cheap, and no extra LLM call."""
+    if message["role"] == "user":
+        return f"- Asked for: {_first_sentence(message['content'])}"
+    return f"- Answered: {_first_sentence(message['content'])}"
+
+
+class Conversation:
+    """Recent turns of one session plus a summary of the turns that no longer fit."""
+
+    def __init__(self, max_tokens=HISTORY_TOKENS, summary_tokens=SUMMARY_TOKENS):
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+        self.turns = []
+        self.summary = []
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add_turn(self, user, assistant):
+        with self._lock:
+            self.turns.append({"role": "user", "content": user})
+            self.turns.append({"role": "assistant", "content": assistant})
+            self._evict()
+
+    def _evict(self):
+        while self.turns and count_message_tokens(self.turns) > self.max_tokens:
+            self.summary.append(summarize_turn(self.turns.pop(0)))
+        while self.summary and count_tokens("\n".join(self.summary)) > self.summary_tokens:
+            self.summary.pop(0)
+
+    def messages(self):
+        """History to send before the new request: the summary (if any) then the recent turns."""
+        with self._lock:
+            history = []
+            if self.summary:
+                # Marked, so that the token budget drops it with the history, not keeps it as
+                # system text (see budget._split).
+                history.append({
+                    "role": "system",
+                    "content": "Summary of earlier turns in this session:\n" + "\n".join(self.summary),
+                    "summary": True,
+                })
+            return history + list(self.turns)
+
+
+class ConversationStore:
+    """Maps session ids to Conversations, dropping the least recently used and idle ones."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL, **conversation_kwargs):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.conversation_kwargs = conversation_kwargs
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id=None):
+        """Returns the session's Conversation. Without a session id the caller gets a fresh,
+        unshared one, so anonymous requests never see each other's history."""
+        if session_id is None:
+            return Conversation(**self.conversation_kwargs)
+
+        now = time.monotonic()
+        with self._lock:
+            conversation = self._sessions.pop(session_id, None)
+            if conversation is None or now - conversation.last_used > self.ttl:
+                conversation = Conversation(**self.conversation_kwargs)
+            conversation.last_used = now
+            self._sessions[session_id] = conversation
+
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return conversation
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+conversations = ConversationStore()
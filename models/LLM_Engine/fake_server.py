@@ -0,0 +1,297 @@
+"""
+Local fake of the Groq / Sambanova chat-completions API, for load tests and offline work.
+
+It speaks the OpenAI protocol the clients use (streamed and non-streamed), with a
+configurable tokens/sec, a log-normal time-to-first-token and injected failures, and
+answers with canned text shaped for whoever is asking: an AP speaker, a mock debater,
+the POI engine, a judge or a feedback adjudicator.
+
+Run it with:
+    python -m models.LLM_Engine.fake_server --port 8765 --tps 60 --ttft 0.4 --error-rate 0.05
+
+and point every generator at it in .env:
+    LLM_BASE_URL=http://127.0.0.1:8765/v1
+
+(or GROQ_BASE_URL / SAMBANOVA_BASE_URL to fake one provider only; two instances on two
+ports with different settings exercise hedging and failover). A request can force an
+error with the `X-Fake-Error: <status>` header.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass
+
+from dotenv import dotenv_values
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from models.AI_Judge.ballot import FORMATS
+from models.LLM_Engine.tokens import count_message_tokens
+
+env_vars = dotenv_values(".env")
+
+
+@dataclass
+class FakeConfig:
+    tps: float = float(env_vars.get("FAKE_LLM_TPS") or 60)
+    # Median and log-normal sigma of the time to first token, in seconds.
+    ttft: float = float(env_vars.get("FAKE_LLM_TTFT") or 0.4)
+    ttft_sigma: float = float(env_vars.get("FAKE_LLM_TTFT_SIGMA") or 0.5)
+    # Share of requests answered with one of `error_codes` before any text.
+    error_rate: float = float(env_vars.get("FAKE_LLM_ERROR_RATE") or 0)
+    error_codes: tuple = (429, 500, 503)
+    # Share of streams cut off halfway through.
+    drop_rate: float = float(env_vars.get("FAKE_LLM_DROP_RATE") or 0)
+    # Share of requests that stall for `stall` seconds before the first token (tail latency).
+    stall_rate: float = float(env_vars.get("FAKE_LLM_STALL_RATE") or 0)
+    stall: float = float(env_vars.get("FAKE_LLM_STALL") or 5)
+    seed: int = None
+
+
+WORDS_PER_MINUTE = 130
+
+ARGUMENTS = {
+    "Proposition": [
+        "the status quo is already failing the people this motion is meant to protect",
+        "the harms we prevent are concrete, measurable and happening today",
+        "every comparable country that acted saw the outcomes improve within a few years",
+        "the burden falls on those best able to carry it, not on the most vulnerable",
+        "doing nothing is itself a choice, and it is the most expensive choice on the table",
+    ],
+    "Opposition": [
+        "the proposition has mistaken a symptom for the cause",
+        "their mechanism shifts the harm onto the communities with the least voice",
+        "the evidence they rely on comes from contexts that look nothing like ours",
+        "there are targeted alternatives that deliver the benefit without the cost",
+        "the principle they invoke cuts against them once it is applied consistently",
+    ],
+}
+
+QUESTIONS = [
+    "If \"{motion}\" passes, who exactly carries the cost when it goes wrong?",
+    "Can you name one country where this has worked without the safeguards you refuse to fund?",
+    "Why should we trust the same institutions that created this problem to fix it?",
+    "What happens to the people your model leaves out on day one?",
+    "Is your case still standing if the central statistic you cited is off by half?",
+    "Which principle would you give up if it meant keeping your mechanism?",
+]
+
+
+def _motion(text):
+    match = re.search(r'motion(?: is)?:\s*"?([^"\n]+)"?', text, re.IGNORECASE)
+    return match.group(1).strip() if match else "this House would act"
+
+
+def _side(text):
+    if re.search(r'side(?: of)?:\s*"?(opposition|against)', text, re.IGNORECASE):
+        return "Opposition"
+    return "Proposition"
+
+
+def classify(messages):
+    """Works out what kind of output the caller expects from its prompt."""
+    text = "\n".join(str(m.get("content", "")) for m in messages)
+    motion, side = _motion(text), _side(text)
+    minutes = re.search(r"Write a (\d+)\s*-?\s*minute", text)
+    minutes = int(minutes.group(1)) if minutes else 3
+
+    if "debate questions" in text:
+        return "poi", motion, side, 0
+    if "AI Judge" in text or "AI judge" in text:
+        return "judge", motion, side, 350
+    if "adjudicator giving" in text:
+        return "feedback", motion, side, 220
+    role = re.search(r"You Are ([^\n]+)", text)
+    if role:
+        return role.group(1).strip(), motion, side, minutes * WORDS_PER_MINUTE
+    if "rebuttal speech" in text:
+        return "reply", motion, side, minutes * WORDS_PER_MINUTE
+    return "speech", motion, side, minutes * WORDS_PER_MINUTE
+
+
+def canned_text(messages, max_tokens):
+    """Role-aware stand-in output, cut to roughly `max_tokens` tokens."""
+    kind, motion, side, words = classify(messages)
+
+    if kind == "poi":
+        lines = [f"{i}. " + q.format(motion=motion) for i, q in enumerate(QUESTIONS, 1)]
+        return "\n".join(lines)
+
+    if kind == "judge":
+        lines = [
+            f"Motion: {motion}",
+            "Winning side: Opposition",
+            "Clash 1: Who bears the cost. Opposition won it on better comparative analysis.",
+            "Clash 2: Whether the mechanism works. Proposition won it on cleaner evidence.",
+            "Speaker scores: PM 75, LO 76, DPM 74, DLO 75, GW 74, OW 76",
+            "Reason for decision:",
+        ]
+    elif kind == "feedback":
+        lines = [
+            "Thank you for the speech.",
+            f"On the motion {motion}, your strongest moment was the comparative at the end.",
+            "What held you back:",
+        ]
+    else:
+        lines = [f"Madam Speaker, as {kind} on the {side} I stand to defend my side of the motion: {motion}."]
+
+    arguments = ARGUMENTS[side]
+    i = 0
+    while sum(len(line.split()) for line in lines) < words:
+        lines.append(f"Point {i + 1}: {arguments[i % len(arguments)].capitalize()}. That matters because {arguments[(i + 2) % len(arguments)]}.")
+        i += 1
+    if kind not in ("judge", "feedback"):
+        lines.append("For all of these reasons, I beg to propose." if side == "Proposition" else "For all of these reasons, I am proud to oppose.")
+
+    text = "\n\n".join(lines)
+    budget = int(max_tokens * 0.75)  # ~0.75 words per token
+    tokens = text.split(" ")
+    return " ".join(tokens[:budget])
+
+
+def canned_ballot(messages):
+    """A judge's JSON ballot, for requests made in JSON mode."""
+    text = "\n".join(str(m.get("content", "")) for m in messages)
+    spec = FORMATS["mock" if "Mock Debate" in text else "par"]
+    side_a, side_b = spec["sides"]
+    clashes = [
+        {"title": "Who bears the cost", "weight": 4,
+         side_a: {"result": -1, "reason": "thin comparative"}, side_b: {"result": 1, "reason": "better comparative analysis"}},
+        {"title": "Whether the mechanism works", "weight": 3,
+         side_a: {"result": 1, "reason": "cleaner evidence"}, side_b: {"result": -1, "reason": "asserted, not shown"}},
+    ]
+    speakers = {
+        key: {**{name: 6 + (i + j) % 3 for j, name in enumerate(spec["rubric"])}, "reason": "clear and engaged"}
+        for i, key in enumerate(spec["speakers"])
+    }
+    verdict = {"winner": side_b, "reason": "won the heavier clash on the comparative"}
+    return json.dumps({"clashes": clashes, "speakers": speakers, "verdict": verdict}, indent=2)
+
+
+def _chunks(text):
+    """Splits text into word-sized pieces that join back to exactly `text`."""
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def create_app(config=None):
+    config = config or FakeConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI(title="Fake LLM")
+    app.state.config = config
+    app.state.requests = 0
+
+    def ttft():
+        delay = rng.lognormvariate(0, config.ttft_sigma) * config.ttft
+        if rng.random() < config.stall_rate:
+            delay += config.stall
+        return delay
+
+    def injected_error(request):
+        forced = request.headers.get("x-fake-error")
+        if forced:
+            return int(forced)
+        if rng.random() < config.error_rate:
+            return rng.choice(config.error_codes)
+        return None
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "fake", "object": "model"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        model = body.get("model", "fake")
+        messages = body.get("messages", [])
+        max_tokens = int(body.get("max_tokens") or 1024)
+
+        status = injected_error(request)
+        if status:
+            headers = {"Retry-After": "1"} if status == 429 else None
+            return JSONResponse({"error": {"message": f"injected {status}", "type": "fake"}}, status_code=status, headers=headers)
+
+        if (body.get("response_format") or {}).get("type") == "json_object" and classify(messages)[0] == "judge":
+            text = canned_ballot(messages)
+        else:
+            text = canned_text(messages, max_tokens)
+        pieces = _chunks(text)
+        finish_reason = "length" if len(pieces) >= int(max_tokens * 0.75) else "stop"
+        usage = {"prompt_tokens": count_message_tokens(messages), "completion_tokens": len(pieces)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            await asyncio.sleep(ttft() + len(pieces) / config.tps)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": finish_reason}],
+                "usage": usage,
+            }
+
+        drop_at = rng.randrange(1, len(pieces)) if len(pieces) > 1 and rng.random() < config.drop_rate else None
+
+        def event(delta, finish=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        async def stream():
+            await asyncio.sleep(ttft())
+            yield event({"role": "assistant", "content": ""})
+            for i, piece in enumerate(pieces):
+                if i == drop_at:
+                    # Simulates the provider dropping the connection mid-speech.
+                    raise ConnectionResetError("fake server dropped the stream")
+                yield event({"content": piece})
+                await asyncio.sleep(1 / config.tps)
+            yield event({}, finish_reason)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield f"data: {json.dumps({'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model, 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    defaults = FakeConfig()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tps", type=float, default=defaults.tps, help="tokens per second per stream")
+    parser.add_argument("--ttft", type=float, default=defaults.ttft, help="median time to first token (s)")
+    parser.add_argument("--ttft-sigma", type=float, default=defaults.ttft_sigma, help="log-normal sigma of the TTFT")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="share of requests failing with 429/500/503")
+    parser.add_argument("--drop-rate", type=float, default=defaults.drop_rate, help="share of streams cut off midway")
+    parser.add_argument("--stall-rate", type=float, default=defaults.stall_rate, help="share of requests stalling before the first token")
+    parser.add_argument("--stall", type=float, default=defaults.stall, help="length of a stall (s)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeConfig(
+        tps=args.tps, ttft=args.ttft, ttft_sigma=args.ttft_sigma, error_rate=args.error_rate,
+        drop_rate=args.drop_rate, stall_rate=args.stall_rate, stall=args.stall, seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
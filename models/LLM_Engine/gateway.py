@@ -0,0 +1,286 @@
+"""
+Hedged requests and failover between Groq and Sambanova.
+
+Generators call `get_gateway(provider).chat(...)` / `.achat(...)` with the same arguments as
+a ChatClient. The gateway knows the equivalent model on the other provider and:
+
+- on the async path, opens a hedge request on the secondary once the primary has gone past
+  its observed p95 time-to-first-token, keeps whichever produces text first and cancels the other;
+- on both paths, fails over to the secondary when the primary errors out before any text
+  arrived (retries exhausted, breaker open).
+
+Non-streamed calls are streamed internally, so they are measured and hedged on first token too;
+their usage is the one the provider sends at the end of the stream, or counted when it sends
+none. JSON-mode calls (`response_format`) are the exception: not every provider streams JSON
+mode, so they are sent non-streamed and only fail over.
+
+An attempt cancelled because the other one produced text first still adds a sample: the
+time it had waited, a lower bound on its TTFT. Otherwise a slow model would only be
+measured on the calls where it happened to win.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+from dotenv import dotenv_values
+
+from models.LLM_Engine.clients import Completion, get_client, stream_usage
+from models.LLM_Engine.resilience import LLMError
+
+env_vars = dotenv_values(".env")
+
+HEDGE_ENABLED = (env_vars.get("LLM_HEDGE") or "1") != "0"
+FAILOVER_ENABLED = (env_vars.get("LLM_FAILOVER") or "1") != "0"
+# Until a model has this many first-token samples its p95 is a guess, so the default delay is used.
+HEDGE_MIN_SAMPLES = int(env_vars.get("LLM_HEDGE_MIN_SAMPLES") or 20)
+HEDGE_DEFAULT_DELAY = float(env_vars.get("LLM_HEDGE_DEFAULT_DELAY") or 2.5)
+HEDGE_WINDOW = int(env_vars.get("LLM_HEDGE_WINDOW") or 200)
+
+# The same model family served by the other provider.
+EQUIVALENTS = {
+    ("groq", "llama3-70b-8192"): ("sambanova", "Meta-Llama-3.1-70B-Instruct"),
+    ("sambanova", "Meta-Llama-3.1-70B-Instruct"): ("groq", "llama-3.3-70b-versatile"),
+    ("groq", "llama-3.3-70b-versatile"): ("sambanova", "Meta-Llama-3.1-70B-Instruct"),
+    ("sambanova", "Meta-Llama-3.1-8B-Instruct"): ("groq", "llama-3.1-8b-instant"),
+    ("groq", "llama-3.1-8b-instant"): ("sambanova", "Meta-Llama-3.1-8B-Instruct"),
+}
+
+
+class LatencyTracker:
+    """Rolling time-to-first-token samples per provider/model, with the time each was taken."""
+
+    def __init__(self, window=HEDGE_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider, model, seconds):
+        with self._lock:
+            self._samples.setdefault((provider, model), deque(maxlen=self.window)).append((time.monotonic(), seconds))
+
+    def last_sample(self, provider, model):
+        """When the newest sample was taken (time.monotonic()), or None."""
+        with self._lock:
+            samples = self._samples.get((provider, model))
+            return samples[-1][0] if samples else None
+
+    def p95(self, provider, model, max_age=None):
+        """p95 of the samples, or of those taken in the last `max_age` seconds."""
+        since = time.monotonic() - max_age if max_age else float("-inf")
+        with self._lock:
+            samples = sorted(seconds for taken, seconds in self._samples.get((provider, model), ()) if taken >= since)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+ttft = LatencyTracker()
+
+
+def hedge_delay(provider, model):
+    p95 = ttft.p95(provider, model)
+    return HEDGE_DEFAULT_DELAY if p95 is None else p95
+
+
+def candidates(provider, model):
+    """The primary provider/model followed by its fallback, if failover is on."""
+    fallback = EQUIVALENTS.get((provider, model)) if FAILOVER_ENABLED else None
+    return [(provider, model)] + ([fallback] if fallback else [])
+
+
+def _should_failover(error):
+    # A rejected request would most likely be rejected by the other provider too.
+    return isinstance(error, LLMError) and error.retryable
+
+
+class FailoverStream:
+    """Blocking stream that moves to the fallback if the primary fails before its first chunk."""
+
+    def __init__(self, options, candidates, messages):
+        self.options = options
+        self.candidates = candidates
+        self.messages = messages
+        self.provider, self.model = candidates[0]
+        self.stream = None
+
+    @property
+    def text(self):
+        return self.stream.text if self.stream else ""
+
+    @property
+    def finish_reason(self):
+        return self.stream.finish_reason if self.stream else None
+
+    @property
+    def usage(self):
+        return self.stream.usage if self.stream else {}
+
+    def __iter__(self):
+        for i, (provider, model) in enumerate(self.candidates):
+            self.provider, self.model = provider, model
+            self.stream = get_client(provider).chat(model, self.messages, stream=True, **self.options)
+            started = time.monotonic()
+            first = True
+            try:
+                for chunk in self.stream:
+                    if first:
+                        ttft.record(provider, model, time.monotonic() - started)
+                        first = False
+                    yield chunk
+                return
+            except LLMError as e:
+                if not first or i == len(self.candidates) - 1 or not _should_failover(e):
+                    raise
+                print(f"Error : {e}, failing over to {self.candidates[i + 1][0]}")
+
+    def completion(self):
+        for _ in self:
+            pass
+        return Completion(self.text, self.provider, self.model, self.finish_reason, stream_usage(self.stream))
+
+
+async def _discard(task):
+    """Cancels a losing attempt, or closes its stream if it already got going."""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled() and task.exception() is None:
+        await task.result()[3].aclose()
+
+
+class HedgedStream:
+    """Async stream raced across the primary and, when it is slow or failing, the fallback."""
+
+    def __init__(self, options, candidates, messages):
+        self.options = options
+        self.candidates = candidates
+        self.messages = messages
+        self.provider, self.model = candidates[0]
+        self.hedged = False
+        self.stream = None
+
+    @property
+    def text(self):
+        return self.stream.text if self.stream else ""
+
+    @property
+    def finish_reason(self):
+        return self.stream.finish_reason if self.stream else None
+
+    @property
+    def usage(self):
+        return self.stream.usage if self.stream else {}
+
+    async def _open(self, provider, model):
+        """Starts a stream and waits for its first chunk."""
+        stream = await get_client(provider).achat(model, self.messages, stream=True, **self.options)
+        chunks = stream.__aiter__()
+        started = time.monotonic()
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            first = None
+        except asyncio.CancelledError:
+            # The other attempt won: this one's TTFT is at least the time it waited.
+            ttft.record(provider, model, time.monotonic() - started)
+            raise
+        ttft.record(provider, model, time.monotonic() - started)
+        return provider, model, stream, chunks, first
+
+    async def _race(self):
+        remaining = list(self.candidates)
+        pending = {asyncio.ensure_future(self._open(*remaining.pop(0)))}
+        delay = hedge_delay(*self.candidates[0]) if HEDGE_ENABLED else None
+        error = None
+        winner = None
+        try:
+            while pending and winner is None:
+                timeout = delay if remaining and delay is not None else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # The primary is slower than its p95 TTFT: hedge on the next provider.
+                    self.hedged = True
+                    pending.add(asyncio.ensure_future(self._open(*remaining.pop(0))))
+                    continue
+                for task in done:
+                    pending.discard(task)
+                    if task.exception() is None:
+                        if winner is None:
+                            winner = task.result()
+                        else:
+                            await _discard(task)
+                        continue
+                    error = task.exception()
+                    if not _should_failover(error):
+                        raise error
+                    if remaining and not pending:
+                        print(f"Error : {error}, failing over to {remaining[0][0]}")
+                        pending.add(asyncio.ensure_future(self._open(*remaining.pop(0))))
+        finally:
+            for task in pending:
+                await _discard(task)
+        if winner is None:
+            raise error
+        return winner
+
+    async def __aiter__(self):
+        self.provider, self.model, self.stream, chunks, first = await self._race()
+        if first is not None:
+            yield first
+        async for chunk in chunks:
+            yield chunk
+
+    async def completion(self):
+        async for _ in self:
+            pass
+        return Completion(self.text, self.provider, self.model, self.finish_reason, stream_usage(self.stream))
+
+
+def _complete(candidates, messages, options):
+    """A non-streamed call that fails over like FailoverStream."""
+    for i, (provider, model) in enumerate(candidates):
+        try:
+            return get_client(provider).chat(model, messages, **options)
+        except LLMError as e:
+            if i == len(candidates) - 1 or not _should_failover(e):
+                raise
+            print(f"Error : {e}, failing over to {candidates[i + 1][0]}")
+
+
+async def _acomplete(candidates, messages, options):
+    for i, (provider, model) in enumerate(candidates):
+        try:
+            return await get_client(provider).achat(model, messages, **options)
+        except LLMError as e:
+            if i == len(candidates) - 1 or not _should_failover(e):
+                raise
+            print(f"Error : {e}, failing over to {candidates[i + 1][0]}")
+
+
+class Gateway:
+    """Drop-in for a ChatClient that adds hedging and failover across providers."""
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def chat(self, model, messages, stream=False, **options):
+        if not stream and options.get("response_format"):
+            return _complete(candidates(self.provider, model), messages, options)
+        stream_ = FailoverStream(options, candidates(self.provider, model), messages)
+        return stream_ if stream else stream_.completion()
+
+    async def achat(self, model, messages, stream=False, **options):
+        if not stream and options.get("response_format"):
+            return await _acomplete(candidates(self.provider, model), messages, options)
+        stream_ = HedgedStream(options, candidates(self.provider, model), messages)
+        return stream_ if stream else await stream_.completion()
+
+
+_gateways = {}
+
+
+def get_gateway(provider):
+    if provider not in _gateways:
+        _gateways[provider] = Gateway(provider)
+    return _gateways[provider]
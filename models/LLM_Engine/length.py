@@ -0,0 +1,242 @@
+"""
+Length control for timed speeches.
+
+A speech of N minutes is turned into a word budget from the speaking rate of the voice that
+will read it, and the output limit is set from that budget instead of a fixed max_tokens.
+When the model still stops short, only the missing part is requested:
+
+- cut off by the token limit (finish_reason "length"): the speech is continued from where
+  it stopped;
+- finished early (undershoot): one more section of the missing length is written and put
+  in before the closing paragraph.
+
+At most MAX_SEGMENTS extra calls are made (an extension is always the last), each with the
+earlier text in context, so a short speech costs one small follow-up instead of a full
+regeneration. A follow-up keeps the system messages and puts the original request, the
+instruction and the speech so far into one final user message, so the budgeter drops the
+session history before any of them and then cuts each in proportion.
+
+TimedStream streams every part, extensions included: it holds back the paragraph being
+written until the next one starts, so that when the speech turns out short the extension
+can still be streamed before its conclusion.
+"""
+
+import math
+from dataclasses import dataclass
+
+from dotenv import dotenv_values
+
+from models.LLM_Engine.budget import message_with_parts
+
+env_vars = dotenv_values(".env")
+
+# Speaking rate of a debater, and of the edge-tts voices at their normal rate.
+BASE_WPM = int(env_vars.get("SPEECH_WPM") or 140)
+VOICE_WPM = {
+    "en-US-GuyNeural": 150,
+    "en-US-AriaNeural": 150,
+    "en-US-AndrewNeural": 145,
+    "en-GB-RyanNeural": 145,
+    "en-CA-LiamNeural": 150,
+}
+# English averages about 1.3 tokens per word; the rest is headroom for the closing lines.
+TOKENS_PER_WORD = 1.3
+OUTPUT_HEADROOM = 1.15
+# A speech within this share of its word budget is long enough.
+MIN_SHARE = float(env_vars.get("SPEECH_MIN_SHARE") or 0.85)
+MAX_SEGMENTS = int(env_vars.get("SPEECH_MAX_SEGMENTS") or 2)
+# A paragraph longer than this is streamed without waiting for its end; an extension then
+# goes after it.
+HOLD_CHARS = 1500
+
+CONTINUE_PROMPT = """Your speech below stopped after about {written} words, it needs about {missing} more words to fill {minutes} minutes.
+Continue it from exactly the next word where it stopped. Do not repeat anything, do not start again and do not add any introduction or notes, and finish with the conclusion.
+
+Your speech so far:
+{text}"""
+
+EXTEND_PROMPT = """Your speech below is about {written} words, it needs about {missing} more words to fill {minutes} minutes.
+Write only one more section of about {missing} words in the same voice: a further argument or rebuttal that fits before the conclusion. Do not repeat any earlier point, do not add any introduction, notes or conclusion.
+
+Your speech so far:
+{text}"""
+
+
+def speaking_rate(voice=None, rate="+0%"):
+    """Words per minute of `voice` played at an edge-tts `rate` such as "+13%"."""
+    wpm = VOICE_WPM.get(voice, BASE_WPM)
+    return wpm * (1 + int(rate.strip().rstrip("%")) / 100)
+
+
+def count_words(text):
+    return len(text.split())
+
+
+@dataclass(frozen=True)
+class LengthTarget:
+    minutes: float
+    wpm: float = BASE_WPM
+
+    @classmethod
+    def for_voice(cls, minutes, voice=None, rate="+0%"):
+        return cls(minutes, speaking_rate(voice, rate))
+
+    @property
+    def words(self):
+        return int(round(self.minutes * self.wpm, -1))
+
+    @property
+    def min_words(self):
+        return int(self.words * MIN_SHARE)
+
+    def max_tokens(self, words=None):
+        return math.ceil((words or self.words) * TOKENS_PER_WORD * OUTPUT_HEADROOM)
+
+    def missing(self, text):
+        """Words still needed, or 0 if `text` is long enough."""
+        written = count_words(text)
+        return 0 if written >= self.min_words else self.words - written
+
+
+def _next_request(messages, target, text, finish_reason):
+    """The follow-up messages and max_tokens for the missing part, or None if `text` is done.
+
+    The original request, the instruction and the speech so far are the parts of one final
+    user message: the budgeter only drops the history before it, and when it has to cut the
+    request it cuts each part in proportion, keeping the start and end of the speech.
+    """
+    missing = target.missing(text)
+    if finish_reason != "length" and not missing:
+        return None
+    missing = missing or max(target.words - count_words(text), target.words // 10)
+    template = CONTINUE_PROMPT if finish_reason == "length" else EXTEND_PROMPT
+    prompt = template.format(written=count_words(text), missing=missing, minutes=target.minutes, text="")
+    request = messages[-1]
+    parts = request.get("parts") or [request["content"]]
+    follow_up = message_with_parts("user", parts + ["\n\n", prompt, text])
+    return messages[:-1] + [follow_up], target.max_tokens(missing)
+
+
+def _join(text, segment, finish_reason):
+    segment = segment.strip()
+    if not segment:
+        return text
+    if finish_reason == "length":
+        # Cut mid-sentence or mid-word: the continuation carries straight on.
+        return text + ("" if text[-1:].isspace() else " ") + segment
+    head, sep, last = text.rstrip().rpartition("\n")
+    if not sep:
+        return text.rstrip() + "\n\n" + segment
+    return head + "\n" + segment + "\n" + last
+
+
+class TimedSpeech:
+    """Result of a length-controlled generation."""
+
+    def __init__(self, text, provider, model, finish_reason, segments):
+        self.text = text
+        self.provider = provider
+        self.model = model
+        self.finish_reason = finish_reason
+        self.segments = segments
+
+
+def timed_chat(call, messages, target, **options):
+    """Generates a speech of `target` length through a RoutedCall, fetching only missing parts."""
+    completion = call.chat(messages, max_tokens=target.max_tokens(), **options)
+    text, finish_reason, segments = completion.text, completion.finish_reason, 1
+    while segments <= MAX_SEGMENTS:
+        request = _next_request(messages, target, text, finish_reason)
+        if request is None:
+            break
+        follow_up, max_tokens = request
+        segment = call.chat(follow_up, max_tokens=max_tokens, **options)
+        text = _join(text, segment.text, finish_reason)
+        segments += 1
+        if finish_reason != "length":
+            # An extension sits before the conclusion; the speech itself has ended.
+            break
+        finish_reason = segment.finish_reason
+    return TimedSpeech(text, completion.provider, completion.model, finish_reason, segments)
+
+
+async def atimed_chat(call, messages, target, **options):
+    """Async version of `timed_chat`."""
+    completion = await call.achat(messages, max_tokens=target.max_tokens(), **options)
+    text, finish_reason, segments = completion.text, completion.finish_reason, 1
+    while segments <= MAX_SEGMENTS:
+        request = _next_request(messages, target, text, finish_reason)
+        if request is None:
+            break
+        follow_up, max_tokens = request
+        segment = await call.achat(follow_up, max_tokens=max_tokens, **options)
+        text = _join(text, segment.text, finish_reason)
+        segments += 1
+        if finish_reason != "length":
+            # An extension sits before the conclusion; the speech itself has ended.
+            break
+        finish_reason = segment.finish_reason
+    return TimedSpeech(text, completion.provider, completion.model, finish_reason, segments)
+
+
+class TimedStream:
+    """Async stream of a length-controlled speech: the first part, its continuations and its
+    extension, in the order they are in `.text`.
+    """
+
+    def __init__(self, call, messages, target, options):
+        self.call = call
+        self.messages = messages
+        self.target = target
+        self.options = options
+        self.text = ""
+        self.finish_reason = None
+        self.segments = 0
+
+    async def __aiter__(self):
+        held = ""          # the end of `.text` not yielded yet: the paragraph being written
+        conclusion = ""    # the paragraph an extension is streamed before
+        messages, max_tokens, previous = self.messages, self.target.max_tokens(), None
+        while True:
+            stream = await self.call.achat(messages, max_tokens=max_tokens, stream=True, **self.options)
+            if previous is not None and previous != "length":
+                # Extending: the held paragraph is the conclusion, and goes after the extension.
+                conclusion, held = held, ""
+                self.text = self.text[:len(self.text) - len(conclusion)]
+            first = previous is not None
+            async for chunk in stream:
+                if first:
+                    chunk = chunk.lstrip()
+                    if not chunk:
+                        continue
+                    first = False
+                    if previous == "length" and not self.text[-1:].isspace():
+                        chunk = " " + chunk
+                    elif previous != "length" and self.text and not self.text.endswith("\n"):
+                        chunk = "\n" + chunk
+                self.text += chunk
+                held += chunk
+                # Hold from the start of the last paragraph that has text.
+                cut = held.rstrip().rfind("\n") + 1
+                if len(held) > HOLD_CHARS:
+                    cut = len(held)
+                if cut:
+                    yield held[:cut]
+                    held = held[cut:]
+            self.segments += 1
+            if conclusion:
+                tail = ("" if self.text.endswith("\n") else "\n") + conclusion
+                self.text += tail
+                held += tail
+                break
+            if previous is not None and previous != "length":
+                break
+            previous = self.finish_reason = stream.finish_reason
+            if self.segments > MAX_SEGMENTS:
+                break
+            request = _next_request(self.messages, self.target, self.text, previous)
+            if request is None:
+                break
+            messages, max_tokens = request
+        if held:
+            yield held
@@ -0,0 +1,312 @@
+"""
+Canonical motion ids: one cache id for every way a user types the same motion.
+
+"thw ban ciggrate ", "THW ban cigarettes" and "This House would ban cigarettes" are one
+motion, but they used to be three cache keys, three searches and three sets of speeches.
+A typed motion is canonicalized by
+
+    1. expanding the house prefix: THW -> This House would, THBT -> This House believes
+       that, THR -> regrets, THS -> supports, THO -> opposes, THP -> prefers;
+    2. correcting misspelt words against the words of the seed motions (difflib);
+    3. matching the result against the known motions on TF-IDF vectors of character
+       3-5-grams. The closest one with cosine similarity of at least MOTION_MATCH (0.8)
+       is the motion, provided it has the same house prefix (or none was typed) and
+       exactly the same content words, every word but a few function words ("the", "in",
+       "for"). Character n-grams alone score "ban cryptocurrency mining" 0.8 against "ban
+       cryptocurrencies", and cannot tell "ban" from "not ban" or "16" from "18".
+
+Speeches, POIs and ballots are cached on the motion id, so a wrong match would serve a
+speech written for another motion: a typed motion only takes a known id when it says the
+same thing, word for word once its spelling is corrected. Prompts and searches keep the
+user's own text.
+
+The known motions are the seeds in models/Data/motions.json plus up to MOTIONS_MAX (5000)
+motions seen since, remembered in MOTIONS_PATH (models/Data/cache/motions.json) so that they
+keep their ids across restarts; the oldest are forgotten first. IDF weights come from the
+seeds only, so a motion's vector is fixed when it is added: learning a motion only appends
+its n-grams to the postings, and the file is written by a timer thread, not by the caller.
+"""
+
+import atexit
+import difflib
+import functools
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data")
+SEEDS_PATH = os.path.join(DATA_DIR, "motions.json")
+MOTIONS_PATH = env_vars.get("MOTIONS_PATH") or os.path.join(DATA_DIR, "cache", "motions.json")
+MOTION_MATCH = float(env_vars.get("MOTION_MATCH") or 0.8)
+MOTIONS_MAX = int(env_vars.get("MOTIONS_MAX") or 5000)
+# Seconds a newly learned motion waits before the file is rewritten, so a burst is one write.
+SAVE_DELAY = 5.0
+# difflib ratio above which an unknown word is taken for a misspelling of a known one.
+SPELLING_MATCH = 0.7
+NGRAMS = (3, 5)
+
+HOUSE = "this house"
+PREFIXES = {
+    "thw": "would",
+    "thbt": "believes that",
+    "thr": "regrets",
+    "ths": "supports",
+    "tho": "opposes",
+    "thp": "prefers",
+}
+_TYPES = tuple(sorted(PREFIXES.values(), key=len, reverse=True))
+_NUMBERS = {str(n): word for n, word in enumerate("zero one two three four five six seven eight nine ten".split())}
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Words two motions may differ by: they do not change what is debated.
+FUNCTION_WORDS = frozenset("a an the of in on to for by with from at as and".split())
+# Never corrected, so "unban" or "cant" is not taken for a misspelling of a known word.
+NEGATIONS = frozenset("not no never nor neither without cannot cant dont doesnt shouldnt wouldnt isnt".split())
+NEGATING_PREFIXES = ("un", "non", "anti", "dis", "de")
+
+
+@dataclass(frozen=True)
+class Motion:
+    id: str
+    text: str
+
+
+def split_motion(raw):
+    """(house type, body) of a typed motion, lowercased, with the prefix expanded."""
+    words = _WORD.findall(str(raw).lower())
+    if words[:1] == ["th"]:
+        words[:1] = HOUSE.split()
+    if words and words[0] in PREFIXES:
+        return PREFIXES[words[0]], " ".join(words[1:])
+    text = " ".join(words)
+    if text.startswith(HOUSE + " "):
+        rest = text[len(HOUSE) + 1:]
+        for kind in _TYPES:
+            if rest == kind or rest.startswith(kind + " "):
+                return kind, rest[len(kind) + 1:]
+        return "", rest
+    return "", text
+
+
+def expand(raw):
+    """The typed motion with its house prefix written out."""
+    kind, body = split_motion(raw)
+    if not kind:
+        return " ".join(str(raw).split())
+    return f"This House {kind} {body}"
+
+
+def _singular(word):
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _comparable(body):
+    """A body as it is compared: numbers up to ten spelt out, plurals made singular."""
+    return " ".join(_singular(_NUMBERS.get(word, word)) for word in body.split())
+
+
+def _ngrams(text):
+    padded = f" {text} "
+    low, high = NGRAMS
+    return Counter(padded[i:i + n] for n in range(low, high + 1) for i in range(len(padded) - n + 1))
+
+
+def motion_hash(text):
+    return "m-" + hashlib.sha256(" ".join(text.split()).lower().encode("utf-8")).hexdigest()[:12]
+
+
+class MotionIndex:
+    """The known motions: sparse character n-gram TF-IDF postings and the seeds' vocabulary."""
+
+    def __init__(self, seeds_path=SEEDS_PATH, path=MOTIONS_PATH, max_motions=MOTIONS_MAX):
+        self.path = path
+        self.max_motions = max_motions
+        self._lock = threading.Lock()
+        self._timer = None
+        seeds = self._load(seeds_path)
+        seed_bodies = [_comparable(split_motion(text)[1]) for text in seeds]
+        # Spelling is corrected against the seeds only, so a typo that slipped into a
+        # remembered motion cannot become the correction for the next one.
+        self._vocab = sorted({word for body in seed_bodies for word in body.split()})
+        self._known = set(self._vocab)
+        df = Counter(gram for body in seed_bodies for gram in _ngrams(body))
+        self._idf = {gram: math.log((1 + len(seeds)) / (1 + count)) + 1 for gram, count in df.items()}
+        self._unseen_idf = math.log(1 + len(seeds)) + 1
+        self._seeds = seeds
+        self._learned = self._load(path)[-max_motions:]
+        self._rebuild()
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, encoding="utf-8") as file:
+                return [text for text in json.load(file) if isinstance(text, str) and text.strip()]
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Error : {e}")
+            return []
+
+    def _rebuild(self):
+        self.motions = []
+        self._texts = set()
+        self._postings = defaultdict(list)
+        # Each gram's postings as (rows, weights) arrays, made when first queried.
+        self._arrays = {}
+        learned, self._learned = self._learned, []
+        for text in self._seeds:
+            self._add(text)
+        for text in learned:
+            if self._add(text):
+                self._learned.append(text)
+
+    def _vector(self, body):
+        """Sparse, unit-length TF-IDF vector of the body's n-grams."""
+        vector = {gram: count * self._idf.get(gram, self._unseen_idf) for gram, count in _ngrams(body).items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        return {gram: weight / norm for gram, weight in vector.items()}
+
+    def _negated(self, word):
+        return any(word.startswith(prefix) and _singular(word[len(prefix):]) in self._known for prefix in NEGATING_PREFIXES)
+
+    @staticmethod
+    def content_words(body):
+        """The words two bodies must share, in order: all but FUNCTION_WORDS."""
+        return tuple(word for word in body.split() if word not in FUNCTION_WORDS)
+
+    def _add(self, text):
+        key = " ".join(text.split()).lower()
+        if key in self._texts:
+            return False
+        self._texts.add(key)
+        kind, body = split_motion(text)
+        # Indexed as `match` sees a typed body: a seed's words are already known, but a
+        # learned motion's may still be corrected towards them.
+        body = self.correct(_comparable(body))
+        row = len(self.motions)
+        self.motions.append((Motion(motion_hash(text), text), kind, self.content_words(body)))
+        for gram, weight in self._vector(body).items():
+            self._postings[gram].append((row, weight))
+            self._arrays.pop(gram, None)
+        return True
+
+    def correct(self, body):
+        """`body` with every unknown word of 4+ letters replaced by the closest known word.
+
+        Negations ("unban" is not a misspelling of "ban") and numbers are left alone.
+        """
+        words = []
+        for word in body.split():
+            if (len(word) >= 4 and not word.isdigit() and word not in NEGATIONS
+                    and _singular(word) not in self._known and not self._negated(word)):
+                close = difflib.get_close_matches(word, self._vocab, n=1, cutoff=SPELLING_MATCH)
+                word = close[0] if close else word
+            words.append(word)
+        return " ".join(words)
+
+    def match(self, raw):
+        """The closest known motion with the same prefix and content words, and its similarity."""
+        kind, body = split_motion(raw)
+        if not body:
+            return None, 0.0
+        body = self.correct(_comparable(body))
+        words = self.content_words(body)
+        with self._lock:
+            scores = np.zeros(len(self.motions))
+            for gram, weight in self._vector(body).items():
+                if gram not in self._postings:
+                    continue
+                if gram not in self._arrays:
+                    rows, weights = zip(*self._postings[gram])
+                    self._arrays[gram] = (np.array(rows), np.array(weights))
+                rows, weights = self._arrays[gram]
+                scores[rows] += weight * weights
+            for row in np.argsort(-scores, kind="stable"):
+                if scores[row] < MOTION_MATCH:
+                    break
+                motion, other_kind, other_words = self.motions[row]
+                if (not kind or other_kind in ("", kind)) and other_words == words:
+                    return motion, float(scores[row])
+        return None, float(scores.max(initial=0.0))
+
+    def learn(self, raw):
+        """Remembers a new motion, its prefix expanded and its spelling corrected."""
+        kind, body = split_motion(raw)
+        body = self.correct(body)
+        text = f"This House {kind} {body}" if kind else body
+        text = text[:1].upper() + text[1:]
+        with self._lock:
+            if self._add(text):
+                self._learned.append(text)
+                if len(self._learned) > self.max_motions:
+                    # Forget the oldest tenth at once, so the postings are rebuilt rarely.
+                    self._learned = self._learned[len(self._learned) - self.max_motions * 9 // 10:]
+                    self._rebuild()
+                self._schedule_save()
+        return Motion(motion_hash(text), text)
+
+    def _schedule_save(self):
+        if self._timer is None:
+            self._timer = threading.Timer(SAVE_DELAY, self.save)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def save(self):
+        """Writes the learned motions out, atomically."""
+        with self._lock:
+            self._timer = None
+            learned = list(self._learned)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(learned, file, indent=4, ensure_ascii=False)
+            os.replace(self.path + ".tmp", self.path)
+        except Exception as e:
+            print(f"Error : {e}")
+
+    def flush(self):
+        """Writes out a pending save now (at exit)."""
+        with self._lock:
+            timer = self._timer
+        if timer is not None:
+            timer.cancel()
+            self.save()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def motion_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = MotionIndex()
+            atexit.register(_index.flush)
+        return _index
+
+
+@functools.lru_cache(maxsize=1024)
+def canonical_motion(raw):
+    """The known Motion `raw` is a way of typing, or a new one. Use its id, not its text."""
+    if not str(raw).strip():
+        return Motion(motion_hash(""), "")
+    index = motion_index()
+    motion, _ = index.match(raw)
+    return motion or index.learn(raw)
+
+
+def motion_id(raw):
+    return canonical_motion(raw).id
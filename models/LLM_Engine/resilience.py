@@ -0,0 +1,269 @@
+"""
+Retries, backoff and circuit breaking for LLM calls.
+
+Every provider call goes through `retry_call` / `retry_stream` (or their async versions).
+Transient failures (timeouts, dropped connections, 429 and 5xx responses) are retried a bounded
+number of times with jittered exponential backoff. A breaker per provider/model stops sending
+calls to an endpoint that keeps failing and lets one trial call through after a cool-down.
+Whatever still fails is raised as an LLMError, which the app turns into a JSON error response.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+import httpx
+from dotenv import dotenv_values
+from fastapi.responses import JSONResponse
+
+env_vars = dotenv_values(".env")
+
+RETRY_ATTEMPTS = int(env_vars.get("LLM_RETRY_ATTEMPTS") or 3)
+BACKOFF_BASE = float(env_vars.get("LLM_BACKOFF_BASE") or 0.5)
+BACKOFF_MAX = float(env_vars.get("LLM_BACKOFF_MAX") or 8.0)
+BREAKER_FAILURES = int(env_vars.get("LLM_BREAKER_FAILURES") or 5)
+BREAKER_RESET = float(env_vars.get("LLM_BREAKER_RESET") or 30.0)
+
+# HTTP status the API answers with for each kind of failure.
+STATUS_CODES = {
+    "timeout": 504,
+    "connection": 502,
+    "rate_limited": 429,
+    "upstream": 502,
+    "rejected": 502,
+    "circuit_open": 503,
+}
+
+
+class LLMError(Exception):
+    """A provider call that failed for good, described well enough for the API to report it."""
+
+    def __init__(self, kind, provider, model, message, retryable=False, retry_after=None):
+        super().__init__(f"{provider}/{model}: {message}")
+        self.kind = kind
+        self.provider = provider
+        self.model = model
+        self.message = message
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+    @property
+    def status_code(self):
+        return STATUS_CODES.get(self.kind, 502)
+
+    def to_dict(self):
+        return {
+            "type": self.kind,
+            "provider": self.provider,
+            "model": self.model,
+            "message": self.message,
+            "retryable": self.retryable,
+            "retry_after": self.retry_after,
+        }
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def classify(error, provider, model):
+    """Turns an exception from a provider call into an LLMError."""
+    if isinstance(error, LLMError):
+        return error
+    if isinstance(error, httpx.TimeoutException):
+        return LLMError("timeout", provider, model, "the provider timed out", retryable=True)
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        if status == 429:
+            return LLMError("rate_limited", provider, model, "rate limited by the provider", True, _retry_after(error.response))
+        if status >= 500:
+            return LLMError("upstream", provider, model, f"the provider returned {status}", retryable=True)
+        return LLMError("rejected", provider, model, f"the provider rejected the request ({status})")
+    if isinstance(error, httpx.TransportError):
+        return LLMError("connection", provider, model, f"could not reach the provider ({error})", retryable=True)
+    return LLMError("upstream", provider, model, str(error) or type(error).__name__)
+
+
+def backoff(attempt, error=None):
+    """Seconds to wait before retry number `attempt` (1-based): full jitter, capped."""
+    if error is not None and error.retry_after:
+        return min(error.retry_after, BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Opens after `failures` consecutive transient failures, then half-opens after `reset` seconds.
+
+    The half-open trial reports back with `record_success`, `record_failure` or, when it was
+    cancelled before it could tell (a hedge it lost, a client that went away), `release`. A
+    trial that never reports back at all is replaced by a new one after another `reset` seconds.
+    """
+
+    def __init__(self, provider, model, failures=BREAKER_FAILURES, reset=BREAKER_RESET):
+        self.provider = provider
+        self.model = model
+        self.failures = failures
+        self.reset = reset
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Raises LLMError("circuit_open") while the breaker is open."""
+        with self._lock:
+            if self.state == "closed":
+                return
+            now = time.monotonic()
+            remaining = self.opened_at + self.reset - now
+            if (self.state == "open" and remaining <= 0) or (self.state == "half_open" and now - self.trial_at > self.reset):
+                # Let one trial call through; everyone else keeps failing fast until it reports back.
+                self.state = "half_open"
+                self.trial_at = now
+                return
+            raise LLMError(
+                "circuit_open", self.provider, self.model, "the provider is failing, not sending more calls for now",
+                retryable=True, retry_after=round(max(remaining, 0.0), 1) or None,
+            )
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+
+    def release(self):
+        """The call `allow` let through ended without a result: the next call may be the trial."""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failures:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(provider, model):
+    key = (provider, model)
+    with _breakers_lock:
+        if key not in _breakers:
+            _breakers[key] = CircuitBreaker(provider, model)
+        return _breakers[key]
+
+
+def _failed(breaker, error, provider, model):
+    error = classify(error, provider, model)
+    if error.retryable:
+        breaker.record_failure()
+    else:
+        # The provider answered, it just did not like this request.
+        breaker.record_success()
+    return error
+
+
+def retry_call(provider, model, fn, attempts=RETRY_ATTEMPTS):
+    """Calls `fn()` with retries and the provider/model breaker."""
+    breaker = breaker_for(provider, model)
+    for attempt in range(1, attempts + 1):
+        breaker.allow()
+        try:
+            result = fn()
+        except Exception as e:
+            error = _failed(breaker, e, provider, model)
+            if not error.retryable or attempt == attempts:
+                raise error from e
+            time.sleep(backoff(attempt, error))
+        except BaseException:
+            # Cancelled (a lost hedge, a closed stream): no verdict on the provider, but a
+            # half-open breaker must not wait forever for this call to report back.
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+async def aretry_call(provider, model, fn, attempts=RETRY_ATTEMPTS):
+    """Async version of `retry_call`; `fn` returns an awaitable."""
+    breaker = breaker_for(provider, model)
+    for attempt in range(1, attempts + 1):
+        breaker.allow()
+        try:
+            result = await fn()
+        except Exception as e:
+            error = _failed(breaker, e, provider, model)
+            if not error.retryable or attempt == attempts:
+                raise error from e
+            await asyncio.sleep(backoff(attempt, error))
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+def retry_stream(provider, model, chunks, attempts=RETRY_ATTEMPTS):
+    """Yields from `chunks()`, retrying only while nothing has been yielded yet.
+
+    Once text has reached the caller a retry would repeat it, so later failures are raised.
+    """
+    breaker = breaker_for(provider, model)
+    for attempt in range(1, attempts + 1):
+        breaker.allow()
+        started = False
+        try:
+            for chunk in chunks():
+                started = True
+                yield chunk
+        except Exception as e:
+            error = _failed(breaker, e, provider, model)
+            if started or not error.retryable or attempt == attempts:
+                raise error from e
+            time.sleep(backoff(attempt, error))
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            return
+
+
+async def aretry_stream(provider, model, chunks, attempts=RETRY_ATTEMPTS):
+    """Async version of `retry_stream`; `chunks()` returns an async iterator."""
+    breaker = breaker_for(provider, model)
+    for attempt in range(1, attempts + 1):
+        breaker.allow()
+        started = False
+        try:
+            async for chunk in chunks():
+                started = True
+                yield chunk
+        except Exception as e:
+            error = _failed(breaker, e, provider, model)
+            if started or not error.retryable or attempt == attempts:
+                raise error from e
+            await asyncio.sleep(backoff(attempt, error))
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            return
+
+
+async def llm_error_handler(request, error):
+    """FastAPI exception handler that reports an LLMError as a JSON body with a matching status."""
+    headers = {"Retry-After": str(int(error.retry_after) or 1)} if error.retry_after else None
+    return JSONResponse(status_code=error.status_code, content={"error": error.to_dict()}, headers=headers)
@@ -0,0 +1,172 @@
+"""
+Latency-SLO driven model routing.
+
+Each kind of call has a time-to-first-token budget and a large and a fast model. The large
+model is used while its observed p95 TTFT (tracked by the gateway) fits the budget, the fast
+one once it does not. POIs and replies must feel instant in a live round, so their budget is
+tight; the Asian Parliamentary adjudication is read after the round and can wait.
+
+Only the samples of the last LLM_ROUTE_SAMPLE_AGE seconds (300) count, so a slow spell is
+forgotten. The large model is only measured when it is used, so while it is not (demoted,
+or a call type that defaults to the fast one) one call every LLM_PROBE_INTERVAL seconds (30)
+goes to it anyway as a probe, whatever its recent samples say. Probes never take a "live"
+call (see admission).
+
+Any call type can be overridden in .env, e.g. for `poi`:
+    LLM_SLO_POI=0.8                      # TTFT budget in seconds
+    LLM_TIER_POI=large                   # always use the large (or fast) model
+    LLM_MODEL_POI=groq/llama3-70b-8192   # always use this provider/model
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+from dotenv import dotenv_values
+
+from models.LLM_Engine import trace
+from models.LLM_Engine.admission import current_priority
+from models.LLM_Engine.budget import context_window, fit_messages
+from models.LLM_Engine.gateway import candidates, get_gateway, ttft
+from models.LLM_Engine.resilience import LLMError
+
+env_vars = dotenv_values(".env")
+
+GROQ_LARGE = ("groq", "llama3-70b-8192")
+GROQ_FAST = ("groq", "llama-3.1-8b-instant")
+SAMBANOVA_LARGE = ("sambanova", "Meta-Llama-3.1-70B-Instruct")
+SAMBANOVA_FAST = ("sambanova", "Meta-Llama-3.1-8B-Instruct")
+
+ROUTE_SAMPLE_AGE = float(env_vars.get("LLM_ROUTE_SAMPLE_AGE") or 300)
+PROBE_INTERVAL = float(env_vars.get("LLM_PROBE_INTERVAL") or 30)
+
+# slo: TTFT budget in seconds. default: the tier used before the large model has enough samples.
+CALL_TYPES = {
+    "ap_speech": {"slo": 3.0, "large": GROQ_LARGE, "fast": GROQ_FAST, "default": "large"},
+    "poi": {"slo": 1.0, "large": GROQ_LARGE, "fast": GROQ_FAST, "default": "fast"},
+    "mock_speech": {"slo": 3.0, "large": SAMBANOVA_LARGE, "fast": SAMBANOVA_FAST, "default": "large"},
+    "reply": {"slo": 1.5, "large": SAMBANOVA_LARGE, "fast": SAMBANOVA_FAST, "default": "fast"},
+    "speech": {"slo": 3.0, "large": SAMBANOVA_LARGE, "fast": SAMBANOVA_FAST, "default": "large"},
+    "feedback": {"slo": 4.0, "large": SAMBANOVA_LARGE, "fast": SAMBANOVA_FAST, "default": "large"},
+    "judge_mock": {"slo": 8.0, "large": SAMBANOVA_LARGE, "fast": SAMBANOVA_FAST, "default": "large"},
+    "judge_par": {"slo": 15.0, "large": SAMBANOVA_LARGE, "fast": SAMBANOVA_FAST, "default": "large"},
+}
+
+for name, spec in CALL_TYPES.items():
+    suffix = name.upper()
+    if env_vars.get(f"LLM_SLO_{suffix}"):
+        spec["slo"] = float(env_vars[f"LLM_SLO_{suffix}"])
+    spec["tier"] = env_vars.get(f"LLM_TIER_{suffix}")
+    model = env_vars.get(f"LLM_MODEL_{suffix}")
+    spec["model"] = tuple(model.split("/", 1)) if model else None
+
+
+@dataclass
+class Route:
+    call_type: str
+    tier: str
+    provider: str
+    model: str
+    slo: float
+
+
+_probed = {}
+_probe_lock = threading.Lock()
+
+
+def _probe_due(model):
+    """Whether this call should probe `model`: nothing measured it for PROBE_INTERVAL."""
+    if current_priority() == "live":
+        return False
+    now = time.monotonic()
+    with _probe_lock:
+        last = max(_probed.get(model, float("-inf")), ttft.last_sample(*model) or float("-inf"))
+        if now - last < PROBE_INTERVAL:
+            return False
+        _probed[model] = now
+        return True
+
+
+def choose(call_type):
+    """Picks the provider/model for one call of `call_type`."""
+    spec = CALL_TYPES[call_type]
+    if spec["model"]:
+        return Route(call_type, "override", *spec["model"], spec["slo"])
+
+    tier = spec["tier"]
+    if tier not in ("large", "fast"):
+        p95 = ttft.p95(*spec["large"], max_age=ROUTE_SAMPLE_AGE)
+        if p95 is None and spec["default"] == "large" or p95 is not None and p95 <= spec["slo"]:
+            tier = "large"
+        elif _probe_due(spec["large"]):
+            return Route(call_type, "probe", *spec["large"], spec["slo"])
+        else:
+            tier = "fast"
+    return Route(call_type, tier, *spec[tier], spec["slo"])
+
+
+def fit(route, messages, options):
+    """Trims `messages` and the max_tokens in `options` to the smallest window the call may land on."""
+    window = min(context_window(*candidate) for candidate in candidates(route.provider, route.model))
+    options = dict(options)
+    min_output = options.pop("min_output", None)
+    try:
+        messages, options["max_tokens"], budget = fit_messages(
+            messages, options.get("max_tokens", 1024), window, route.model, min_output
+        )
+    except ValueError as e:
+        raise LLMError("rejected", route.provider, route.model, str(e)) from e
+    return messages, options, budget
+
+
+class Served:
+    """Trace entry for one routed call; the provider/model are read from the result at report time."""
+
+    def __init__(self, route, result, budget=None):
+        self.route = route
+        self.result = result
+        self.budget = budget
+
+    def to_dict(self):
+        entry = {
+            "call": self.route.call_type,
+            "tier": self.route.tier,
+            "provider": self.result.provider,
+            "model": self.result.model,
+            "hedged": getattr(self.result, "hedged", False),
+        }
+        if self.budget is not None:
+            entry["tokens"] = self.budget.to_dict()
+        return entry
+
+
+class RoutedCall:
+    """`chat()` / `achat()` for one call type, without naming a model.
+
+    Takes the ChatClient options plus `min_output`, the fewest output tokens worth asking for
+    when the prompt leaves little room in the window.
+    """
+
+    def __init__(self, call_type):
+        self.call_type = call_type
+
+    def chat(self, messages, **options):
+        route = choose(self.call_type)
+        messages, options, budget = fit(route, messages, options)
+        result = get_gateway(route.provider).chat(route.model, messages, **options)
+        trace.record(Served(route, result, budget))
+        return result
+
+    async def achat(self, messages, **options):
+        route = choose(self.call_type)
+        messages, options, budget = fit(route, messages, options)
+        result = await get_gateway(route.provider).achat(route.model, messages, **options)
+        trace.record(Served(route, result, budget))
+        return result
+
+
+_calls = {name: RoutedCall(name) for name in CALL_TYPES}
+
+
+def for_call(call_type):
+    return _calls[call_type]
@@ -0,0 +1,240 @@
+"""
+One-pass cleanup of generated text, for whole answers and for streams alike.
+
+Feed a Sanitizer the chunks as they arrive and it returns the clean text that is safe to
+emit so far. It holds back only what it cannot decide yet: the start of a line (it may be a
+preamble or a "Sources:" heading), an open bracket (it may be a stage direction) and, from a
+sources heading on, the lines that may be the answer's sources section. It removes:
+
+- markdown emphasis, heading hashes, block quotes and horizontal rules, and end-of-sequence
+  tokens such as </s>;
+- empty lines;
+- in speeches (speech=True):
+  - stage directions, when the whole bracket is made of them: "(pause for emphasis)",
+    "[applause]", "(smiles and turns to the opposition)", but not "(points of information
+    were refused)";
+  - a first line that announces the answer: "Here is your 7 minute speech as the PM:", but
+    not "Here is the thing: ...";
+  - a trailing sources section: a line that is only a heading ("Sources:", "References")
+    followed by nothing but citations (URLs, domains, years, [1], short list items) up to
+    the end. Lines such as "Sources of revenue:" or "Note that:" are text, and so is a
+    heading that prose follows;
+  - bare URL lines and "Word count: 950" lines.
+
+`sanitize(text)` cleans a whole answer; `sanitize_stream(chunks)` wraps an async stream.
+Both give the same text for the same input, however the stream is split.
+"""
+
+import re
+
+# Characters of a line needed to tell a heading or preamble from ordinary text.
+DECIDE_AT = 48
+# An open bracket held longer than this is not a stage direction; let it through.
+MAX_HOLD = 120
+
+_TOKENS = re.compile(r"</s>|<\|eot_id\|>|<\|end_of_text\|>")
+_EMPHASIS = re.compile(r"\*+|__")
+_LINE_MARKUP = re.compile(r"^\s*(?:#{1,6}\s+|>\s?)")
+_RULE = re.compile(r"^\s*(?:[-*_=]\s*){3,}$")
+# Who a speaker turns, looks or points to in a stage direction.
+_AUDIENCE = (
+    r"(?:the\s+)?(?:audience|house|chair|speaker|judges?|adjudicators?|crowd|room|"
+    r"opposition|government|proposition|other side|bench|benches)(?:\s+benche?s?)?"
+)
+# One stage direction, in the phrasings the models use.
+_DIRECTION = (
+    r"(?:(?:(?:a|short|brief|long|dramatic|slight)\s+)?(?:pause[sd]?|pausing|beat)"
+    r"(?:\s+(?:for|to add)\s+(?:emphasis|effect))?|"
+    r"(?:for\s+)?(?:emphasis|effect)|"
+    r"applause|laughter|laughs|smiles?|smiling|sighs?|silence|nods?|nodding|clears\s+(?:(?:his|her|their)\s+)?throat|"
+    r"(?:speaking\s+)?(?:slowly|softly|louder|firmly)|raises\s+(?:(?:a|his|her|their)\s+)?(?:hand|voice)|"
+    r"(?:looks?|looking|gestures?|gesturing|points?|pointing|turns?|turning|nods?)"
+    r"(?:\s+(?:at|to|towards|toward))?\s+" + _AUDIENCE + r"|"
+    r"to\s+" + _AUDIENCE + r")"
+    r"(?:\s+(?:slowly|softly|briefly|firmly|louder|confidently|here))?"
+)
+# A bracket that holds nothing but stage directions: "(smiles and looks to the house)".
+_STAGE = re.compile(
+    r"\s*[\(\[]\s*" + _DIRECTION + r"(?:\s*(?:,|and|then)\s*" + _DIRECTION + r")*\s*[.!]?\s*[\)\]]",
+    re.IGNORECASE,
+)
+# "Here is your 7 minute speech ...": the thing announced must come within a few set words.
+_PREAMBLE = re.compile(
+    r"^\W*(?:(?:sure|certainly|okay|ok|alright|absolutely|of course)\W+)?"
+    r"(?:here(?:'s|’s| is| are)|below is|below are|i have (?:written|prepared))\s+"
+    r"(?:(?:your|the|a|an|my|some|\d+|one|two|three|four|five|six|seven|eight|nine|ten)\s+)?"
+    r"(?:(?:[a-z]+\s+){0,3}[a-z]+(?:'s|’s)\s+)?"
+    r"(?:(?:revised|improved|updated|final|full|complete|new|persuasive|possible|"
+    r"(?:\d+|one|two|three|four|five|six|seven|eight|nine|ten)[ -]?minutes?)[ -]+)*"
+    r"(?:speech|version|draft|script|feedback|questions|pois?|points of information)\b",
+    re.IGNORECASE,
+)
+# A line that is nothing but the heading of a sources section.
+_SOURCES = re.compile(
+    r"^\W*(?:sources?(?:\s+(?:used|cited))?|references?|citations?|bibliography|works cited|facts used|notes?)\s*:?\s*$",
+    re.IGNORECASE,
+)
+# A line a sources section may hold: blank, a citation, or a short list item ("- BBC News").
+_CITATION = re.compile(
+    r"^\s*$|\[\d+\]|https?://|www\.|\b[\w-]+\.(?:com|org|net|gov|edu|int|io|in|uk)\b|\b(?:19|20)\d\d\b|"
+    r"^\s*(?:[-*•]|\d+[.)])\s+(?:\S+\s+){0,9}\S+\s*$",
+    re.IGNORECASE,
+)
+_WORD_COUNT = re.compile(r"^\W*word count\s*:?\s*\d[\d,]*(?:\s+words)?\W*$", re.IGNORECASE)
+_URL_LINE = re.compile(r"^\W*(?:source:\s*)?<?https?://\S+>?\s*$", re.IGNORECASE)
+# What may still turn into something to remove at the end of a partial line.
+_PARTIAL_TAIL = re.compile(r"(?:\s*(?:<[^>\s]{0,14}|[*_]+)|\s+)$")
+# Partial lines that may still turn out to be a URL line, a word count or a rule.
+_PARTIAL_URL = re.compile(r"^\W*(?:source:\s*)?\S*\s*$", re.IGNORECASE)
+_PARTIAL_WORD_COUNT = re.compile(r"^\W*word count[\s:\d,]*(?:w(?:o(?:r(?:ds?)?)?)?)?\W*$", re.IGNORECASE)
+_PARTIAL_RULE = re.compile(r"^[-*_=\s]*$")
+_LEADING = re.compile(r"^\W+")
+
+TEXT, DROP_LINE, HOLD = "text", "drop_line", "hold"
+
+
+class Sanitizer:
+    def __init__(self, speech=True):
+        self.speech = speech
+        self._pending = ""       # the current line's text not emitted yet
+        self._decided = False    # the current line's start has been judged to be text
+        self._dropping = False   # the current line is being dropped
+        self._has_text = False   # the current line has emitted something
+        self._consumed = False   # part of the current line has been cleaned and let through
+        self._started = False    # anything has been emitted at all
+        self._held = None        # the lines of what may be a trailing sources section
+        self._releasing = False  # held lines are being emitted as text
+
+    def feed(self, chunk):
+        if not chunk:
+            return ""
+        out = []
+        self._pending += chunk
+        while True:
+            if "\n" in self._pending:
+                line, self._pending = self._pending.split("\n", 1)
+                self._end_line(line, out)
+                continue
+            if self._held is not None:
+                # A possible sources section is judged a whole line at a time.
+                break
+            if self._dropping:
+                self._pending = ""
+            elif self._pending and not self._decided:
+                self._pending = self._start_line(self._pending, complete=False)
+            if self._pending and self._decided and (self._consumed or not _PARTIAL_RULE.match(self._pending)):
+                text, rest = self._clean(self._pending, final=False)
+                self._consumed = self._consumed or len(rest) < len(self._pending)
+                self._pending = rest
+                self._emit(text, out)
+            break
+        return "".join(out)
+
+    def finish(self):
+        """The text still held back, once the answer is complete."""
+        out = []
+        if self._pending:
+            line, self._pending = self._pending, ""
+            self._end_line(line, out)
+        # Nothing but citations followed the heading: it was the sources section.
+        self._held = None
+        return "".join(out)
+
+    def _verdict(self, line, complete):
+        if not self.speech:
+            return TEXT
+        if complete and not self._releasing and _SOURCES.match(line):
+            return HOLD
+        if not self._started and _PREAMBLE.match(line):
+            return DROP_LINE
+        if complete and (_URL_LINE.match(line) or _WORD_COUNT.match(line)):
+            return DROP_LINE
+        return TEXT
+
+    def _undecided(self, line):
+        """Whether the start of a partial line may still be judged otherwise once it is whole."""
+        if len(_LEADING.sub("", line).strip()) < DECIDE_AT:
+            return True
+        if _PARTIAL_URL.match(line) or _PARTIAL_WORD_COUNT.match(line):
+            return True
+        preamble = not self._started and _PREAMBLE.match(line)
+        return bool(preamble) and preamble.end() == len(line)
+
+    def _start_line(self, line, complete):
+        """Judges the start of `line`; returns it without line markup if it is text to emit."""
+        if not complete and self._undecided(line):
+            return line
+        verdict = self._verdict(line, complete)
+        if verdict == HOLD:
+            self._held = [line]
+        elif verdict == DROP_LINE:
+            self._dropping = True
+        else:
+            self._decided = True
+            return _LINE_MARKUP.sub("", line)
+        return ""
+
+    def _end_line(self, line, out):
+        if self._held is not None:
+            if _CITATION.search(line):
+                self._held.append(line)
+                return
+            self._release(out)
+        if not self._dropping:
+            if not self._decided:
+                line = self._start_line(line, complete=True)
+            # A rule is a whole line: text already let through makes the rest of it text too.
+            if self._decided and (self._consumed or not _RULE.match(line)):
+                self._emit(self._clean(line, final=True)[0], out)
+        self._decided = self._dropping = self._has_text = self._consumed = False
+
+    def _release(self, out):
+        """Emits the held lines as ordinary text: prose followed the heading."""
+        held, self._held = self._held, None
+        self._releasing = True
+        for line in held:
+            self._end_line(line, out)
+        self._releasing = False
+
+    def _clean(self, text, final):
+        """(clean text, held-back rest) of a stretch of a line that is known to be text."""
+        # Tokens first, so that the whitespace before one is held back like any other.
+        text, rest = _TOKENS.sub("", text), ""
+        if not final:
+            cut = max(text.rfind("("), text.rfind("["))
+            if cut != -1 and ")" not in text[cut:] and "]" not in text[cut:] and len(text) - cut <= MAX_HOLD:
+                text, rest = text[:cut], text[cut:]
+            tail = _PARTIAL_TAIL.search(text)
+            if tail:
+                text, rest = text[:tail.start()], text[tail.start():] + rest
+        # Emphasis before stage directions, so that removing one never joins two markers.
+        text = _EMPHASIS.sub("", text)
+        if self.speech:
+            text = _STAGE.sub("", text)
+        return text, rest
+
+    def _emit(self, text, out):
+        if not self._has_text:
+            text = text.lstrip()
+            if not text:
+                return
+            if self._started:
+                out.append("\n")
+            self._has_text = self._started = True
+        out.append(text)
+
+
+def sanitize(text, speech=True):
+    sanitizer = Sanitizer(speech)
+    return (sanitizer.feed(text) + sanitizer.finish()).rstrip()
+
+
+async def sanitize_stream(chunks, speech=True):
+    sanitizer = Sanitizer(speech)
+    async for chunk in chunks:
+        text = sanitizer.feed(chunk)
+        if text:
+            yield text
+    text = sanitizer.finish()
+    if text:
+        yield text
@@ -0,0 +1,154 @@
+"""
+Single-flight coalescing of identical in-flight generations.
+
+When many callers ask for the same generation at once (a class starting the same motion),
+only the first one reaches the provider. The others wait for it and share its result, or,
+for streamed speeches, replay its chunks from the start and then follow it live.
+Keys are the same content hashes the generation cache uses.
+
+The shared work runs at its own Urgency (see admission), at first its leader's priority. A
+caller that joins it at a more urgent priority promotes it, so a live request never waits
+behind the batch prefetch it joined.
+"""
+
+import asyncio
+import threading
+
+from models.LLM_Engine.admission import current_priority, priority, shared_urgency
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.urgency = shared_urgency()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent blocking calls across threads."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.urgency.promote(current_priority())
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            with priority(call.urgency):
+                call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class _Broadcast:
+    """Buffers one upstream chunk stream so any number of subscribers can read all of it."""
+
+    def __init__(self):
+        self.chunks = []
+        self.finished = False
+        self.error = None
+        self.urgency = shared_urgency()
+        self._changed = asyncio.Condition()
+
+    async def run(self, chunks):
+        try:
+            with priority(self.urgency):
+                async for chunk in chunks():
+                    async with self._changed:
+                        self.chunks.append(chunk)
+                        self._changed.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            async with self._changed:
+                self.finished = True
+                self._changed.notify_all()
+
+    async def subscribe(self):
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: sent < len(self.chunks) or self.finished)
+                new = self.chunks[sent:]
+                finished = self.finished
+            for chunk in new:
+                yield chunk
+            sent += len(new)
+            if finished and sent == len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class AsyncSingleFlight:
+    """Coalesces concurrent coroutines and chunk streams on one event loop.
+
+    The shared work runs in its own task, so a caller that disconnects does not cancel it
+    for everyone else, and its result still reaches the cache.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._urgencies = {}
+        self._streams = {}
+
+    def _forget(self, registry, key, value):
+        if registry.get(key) is value:
+            del registry[key]
+
+    async def do(self, key, fn):
+        task = self._calls.get(key)
+        if task is None:
+            urgency = shared_urgency()
+
+            async def run():
+                with priority(urgency):
+                    return await fn()
+
+            task = asyncio.ensure_future(run())
+            self._calls[key] = task
+            self._urgencies[task] = urgency
+            task.add_done_callback(lambda _: self._forget(self._calls, key, task))
+            task.add_done_callback(self._urgencies.pop)
+        else:
+            self._urgencies[task].promote(current_priority())
+        return await asyncio.shield(task)
+
+    async def stream(self, key, chunks):
+        """Yields the chunks of `chunks()`, sharing one upstream stream per key.
+
+        `chunks` is only called by the first subscriber; later ones get everything
+        produced so far and then the rest as it arrives.
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            broadcast = self._streams[key] = _Broadcast()
+            task = asyncio.ensure_future(broadcast.run(chunks))
+            task.add_done_callback(lambda _: self._forget(self._streams, key, broadcast))
+        else:
+            broadcast.urgency.promote(current_priority())
+        async for chunk in broadcast.subscribe():
+            yield chunk
+
+
+flights = SingleFlight()
+async_flights = AsyncSingleFlight()
@@ -0,0 +1,47 @@
+"""
+Server-Sent Events helpers for the token-streaming endpoints.
+"""
+
+import json
+
+from fastapi.responses import StreamingResponse
+
+from models.LLM_Engine import trace
+from models.LLM_Engine.admission import priority
+from models.LLM_Engine.resilience import LLMError
+
+
+def sse_event(data, event=None):
+    """Formats one SSE message. Multi-line text is split over several `data:` lines."""
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in str(data).split("\n")]
+    return "\n".join(lines) + "\n\n"
+
+
+async def sse_stream(chunks, level="live"):
+    # Someone is watching these tokens arrive, so their LLM calls are admitted ahead of other work.
+    with priority(level):
+        # A comment line first, so proxies and the browser see the stream open straight away.
+        yield ": stream open\n\n"
+        try:
+            async for chunk in chunks:
+                yield sse_event(chunk)
+        except LLMError as e:
+            print(f"Error : {e}")
+            yield sse_event(json.dumps(e.to_dict()), event="error")
+            return
+        except Exception as e:
+            print(f"Error : {e}")
+            yield sse_event(json.dumps({"type": "internal", "message": str(e)}), event="error")
+            return
+        # Which model (or the cache) produced the text is only known once the stream is over.
+        yield sse_event(json.dumps({"served": trace.served()}), event="done")
+
+
+def sse_response(chunks):
+    """Wraps an async iterator of text chunks in a text/event-stream response."""
+    return StreamingResponse(
+        sse_stream(chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
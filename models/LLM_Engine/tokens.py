@@ -0,0 +1,75 @@
+"""
+Token counting shared by the conversation store and prompt budgeting.
+
+Counts come from a BPE tokenizer when `tiktoken` is installed. Llama 3's tokenizer is
+cl100k_base extended with 28k extra tokens, so its counts are within a few percent for
+English. Without it, the ~4 characters per token average is used. Set LLM_TOKENIZER in .env
+to pick another tiktoken encoding, or to "chars" to force the estimate.
+"""
+
+import math
+from functools import lru_cache
+
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+
+# Llama-3 style BPE averages close to four characters of English per token.
+CHARS_PER_TOKEN = 4
+# Role markers and separators the chat template adds around every message.
+MESSAGE_OVERHEAD = 4
+
+TOKENIZER = env_vars.get("LLM_TOKENIZER") or "cl100k_base"
+
+
+def _load_encoding(name):
+    if name == "chars":
+        return None
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        print(f"Error : {e}, counting tokens by characters")
+        return None
+
+
+_encoding = _load_encoding(TOKENIZER)
+
+
+@lru_cache(maxsize=1024)
+def _count_encoded(text):
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(text):
+    if not text:
+        return 0
+    if _encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return _count_encoded(text)
+
+
+def count_message_tokens(messages):
+    return sum(count_tokens(message.get("content")) + MESSAGE_OVERHEAD for message in messages)
+
+
+TRUNCATION_MARKER = "\n[...]\n"
+
+
+def truncate_tokens(text, limit, marker=TRUNCATION_MARKER):
+    """Cuts `text` to about `limit` tokens, keeping its start and end and dropping the middle.
+
+    Prompts put their instructions first and last, so those survive.
+    """
+    if count_tokens(text) <= limit:
+        return text
+    keep = max(0, limit - count_tokens(marker))
+    if _encoding is None:
+        chars = keep * CHARS_PER_TOKEN
+        return text[: chars // 2] + marker + text[len(text) - chars // 2:] if chars else marker.strip()
+    ids = _encoding.encode(text, disallowed_special=())
+    head, tail = ids[: keep // 2], ids[len(ids) - (keep - keep // 2):] if keep else []
+    return _encoding.decode(head) + marker + _encoding.decode(tail)
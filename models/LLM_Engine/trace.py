@@ -0,0 +1,44 @@
+"""
+Per-request record of which model (or the cache) served each generation.
+
+`main.py` starts a trace for every HTTP request and reports it in the `X-LLM-Served` header;
+SSE streams send it with their closing "done" event. Generation code just calls `record(...)`.
+"""
+
+import contextvars
+
+_served = contextvars.ContextVar("llm_served", default=None)
+
+
+def start_trace():
+    trace = []
+    _served.set(trace)
+    return trace
+
+
+def record(entry):
+    """Adds a served-by entry to the current request's trace, if there is one.
+
+    `entry` is a dict, or any object with a `to_dict()` read when the trace is reported
+    (streams only know their winning provider once they have started).
+    """
+    trace = _served.get()
+    if trace is not None:
+        trace.append(entry)
+
+
+def served(trace=None):
+    trace = _served.get() if trace is None else trace
+    return [entry if isinstance(entry, dict) else entry.to_dict() for entry in trace or ()]
+
+
+def describe(trace=None):
+    """A compact header value, e.g. `poi=groq/llama-3.1-8b-instant (fast), speech=cache`."""
+    parts = []
+    for entry in served(trace):
+        if entry.get("source"):
+            parts.append(f"{entry['call']}={entry['source']}")
+        else:
+            hedged = ", hedged" if entry.get("hedged") else ""
+            parts.append(f"{entry['call']}={entry['provider']}/{entry['model']} ({entry['tier']}{hedged})")
+    return ", ".join(parts)
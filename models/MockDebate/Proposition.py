@@ -4,51 +4,28 @@ import re
 from rich.console import Console
 from webscout import Llama3Mitril, exceptions
 # from webscout import LLAMA
-from webscout import Sambanova
 from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QLineEdit, QPushButton, QListWidget, QListWidgetItem, QVBoxLayout, QWidget, QHBoxLayout, QTextEdit, QScrollArea
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor, QFont, QTextCursor
 # import fitz  # PyMuPDFimport os
 from rich.console import Console
-from webscout import Sambanova, GoogleSearch
 from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QLineEdit, QPushButton, QListWidget, QListWidgetItem, QVBoxLayout, QWidget, QHBoxLayout, QTextEdit, QScrollArea
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor, QFont, QTextCursor
 
+from models.LLM_Engine.cache import cached_generation, prompt_version
+from models.LLM_Engine.length import LengthTarget, atimed_chat, timed_chat
+from models.LLM_Engine.routing import for_call
+from models.Research_Engine.research import afetch_latest_info, fetch_latest_info
+
 console = Console()
 
 BASE_SAVE_DIR = os.getcwd()
 
-def fetch_latest_info(motion):
-    """
-    Fetch recent, real-world facts on the motion using GoogleSearch from webscout.
-    """
-    console.print(f"[bold cyan]Fetching latest facts for:[/bold cyan] {motion}")
-
-    try:
-        google = GoogleSearch(timeout=10, proxies=None, verify=True)
-        text_results = google.text(
-            keywords=motion + " site:un.org OR site:amnesty.org OR site:bbc.com OR site:guardian.com OR site:humanrightswatch.org",
-            region="us",
-            safesearch="moderate",
-            max_results=5
-        )
-
-        if not text_results:
-            return "No recent information available."
-
-        facts = ""
-        for result in text_results[:3]:
-            facts += f"\nTitle: {result.title}\nSummary: {result.description[:300]}\nSource: {result.url}\n---\n"
-        return facts.strip()
-    except Exception as e:
-        console.print(f"[bold red]Error during web search:[/bold red] {e}")
-        return "Could not fetch the latest facts due to an error."
 
-def Speech_Gen(Motion):
+def build_prompt(Motion, latest_context):
     # time =  int(input("enter the time of the motion : "))
     side = "Proposition"
-    latest_context = fetch_latest_info(Motion)
 
     system_prompt = f"""
     You are a professional debate speechwriter. Write a 3 minute opening speech on the motion: "{Motion}" and the speaker is on the side: "{side}".
@@ -73,8 +50,6 @@ and finnaly generate the speech in the format of the sample speech which i have
 and here by format i mean that i want the  speech in the same way the person has written the sample speech, the same kind of human language 
 
 
-
-
 2) Addressing Human trafficking in migrant worker populations
 
 Sir around 70% of all trafficking victims are women and girls.
@@ -95,22 +70,45 @@ To truly assess the damage done every year, member states must carry out thoroug
 Even the Joy Ezeilo emphasis in the Special Rapporteur report stated that trafficked persons have a right to an effective remedy for recovery from the ordeal of trafficking and it is an essential component.
 
 
-
 Now i want the same format as the sample speech like sir or other words in human laguage 
     """
 
-    LLAMA3_client_model_1 = Sambanova(
-        is_conversation=True,
-        timeout=1000000,
-        max_tokens=8028,
-        intro=system_prompt,
-        system_prompt=system_prompt,
-        model='Meta-Llama-3.1-8B-Instruct',
-        api_key="8bb1f2ae-f908-42cb-878e-cafacb8fb893"
+    return system_prompt
+
+
+LENGTH = LengthTarget(3)
+
+PROMPT_VERSION = prompt_version(build_prompt, LENGTH)
+
+
+@cached_generation("speech", version=PROMPT_VERSION)
+def Speech_Gen(Motion):
+    system_prompt = build_prompt(Motion, fetch_latest_info(Motion))
+
+    completion = timed_chat(
+        for_call("mock_speech"),
+        [{"role": "system", "content": system_prompt}, {"role": "user", "content": Motion}],
+        LENGTH,
     )
 
-    speech = LLAMA3_client_model_1.chat(Motion)
+    speech = completion.text
     print(speech)
+    return speech
+
+
+@cached_generation("speech", version=PROMPT_VERSION)
+async def Speech_Gen_async(Motion):
+    latest_context = await afetch_latest_info(Motion)
+    system_prompt = build_prompt(Motion, latest_context)
+
+    completion = await atimed_chat(
+        for_call("mock_speech"),
+        [{"role": "system", "content": system_prompt}, {"role": "user", "content": Motion}],
+        LENGTH,
+    )
+
+    return completion.text
+
 
 if __name__ == "__main__":
     Motion = input("enter the motion : ")
@@ -1,20 +1,16 @@
 from fastapi import APIRouter
-from models.MockDebate.Opposition import Speech_Gen
+from models.MockDebate import Opposition, Proposition
 
 router = APIRouter(prefix="/mock_debate", tags=["Mock Debate"])
 
 @router.post("/opposition_speech")
-def generate_opposition_speech(data: dict):  # For production, use a Pydantic model
+async def generate_opposition_speech(data: dict):  # For production, use a Pydantic model
     motion = data.get("motion")
-    result = Speech_Gen(motion)
+    result = await Opposition.Speech_Gen_async(motion, bypass_cache=data.get("no_cache", False))
     return {"result": result}
-from fastapi import APIRouter
-from models.MockDebate.Proposition import Speech_Gen
-
-router = APIRouter(prefix="/mock_debate", tags=["Mock Debate"])
 
 @router.post("/proposition_speech")
-def generate_proposition_speech(data: dict):  # For production, use a Pydantic model
+async def generate_proposition_speech(data: dict):  # For production, use a Pydantic model
     motion = data.get("motion")
-    result = Speech_Gen(motion)
+    result = await Proposition.Speech_Gen_async(motion, bypass_cache=data.get("no_cache", False))
     return {"result": result}
\ No newline at end of file
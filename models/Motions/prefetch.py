@@ -0,0 +1,119 @@
+"""
+Work started as soon as the user has picked a motion, before they pick a role.
+
+The app asks for the format, then the motion, then the role (see Speech_Engine/1.txt), but
+research used to start only when the first speech was asked for, so the user waited for it
+after choosing their role. `start(motion, ...)` runs that work in the background instead:
+
+    1. research: the evidence index and the web search of every trusted site, given the
+       whole search timeout rather than RESEARCH_DEADLINE since nobody is waiting on it,
+       so every site's results are in the cache when the speeches need them;
+    2. optionally the format's opening speech (PM or Proposition), into the speech cache.
+
+Everything runs at "batch" priority, so a prefetch never holds up a live round. The speeches
+and research asked for later hit the caches; the prefetch is only a head start, and nothing
+waits on it. A request that arrives while the prefetch is still writing its speech joins
+that generation and promotes it to the request's own priority (see singleflight), so it
+does not wait behind other batch work. Prefetches are shared per canonical motion and
+format, and search and write with the motion as the user typed it.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from models.Asain_Par import PrimeMinister
+from models.LLM_Engine import trace
+from models.LLM_Engine.admission import priority
+from models.LLM_Engine.motions import Motion, canonical_motion
+from models.MockDebate import Proposition
+from models.Research_Engine.research import RESEARCH_TTL, SEARCH_TIMEOUT, afetch_latest_info
+
+# The speech each format opens with: the one worth writing before the user's role is known.
+FIRST_SPEECH = {
+    "asian_par": PrimeMinister.Speech_Gen_async,
+    "mock_debate": Proposition.Speech_Gen_async,
+}
+
+
+@dataclass
+class Prefetch:
+    motion: Motion
+    text: str
+    format: str = ""
+    speech: bool = False
+    started_at: float = field(default_factory=time.time)
+    finished_at: float = 0.0
+    done: list = field(default_factory=list)
+    error: str = ""
+    served: list = field(default_factory=list)
+    task: asyncio.Task = None
+
+    @property
+    def status(self):
+        if self.task is not None and not self.task.done():
+            return "running"
+        return "failed" if self.error else "done"
+
+    def to_dict(self):
+        return {
+            "motion_id": self.motion.id,
+            "motion": self.text,
+            "format": self.format,
+            "speech": self.speech,
+            "status": self.status,
+            "done": list(self.done),
+            "error": self.error,
+            "seconds": round((self.finished_at or time.time()) - self.started_at, 2),
+            "served": trace.describe(self.served),
+        }
+
+
+_prefetches = {}
+
+
+async def _run(prefetch):
+    # Its own trace: the prefetch's calls are reported by `to_dict`, not on the request that started it.
+    prefetch.served = trace.start_trace()
+    try:
+        with priority("batch"):
+            await afetch_latest_info(prefetch.text, deadline=SEARCH_TIMEOUT)
+            prefetch.done.append("research")
+            if prefetch.speech:
+                await FIRST_SPEECH[prefetch.format](prefetch.text)
+                prefetch.done.append("speech")
+    except Exception as e:
+        print(f"Error : {e}")
+        prefetch.error = str(e)
+    prefetch.finished_at = time.time()
+
+
+def _forget_old():
+    expired = time.time() - RESEARCH_TTL
+    for key, prefetch in list(_prefetches.items()):
+        if prefetch.status != "running" and prefetch.finished_at < expired:
+            del _prefetches[key]
+
+
+def start(motion, format="", speech=False):
+    """Starts the prefetch for `motion`, or returns the one already running or done.
+
+    The opening speech is only written when `speech` is set and `format` is one of
+    FIRST_SPEECH. Must be called from the event loop.
+    """
+    _forget_old()
+    text, motion = motion, canonical_motion(motion)
+    speech = bool(speech) and format in FIRST_SPEECH
+    key = (motion.id, format if speech else "")
+    prefetch = _prefetches.get(key)
+    if prefetch is not None and prefetch.status != "failed":
+        return prefetch
+    prefetch = _prefetches[key] = Prefetch(motion, text, format if speech else "", speech)
+    prefetch.task = asyncio.create_task(_run(prefetch))
+    return prefetch
+
+
+def prefetches(motion):
+    """Every prefetch of `motion` (however it is typed)."""
+    motion_id = canonical_motion(motion).id
+    return [prefetch for (key, _), prefetch in _prefetches.items() if key == motion_id]
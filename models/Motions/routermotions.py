@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from models.Motions import prefetch
+
+router = APIRouter(prefix="/motions", tags=["Motions"])
+
+@router.post("/select")
+async def select_motion(data: dict):  # For production, use a Pydantic model
+    # Called when the user picks a motion, before they pick a role: research (and, with
+    # "speech": true, the opening speech of "format") starts in the background.
+    motion = data.get("motion")
+    if not motion:
+        return {"status": "failed", "error": "No motion given"}
+    started = prefetch.start(motion, data.get("format", ""), data.get("speech", False))
+    return started.to_dict()
+
+@router.get("/status")
+async def motion_status(motion: str):
+    return {"prefetches": [started.to_dict() for started in prefetch.prefetches(motion)]}
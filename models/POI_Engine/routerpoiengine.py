@@ -1,12 +1,14 @@
-from fastapi import APIRouter
-from models.POI_Engine.poi import Chatbot
-
-router = APIRouter(prefix="/poi", tags=["POI Engine"])
-
-@router.post("/generate")
-def generate_poi(data: dict):  # For production, use a Pydantic model
-    motion = data.get("motion")
-    side = data.get("side")
-    # You may need to update Chatbot to accept both motion and side
-    result = Chatbot(motion, side)
+from fastapi import APIRouter
+from models.LLM_Engine.admission import priority
+from models.POI_Engine.poi import Chatbot_async
+
+router = APIRouter(prefix="/poi", tags=["POI Engine"])
+
+@router.post("/generate")
+async def generate_poi(data: dict):  # For production, use a Pydantic model
+    motion = data.get("motion")
+    side = data.get("side", "Proposition")
+    # POIs are asked mid-speech, so they go ahead of anything else waiting for the provider.
+    with priority("live"):
+        result = await Chatbot_async(motion, side, data.get("session_id"), bypass_cache=data.get("no_cache", False))
     return {"result": result}
\ No newline at end of file
@@ -0,0 +1,315 @@
+"""
+Offline evidence index: BM25 over a local corpus of UN / NGO / news documents.
+
+Documents saved from the trusted sources go in RESEARCH_CORPUS (models/Data/corpus by
+default), one per file:
+
+    *.txt / *.md   optional "Title: ...", "Source: <url>" and "Date: ..." header lines,
+                   a blank line, then the text
+    *.jsonl        one {"title": ..., "url": ..., "text": ..., "date": ...} per line
+
+`build_index()` splits them into passages of about PASSAGE_WORDS words and writes an
+inverted index to RESEARCH_INDEX (models/Data/index):
+
+    vocab.json      term -> [first posting, document frequency]
+    doc_ids.npy     passage id of every posting, grouped by term
+    tfs.npy         term frequency of every posting
+    lengths.npy     length of every passage in terms
+    offsets.npy     byte offset of every passage in passages.jsonl, and of its end
+    passages.jsonl  the passages themselves
+    meta.json       passage count and average length; written last
+
+The posting arrays are memory-mapped, so a query touches only its own terms' postings and
+reads only the passages it returns. A rebuild replaces each file atomically, so a running
+server keeps reading the old index until it sees the new meta.json. Build or rebuild it with:
+
+    python -m models.Research_Engine.index build [--corpus DIR] [--index DIR]
+    python -m models.Research_Engine.index search "This House would ban cigarettes"
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data")
+CORPUS_DIR = env_vars.get("RESEARCH_CORPUS") or os.path.join(DATA_DIR, "corpus")
+INDEX_DIR = env_vars.get("RESEARCH_INDEX") or os.path.join(DATA_DIR, "index")
+
+PASSAGE_WORDS = 120
+# BM25 parameters (Robertson / Lucene defaults).
+K1 = 1.2
+B = 0.75
+# A passage is evidence for a query if it matches at least this share of the query's terms.
+MIN_MATCH = float(env_vars.get("RESEARCH_MIN_MATCH") or 0.5)
+
+STOPWORDS = frozenset(
+    "a an and are as at be been being but by can could did do does for from had has have he her his how i if in "
+    "into is it its more most no not of on or our out over she should so such than that the their them then there "
+    "these they this those to too under up was we were what when where which while who whom why will with would you "
+    "your house believes believe regrets regret supports support opposes oppose prefers prefer motion thw thbt thr ths "
+    "thp tho".split()
+)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _stem(word):
+    """Light suffix stripping, enough to match plurals and simple verb forms."""
+    if word.endswith("ss"):
+        return word
+    for suffix, replacement in (("ies", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: len(word) - len(suffix)] + replacement
+    return word
+
+
+def tokenize(text):
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+@dataclass
+class Passage:
+    """One indexed passage. `description` and `url` mirror a web search result."""
+
+    title: str
+    description: str
+    url: str
+    date: str = ""
+    score: float = 0.0
+
+
+def _read_text_file(path):
+    with open(path, encoding="utf-8", errors="ignore") as file:
+        lines = file.read().splitlines()
+    header = {}
+    while lines and re.match(r"^(title|source|url|date)\s*:", lines[0], re.IGNORECASE):
+        name, value = lines.pop(0).split(":", 1)
+        header[name.strip().lower()] = value.strip()
+    yield {
+        "title": header.get("title") or os.path.splitext(os.path.basename(path))[0],
+        "url": header.get("source") or header.get("url") or "",
+        "date": header.get("date", ""),
+        "text": "\n".join(lines),
+    }
+
+
+def _read_jsonl_file(path):
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_corpus(corpus_dir=CORPUS_DIR):
+    """Every document in `corpus_dir`, as dicts with title, url, date and text."""
+    for root, _, names in os.walk(corpus_dir):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            if name.endswith((".txt", ".md")):
+                yield from _read_text_file(path)
+            elif name.endswith(".jsonl"):
+                yield from _read_jsonl_file(path)
+
+
+def split_passages(text, words=PASSAGE_WORDS):
+    """Paragraphs joined up to about `words` words; longer paragraphs are cut."""
+    passage = []
+    for paragraph in re.split(r"\n\s*\n|\n", text):
+        tokens = paragraph.split()
+        while len(tokens) > words:
+            if passage:
+                yield " ".join(passage)
+                passage = []
+            yield " ".join(tokens[:words])
+            tokens = tokens[words:]
+        if passage and len(passage) + len(tokens) > words:
+            yield " ".join(passage)
+            passage = []
+        passage += tokens
+    if passage:
+        yield " ".join(passage)
+
+
+def _replace(index_dir, name, write):
+    """Writes `name` under a temporary name, then swaps it in."""
+    path = os.path.join(index_dir, name)
+    with open(path + ".tmp", "wb") as file:
+        write(file)
+    os.replace(path + ".tmp", path)
+
+
+def build_index(corpus_dir=CORPUS_DIR, index_dir=INDEX_DIR):
+    """Ingests `corpus_dir` into a fresh index in `index_dir`; returns its meta."""
+    os.makedirs(index_dir, exist_ok=True)
+
+    postings = defaultdict(list)
+    lengths, offsets = [], []
+    passages_path = os.path.join(index_dir, "passages.jsonl")
+    with open(passages_path + ".tmp", "wb") as out:
+        for document in read_corpus(corpus_dir):
+            for text in split_passages(document.get("text", "")):
+                terms = tokenize(document.get("title", "") + " " + text)
+                if not terms:
+                    continue
+                passage_id = len(lengths)
+                for term, tf in Counter(terms).items():
+                    postings[term].append((passage_id, tf))
+                lengths.append(len(terms))
+                offsets.append(out.tell())
+                record = {"title": document.get("title", ""), "url": document.get("url", ""), "date": document.get("date", ""), "text": text}
+                out.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        offsets.append(out.tell())
+
+    total = sum(len(entries) for entries in postings.values())
+    doc_ids = np.empty(total, dtype=np.int32)
+    tfs = np.empty(total, dtype=np.uint16)
+    vocab = {}
+    start = 0
+    for term in sorted(postings):
+        entries = postings[term]
+        vocab[term] = [start, len(entries)]
+        doc_ids[start:start + len(entries)] = [passage_id for passage_id, _ in entries]
+        tfs[start:start + len(entries)] = [min(tf, 65535) for _, tf in entries]
+        start += len(entries)
+
+    os.replace(passages_path + ".tmp", passages_path)
+    _replace(index_dir, "doc_ids.npy", lambda file: np.save(file, doc_ids))
+    _replace(index_dir, "tfs.npy", lambda file: np.save(file, tfs))
+    _replace(index_dir, "lengths.npy", lambda file: np.save(file, np.array(lengths, dtype=np.int32)))
+    _replace(index_dir, "offsets.npy", lambda file: np.save(file, np.array(offsets, dtype=np.int64)))
+    _replace(index_dir, "vocab.json", lambda file: file.write(json.dumps(vocab).encode("utf-8")))
+    meta = {
+        "passages": len(lengths),
+        "terms": len(vocab),
+        "postings": total,
+        "avg_length": float(np.mean(lengths)) if lengths else 0.0,
+        "built_at": time.time(),
+    }
+    _replace(index_dir, "meta.json", lambda file: file.write(json.dumps(meta).encode("utf-8")))
+    return meta
+
+
+class EvidenceIndex:
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as file:
+            self.meta = json.load(file)
+        with open(os.path.join(index_dir, "vocab.json"), encoding="utf-8") as file:
+            self.vocab = json.load(file)
+        self.doc_ids = np.load(os.path.join(index_dir, "doc_ids.npy"), mmap_mode="r")
+        self.tfs = np.load(os.path.join(index_dir, "tfs.npy"), mmap_mode="r")
+        self.lengths = np.load(os.path.join(index_dir, "lengths.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(index_dir, "offsets.npy"), mmap_mode="r")
+        self.count = self.meta["passages"]
+        if len(self.doc_ids) != self.meta["postings"] or len(self.offsets) != self.count + 1:
+            raise ValueError("the evidence index is being rebuilt")
+        # Kept open: after a rebuild this still reads the passages the offsets point into. It
+        # is closed by close(), or once nothing uses the index any more, so a search still
+        # running on an index that was just reloaded can finish.
+        # Read with seek and read (os.pread is not on Windows), one search at a time.
+        self._passages = open(os.path.join(index_dir, "passages.jsonl"), "rb")
+        self._passages_lock = threading.Lock()
+        self._close = weakref.finalize(self, self._passages.close)
+        # Per-passage length normalisation of BM25, computed once.
+        self._norm = K1 * (1 - B + B * np.asarray(self.lengths, dtype=np.float32) / max(self.meta["avg_length"], 1.0))
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def search(self, query, k=3, min_match=MIN_MATCH):
+        """The `k` best passages for `query` that match at least `min_match` of its terms."""
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self.vocab]
+        wanted = len(set(tokenize(query)))
+        if not terms or not self.count:
+            return []
+        scores = np.zeros(self.count, dtype=np.float32)
+        matched = np.zeros(self.count, dtype=np.int16)
+        for term in terms:
+            start, df = self.vocab[term]
+            ids = self.doc_ids[start:start + df]
+            tf = self.tfs[start:start + df].astype(np.float32)
+            idf = np.log(1 + (self.count - df + 0.5) / (df + 0.5))
+            scores[ids] += idf * tf * (K1 + 1) / (tf + self._norm[ids])
+            matched[ids] += 1
+        scores[matched < min_match * wanted] = 0
+        candidates = np.flatnonzero(scores)
+        if not len(candidates):
+            return []
+        top = candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
+        return [self._passage(int(i), float(scores[i])) for i in top]
+
+    def _passage(self, passage_id, score):
+        start, end = int(self.offsets[passage_id]), int(self.offsets[passage_id + 1])
+        with self._passages_lock:
+            self._passages.seek(start)
+            record = json.loads(self._passages.read(end - start))
+        return Passage(record["title"], record["text"], record["url"], record.get("date", ""), score)
+
+
+_index = None
+_index_built_at = None
+
+
+def evidence_index():
+    """The index in INDEX_DIR, reloaded when it is rebuilt; None if there is none."""
+    global _index, _index_built_at
+    try:
+        built_at = os.path.getmtime(os.path.join(INDEX_DIR, "meta.json"))
+    except OSError:
+        _index = _index_built_at = None
+        return None
+    if _index is None or built_at != _index_built_at:
+        try:
+            _index, _index_built_at = EvidenceIndex(INDEX_DIR), built_at
+        except Exception as e:
+            print(f"Error : {e}, searching the web only")
+            _index = _index_built_at = None
+    return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the offline evidence index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="ingest the corpus into a fresh index")
+    build.add_argument("--corpus", default=CORPUS_DIR)
+    build.add_argument("--index", default=INDEX_DIR)
+    search = commands.add_parser("search", help="print the best passages for a query")
+    search.add_argument("query")
+    search.add_argument("-k", type=int, default=3)
+    search.add_argument("--index", default=INDEX_DIR)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        started = time.perf_counter()
+        meta = build_index(args.corpus, args.index)
+        print(f"Indexed {meta['passages']} passages, {meta['terms']} terms in {time.perf_counter() - started:.1f}s")
+    else:
+        with EvidenceIndex(args.index) as index:
+            started = time.perf_counter()
+            passages = index.search(args.query, args.k)
+        print(f"{len(passages)} passages in {(time.perf_counter() - started) * 1000:.1f} ms")
+        for passage in passages:
+            print(f"\n[{passage.score:.2f}] {passage.title} ({passage.url})\n{passage.description}")
+
+
+if __name__ == "__main__":
+    main()
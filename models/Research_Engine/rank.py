@@ -0,0 +1,118 @@
+"""
+Which research snippets go into a prompt, and how much of each.
+
+Candidates from the evidence index or the web are
+    1. scored against the motion with BM25, the candidates themselves serving as the corpus,
+       and dropped if they share no term with it (unless none do);
+    2. dropped when they are near-duplicates of a better one (the same wire story on three
+       sites): MinHash signatures of word shingles estimate the Jaccard similarity;
+    3. packed, best first, into RESEARCH_TOKENS tokens, each summary cut to SNIPPET_TOKENS
+       so one long passage cannot crowd out the rest; the last one that does not fit whole
+       is cut at a word boundary if enough room is left to be worth it.
+"""
+
+import re
+import zlib
+
+import numpy as np
+from dotenv import dotenv_values
+
+from models.LLM_Engine.tokens import count_tokens
+from models.Research_Engine.index import B, K1, tokenize
+
+env_vars = dotenv_values(".env")
+
+TOKEN_BUDGET = int(env_vars.get("RESEARCH_TOKENS") or 350)
+SNIPPET_TOKENS = 120
+# A snippet cut to fewer tokens than this is not worth its title and source lines.
+MIN_SNIPPET_TOKENS = 40
+SHINGLE = 3
+PERMUTATIONS = 64
+# Estimated Jaccard similarity above which two snippets count as the same story.
+DUPLICATE = float(env_vars.get("RESEARCH_DUPLICATE") or 0.6)
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, _PRIME, size=PERMUTATIONS).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=PERMUTATIONS).astype(np.uint64)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def relevance(motion, texts):
+    """BM25 score of every text against the motion."""
+    query = set(tokenize(motion))
+    documents = [tokenize(text) for text in texts]
+    if not documents or not query:
+        return np.zeros(len(documents))
+    lengths = np.array([len(terms) for terms in documents], dtype=np.float64)
+    norm = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+    scores = np.zeros(len(documents))
+    for term in query:
+        tf = np.array([terms.count(term) for terms in documents], dtype=np.float64)
+        df = np.count_nonzero(tf)
+        if df:
+            idf = np.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+            scores += idf * tf * (K1 + 1) / (tf + norm)
+    return scores
+
+
+def signature(text):
+    """MinHash signature of the text's word shingles."""
+    words = _WORD.findall(text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE]) for i in range(max(1, len(words) - SHINGLE + 1))}
+    hashes = np.array([zlib.crc32(shingle.encode("utf-8")) for shingle in shingles], dtype=np.uint64) % _PRIME
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def rank_snippets(motion, snippets):
+    """Snippets (with title, description, url) best first, near-duplicates removed."""
+    if not snippets:
+        return []
+    scores = relevance(motion, [f"{s.title} {s.description}" for s in snippets])
+    kept, signatures = [], []
+    relevant = scores > 0 if scores.any() else np.ones(len(snippets), dtype=bool)
+    for i in np.argsort(-scores, kind="stable"):
+        if not relevant[i]:
+            continue
+        sig = signature(f"{snippets[i].title} {snippets[i].description}")
+        if signatures and (np.stack(signatures) == sig).mean(axis=1).max() >= DUPLICATE:
+            continue
+        kept.append(snippets[i])
+        signatures.append(sig)
+    return kept
+
+
+def _fact(snippet, description):
+    return f"Title: {snippet.title}\nSummary: {description}\nSource: {snippet.url}\n---"
+
+
+def _cut(text, tokens):
+    """`text` cut at a word boundary to at most about `tokens` tokens."""
+    words = text.split()
+    if count_tokens(" ".join(words)) <= tokens:
+        return " ".join(words)
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(" ".join(words[:mid])) <= tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return " ".join(words[:low]) + ("..." if low < len(words) else "")
+
+
+def pack_facts(motion, snippets, budget=TOKEN_BUDGET):
+    """The best distinct snippets as facts, within `budget` tokens."""
+    facts, used = [], 0
+    for snippet in rank_snippets(motion, snippets):
+        fact = _fact(snippet, _cut(snippet.description, SNIPPET_TOKENS))
+        tokens = count_tokens(fact)
+        if used + tokens > budget:
+            room = budget - used - count_tokens(_fact(snippet, ""))
+            if room < MIN_SNIPPET_TOKENS:
+                break
+            fact = _fact(snippet, _cut(snippet.description, room))
+            tokens = count_tokens(fact)
+        facts.append(fact)
+        used += tokens
+    return "\n".join(facts)
@@ -0,0 +1,180 @@
+"""
+Research shared by every generator: recent facts on a motion from trusted sources.
+
+Each speaker, reply and timed speech used to run its own GoogleSearch for the same motion,
+so an AP round searched six times and a mock debate four. Results are now cached in the
+generation cache, keyed on the canonical motion id (see `LLM_Engine.motions`), for
+RESEARCH_TTL seconds, and concurrent lookups of the same motion share one search: a round
+pays for one search at most. Failed searches are not cached. Searches use the motion as
+the user typed it.
+
+The offline evidence index (see `index`) is tried first: when it has passages for the
+motion they are used straight away, with no network and no cache entry, and the web is
+searched only on a miss. Either way the snippets are ranked against the motion, cleared of
+near-duplicates and packed into a token budget (see `rank`).
+
+The web search fans out (RESEARCH_FANOUT=1, the default): each trusted site is searched on
+its own, concurrently, and whatever has arrived when RESEARCH_DEADLINE seconds (1.5) have
+passed is merged, best hit of every site first. Searches still running then are not
+abandoned: their results go into the cache for the next caller, so research never holds a
+live round up for longer than the deadline. Each site's results are cached on their own.
+RESEARCH_FANOUT=0 goes back to one combined `site:a OR site:b` query with no deadline.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from dotenv import dotenv_values
+from webscout import GoogleSearch
+
+from models.LLM_Engine import trace
+from models.LLM_Engine.cache import acached_call, cache_key, cached_call, generation_cache, normalize_text
+from models.LLM_Engine.motions import motion_id
+from models.Research_Engine.index import Passage, evidence_index
+from models.Research_Engine.rank import pack_facts
+
+env_vars = dotenv_values(".env")
+
+RESEARCH_TTL = float(env_vars.get("RESEARCH_TTL") or 6 * 60 * 60)
+SEARCH_TIMEOUT = float(env_vars.get("RESEARCH_TIMEOUT") or 10)
+FANOUT = (env_vars.get("RESEARCH_FANOUT") or "1") != "0"
+DEADLINE = float(env_vars.get("RESEARCH_DEADLINE") or 1.5)
+TRUSTED_SITES = ("un.org", "amnesty.org", "bbc.com", "guardian.com", "humanrightswatch.org")
+MAX_RESULTS = 5
+# Index passages ranked for one motion; the best distinct ones that fit RESEARCH_TOKENS are used.
+CANDIDATES = 10
+
+NO_RESULTS = "No recent information available."
+SEARCH_FAILED = "Could not fetch the latest facts due to an error."
+
+
+def search_query(motion):
+    return normalize_text(motion) + " " + " OR ".join(f"site:{site}" for site in TRUSTED_SITES)
+
+
+def _key(motion):
+    return cache_key("research", motion=motion_id(motion), sites=TRUSTED_SITES)
+
+
+def local_facts(motion):
+    """Facts from the offline evidence index, or None on a miss (or a broken index)."""
+    index = evidence_index()
+    try:
+        passages = index.search(motion, CANDIDATES) if index is not None else []
+    except Exception as e:
+        print(f"Error : {e}, searching the web only")
+        return None
+    if not passages:
+        return None
+    trace.record({"call": "research", "source": "index"})
+    return pack_facts(motion, passages)
+
+
+def search(motion):
+    """One live search; None if it failed."""
+    print(f"Fetching latest facts for : {motion}")
+    try:
+        google = GoogleSearch(timeout=SEARCH_TIMEOUT, proxies=None, verify=True)
+        text_results = google.text(keywords=search_query(motion), region="us", safesearch="moderate", max_results=MAX_RESULTS)
+    except Exception as e:
+        print(f"Error during web search : {e}")
+        return None
+    if not text_results:
+        return NO_RESULTS
+    return pack_facts(motion, text_results)
+
+
+_pool = ThreadPoolExecutor(max_workers=4 * len(TRUSTED_SITES), thread_name_prefix="research")
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def _site_key(motion, site):
+    return cache_key("research", motion=motion_id(motion), site=site)
+
+
+def _search_site(motion, site):
+    google = GoogleSearch(timeout=SEARCH_TIMEOUT, proxies=None, verify=True)
+    results = google.text(keywords=f"{normalize_text(motion)} site:{site}", region="us", safesearch="moderate", max_results=MAX_RESULTS)
+    return [{"title": r.title, "description": r.description, "url": r.url} for r in results or []]
+
+
+def _settle(key, future):
+    with _pending_lock:
+        _pending.pop(key, None)
+    if future.exception() is not None:
+        print(f"Error during web search : {future.exception()}")
+        return
+    generation_cache.set(key, future.result(), RESEARCH_TTL)
+
+
+def _site_search(motion, site, bypass_cache=False):
+    """A future of one site's results: cached, already being searched, or a new search."""
+    key = _site_key(motion, site)
+    cached = None if bypass_cache else generation_cache.get(key)
+    if cached is not None:
+        future = Future()
+        future.set_result(cached)
+        return future
+    with _pending_lock:
+        future = _pending.get(key)
+        started = future is None
+        if started:
+            future = _pending[key] = _pool.submit(_search_site, motion, site)
+    if started:
+        future.add_done_callback(lambda done: _settle(key, done))
+    return future
+
+
+def merge_results(results_by_site):
+    """Interleaves the sites' results by rank (best of every site first), without repeats."""
+    merged, seen = [], set()
+    for rank in range(max((len(results) for results in results_by_site), default=0)):
+        for results in results_by_site:
+            if rank < len(results) and results[rank]["url"] not in seen:
+                seen.add(results[rank]["url"])
+                merged.append(Passage(**results[rank]))
+    return merged
+
+
+def fan_out(motion, bypass_cache=False, deadline=None):
+    """Searches every trusted site at once and returns what arrived within `deadline` seconds."""
+    futures = [_site_search(motion, site, bypass_cache) for site in TRUSTED_SITES]
+    if not all(future.done() for future in futures):
+        print(f"Fetching latest facts for : {motion}")
+    wait(futures, timeout=DEADLINE if deadline is None else deadline)
+    arrived = [future.result() for future in futures if future.done() and future.exception() is None]
+    failed = sum(1 for future in futures if future.done() and future.exception() is not None)
+    trace.record({"call": "research", "source": f"web {len(arrived)}/{len(futures)}"})
+    merged = merge_results(arrived)
+    if merged:
+        return pack_facts(motion, merged)
+    return SEARCH_FAILED if failed == len(futures) else NO_RESULTS
+
+
+def fetch_latest_info(motion, bypass_cache=False, deadline=None):
+    """Recent, real-world facts on the motion: from the local index, the cache or one live search.
+
+    `deadline` overrides RESEARCH_DEADLINE, e.g. for a prefetch that nobody is waiting on.
+    """
+    facts = local_facts(motion)
+    if facts:
+        return facts
+    if FANOUT:
+        return fan_out(motion, bypass_cache, deadline)
+    facts = cached_call(lambda: search(motion), _key(motion), bypass=bypass_cache, ttl=RESEARCH_TTL, label="research")
+    return facts or SEARCH_FAILED
+
+
+async def afetch_latest_info(motion, bypass_cache=False, deadline=None):
+    """Async version of `fetch_latest_info`; the index lookup and the search run in worker threads."""
+    facts = await asyncio.to_thread(local_facts, motion)
+    if facts:
+        return facts
+    if FANOUT:
+        return await asyncio.to_thread(fan_out, motion, bypass_cache, deadline)
+    facts = await acached_call(
+        lambda: asyncio.to_thread(search, motion), _key(motion), bypass=bypass_cache, ttl=RESEARCH_TTL, label="research"
+    )
+    return facts or SEARCH_FAILED
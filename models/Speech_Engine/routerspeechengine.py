@@ -1,9 +1,9 @@
 from fastapi import APIRouter
-from models.Speech_Engine.Speech import Speech_Gen
+from models.Speech_Engine.Speech import Speech_Gen_async
 
 router = APIRouter(prefix="/speech", tags=["Speech Engine"])
 
 @router.get("/generate")
-def generate_speech(motion: str, time: int, side: str):
-    result = Speech_Gen(motion, time, side)
+async def generate_speech(motion: str, time: int, side: str, no_cache: bool = False):
+    result = await Speech_Gen_async(motion, time, side, bypass_cache=no_cache)
     return {"result": result}
\ No newline at end of file
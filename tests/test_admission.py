@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+
+from models.LLM_Engine.admission import AdmissionController, TokenBucket, Urgency, current_priority, priority
+
+
+async def admitted_in_order(controller, waiters):
+    """Holds the only slot while `waiters` (name, level or Urgency) queue up, then frees it."""
+    order = []
+
+    async def wait(name, level):
+        with priority(level):
+            async with controller.aslot():
+                order.append(name)
+                await asyncio.sleep(0)
+
+    await controller.aacquire()
+    tasks = []
+    for name, level in waiters:
+        tasks.append(asyncio.create_task(wait(name, level)))
+        await asyncio.sleep(0.01)
+    return order, tasks
+
+
+def test_slots_go_to_the_most_urgent_then_the_oldest():
+    async def main():
+        controller = AdmissionController("order", 1)
+        order, tasks = await admitted_in_order(
+            controller, [("batch-1", "batch"), ("interactive", "interactive"), ("batch-2", "batch"), ("live", "live")]
+        )
+        controller.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(main()) == ["live", "interactive", "batch-1", "batch-2"]
+
+
+def test_promoted_urgency_moves_its_waiting_calls_up():
+    async def main():
+        controller = AdmissionController("promote", 1)
+        shared = Urgency("batch")
+        order, tasks = await admitted_in_order(controller, [("prefetch", shared), ("interactive", "interactive")])
+        shared.promote("live")
+        shared.promote("batch")
+        assert shared.level == "live"
+        controller.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(main()) == ["prefetch", "interactive"]
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def main():
+        controller = AdmissionController("cancel", 1)
+        order, tasks = await admitted_in_order(controller, [("cancelled", "live"), ("next", "batch")])
+        tasks[0].cancel()
+        await asyncio.sleep(0)
+        controller.release()
+        await asyncio.wait_for(tasks[1], 1)
+        return order, controller.in_flight
+
+    assert asyncio.run(main()) == (["next"], 0)
+
+
+def test_priority_is_ambient_and_restored():
+    assert current_priority() == "interactive"
+    with priority("batch"):
+        with priority("live"):
+            assert current_priority() == "live"
+        assert current_priority() == "batch"
+    assert current_priority() == "interactive"
+    with pytest.raises(ValueError):
+        priority("urgent").__enter__()
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(600)
+    assert bucket.delay(600) == 0
+    bucket.take(600)
+    assert bucket.delay(60) == pytest.approx(6, abs=0.05)
+    # A call larger than the whole bucket waits for a full one, not forever.
+    assert bucket.delay(6000) == pytest.approx(60, abs=0.05)
+    assert TokenBucket(0).delay(10 ** 9) == 0
+
+
+def test_empty_buckets_pace_the_calls():
+    controller = AdmissionController("paced", 4, requests_per_minute=600, tokens_per_minute=6000)
+    controller.requests.available = 0
+    started = time.monotonic()
+    with controller.slot():
+        assert time.monotonic() - started >= 0.09
+
+    controller.tokens.available = 0
+    started = time.monotonic()
+    with controller.slot(tokens=20):
+        assert time.monotonic() - started >= 0.19
+    assert controller.in_flight == 0
@@ -0,0 +1,120 @@
+import json
+
+import numpy as np
+import pytest
+
+from models.AI_Judge.ballot import Ballot, BallotError, judge, parse_ballot, rubric_override
+from models.AI_Judge.scoring import pack, rescore, score
+from models.LLM_Engine.clients import Completion
+from models.LLM_Engine.resilience import LLMError
+
+RATINGS = {
+    "pm": (8, 6, 8, 6),
+    "lo": (7, 9, 7, 6),
+    "dpm": (6, 6, 7, 6),
+    "dlo": (7, 6, 7, 6),
+    "gw": (9, 8, 9, 8),
+    "ow": (5, 5, 5, 5),
+}
+
+
+def answer(clashes=((3, 1, -1), (2, -1, 1)), ratings=RATINGS, winner="government"):
+    criteria = ("content", "style", "strategy", "responsiveness")
+    return json.dumps({
+        "clashes": [
+            {"title": f"Clash {i}", "weight": weight,
+             "government": {"result": gov, "reason": "r"}, "opposition": {"result": opp, "reason": "r"}}
+            for i, (weight, gov, opp) in enumerate(clashes)
+        ],
+        "speakers": {key: {**dict(zip(criteria, values)), "reason": key} for key, values in ratings.items()},
+        "verdict": {"winner": winner, "reason": "It was close."},
+    })
+
+
+def test_totals_winner_and_ranking_come_from_the_ratings():
+    ballot = parse_ballot(answer(), "par", "THW ban zoos")
+    result = ballot.result()
+    assert result["team_scores"] == {"government": 1, "opposition": -1}
+    assert result["winner"] == "government"
+    ranking = [(entry["speaker"], entry["score"]) for entry in result["ranking"]]
+    assert ranking[0] == ("gw", 86.0) and ranking[-1] == ("ow", 50.0)
+    # pm and lo both score 72.0: the heavier criteria (content, strategy) decide.
+    assert [speaker for speaker, _ in ranking[1:3]] == ["pm", "lo"]
+
+
+def test_level_totals_go_to_the_better_speakers_then_to_the_judge():
+    ballot = parse_ballot(answer(clashes=((2, 1, -1), (2, -1, 1)), winner="opposition"), "par")
+    assert ballot.result()["winner"] == "government"
+
+    level = {key: (6, 6, 6, 6) for key in RATINGS}
+    ballot = parse_ballot(answer(clashes=((2, 0, 0),), ratings=level, winner="opposition"), "par")
+    assert ballot.result()["winner"] == "opposition"
+
+
+def test_answers_are_checked_and_clamped():
+    fenced = "Here you go:\n```json\n" + answer(clashes=((9, 3, -1),)) + "\n```"
+    ballot = parse_ballot(fenced, "par")
+    assert ballot.clashes[0].weight == 5 and ballot.clashes[0].sides["government"].result == 1
+
+    missing = json.loads(answer())
+    del missing["speakers"]["dlo"]
+    for text in ("no json here", answer(clashes=()), json.dumps(missing), answer(winner="the house")):
+        with pytest.raises(BallotError):
+            parse_ballot(text, "par")
+
+
+def test_rubric_override():
+    assert rubric_override("par", {"content": 40, "style": 10}) == {
+        "content": 40, "style": 10, "strategy": 30, "responsiveness": 20
+    }
+    for rubric in ({}, {"delivery": 10}, {"content": 40}, {"content": True}, {"content": 130, "style": -80}):
+        with pytest.raises(ValueError):
+            rubric_override("par", rubric)
+
+
+def test_rescoring_under_another_rubric_is_one_batch():
+    ballots = [
+        parse_ballot(answer(), "par"),
+        parse_ballot(answer(clashes=((1, -1, 1),), winner="opposition"), "par"),
+    ]
+    style_heavy = rubric_override("par", {"content": 10, "style": 50, "strategy": 20, "responsiveness": 20})
+    batch = score(pack(ballots), style_heavy)
+    for i, ballot in enumerate(ballots):
+        alone = rescore([ballot], style_heavy)
+        assert np.array_equal(batch.speakers[i], alone.speakers[0]) and np.array_equal(batch.order[i], alone.order[0])
+    # lo has the best style: first among pm/lo under the new weights, second under the default.
+    keys = list(RATINGS)
+    assert batch.ranks[0, keys.index("lo")] < batch.ranks[0, keys.index("pm")]
+    assert [entry["speaker"] for entry in ballots[1].result()["ranking"]][:2] == ["gw", "pm"]
+    assert batch.winner.tolist() == [0, 1]
+
+
+def test_ballot_round_trips_through_a_dict():
+    ballot = parse_ballot(answer(), "par", "THW ban zoos", "summary")
+    data = ballot.to_dict()
+    assert data["winner"] == "government"
+    assert Ballot.from_dict(json.loads(json.dumps(data))) == ballot
+    assert "🏆 Verdict: Government" in ballot.render()
+
+
+class Call:
+    def __init__(self, *texts):
+        self.texts = list(texts)
+        self.requests = []
+
+    def chat(self, messages, **options):
+        self.requests.append((messages, options))
+        return Completion(self.texts.pop(0), "groq", "m", "stop")
+
+
+def test_judge_asks_once_more_with_the_error():
+    call = Call("not a ballot", answer())
+    ballot = judge(call, [{"role": "user", "content": "Judge."}], "par", "THW ban zoos")
+    assert ballot.motion == "THW ban zoos" and len(call.requests) == 2
+    repair, options = call.requests[1]
+    assert repair[-2]["content"] == "not a ballot" and "no JSON object" in repair[-1]["content"]
+    assert options["response_format"] == {"type": "json_object"}
+
+    with pytest.raises(LLMError) as error:
+        judge(Call("no", "still no"), [{"role": "user", "content": "Judge."}], "par")
+    assert error.value.kind == "rejected"
@@ -0,0 +1,91 @@
+import pytest
+
+from models.LLM_Engine.budget import SAFETY_MARGIN, fit_messages, message_with_parts, shrink_parts
+from models.LLM_Engine.conversation import Conversation
+from models.LLM_Engine.tokens import count_message_tokens, count_tokens
+
+
+def words(n, word="word"):
+    return " ".join(f"{word}{i}" for i in range(n))
+
+
+def fits(messages, max_tokens, window):
+    return count_message_tokens(messages) + max_tokens <= window - SAFETY_MARGIN
+
+
+def test_small_request_is_untouched(capsys):
+    messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "THW ban zoos"}]
+    fitted, max_tokens, budget = fit_messages(messages, 512, 8192, "m")
+    assert fitted == messages and max_tokens == 512 and not budget.trimmed
+    assert capsys.readouterr().out == ""
+
+
+def test_oldest_history_goes_first():
+    history = [{"role": "user", "content": words(300, f"turn{i}-")} for i in range(6)]
+    messages = [{"role": "system", "content": "Be brief."}, *history, {"role": "user", "content": "Now."}]
+    fitted, max_tokens, budget = fit_messages(messages, 1024, 4096, "m")
+    assert max_tokens == 1024 and "history" in budget.trimmed and "prompt" not in budget.trimmed
+    assert fitted[0]["content"] == "Be brief." and fitted[-1]["content"] == "Now."
+    assert fitted[1:-1] == history[len(history) - len(fitted) + 2:]
+    assert fits(fitted, max_tokens, 4096)
+
+
+def test_session_summary_is_dropped_with_the_history():
+    conversation = Conversation(max_tokens=200, summary_tokens=2000)
+    for i in range(10):
+        conversation.add_turn(f"Motion {i}. " + words(60), f"Speech {i}. " + words(60))
+    history = conversation.messages()
+    assert history[0]["role"] == "system" and history[0]["summary"]
+    messages = [{"role": "system", "content": "Be brief."}, *history, {"role": "user", "content": words(400)}]
+    window = count_message_tokens(messages) + SAFETY_MARGIN + 100
+    fitted, _, budget = fit_messages(messages, 100 + count_message_tokens(history[:1]), window, "m", min_output=400)
+    assert "prompt" not in budget.trimmed
+    assert not any(message["content"].startswith("Summary of earlier turns") for message in fitted)
+    assert all("summary" not in message for message in fitted)
+
+
+def test_output_shrinks_to_its_floor_before_the_prompt_is_cut():
+    messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": words(3000)}]
+    window = count_message_tokens(messages) + SAFETY_MARGIN + 300
+    fitted, max_tokens, budget = fit_messages(messages, 1024, window, "m", min_output=256)
+    assert max_tokens == 300 and budget.trimmed == {"output": 724}
+
+    fitted, max_tokens, budget = fit_messages(messages, 1024, window - 100, "m", min_output=256)
+    assert max_tokens == 256 and "prompt" in budget.trimmed
+    assert fits(fitted, max_tokens, window - 100)
+
+
+def test_prompt_is_cut_until_it_fits():
+    system = {"role": "system", "content": words(2500, "rule")}
+    request = {"role": "user", "content": words(2400, "fact")}
+    fitted, max_tokens, budget = fit_messages([system, request], 1024, 4096, "m", min_output=1024)
+    assert fits(fitted, max_tokens, 4096)
+    assert count_tokens(fitted[0]["content"]) < count_tokens(system["content"])
+    assert count_tokens(fitted[1]["content"]) < count_tokens(request["content"])
+
+
+def test_speeches_lose_the_same_share_and_none_disappears():
+    speeches = [f"START-{role} {words(1400, role)} END-{role}" for role in ("pm", "lo", "dpm", "dlo", "gw", "ow")]
+    parts = [piece for speech in speeches for piece in ("\n\nSpeech:\n", speech)]
+    messages = [{"role": "system", "content": "Judge."}, message_with_parts("user", parts)]
+    fitted, max_tokens, budget = fit_messages(messages, 1024, 8192, "m", min_output=1024)
+    assert fits(fitted, max_tokens, 8192) and "parts" not in fitted[1]
+    content = fitted[1]["content"]
+    kept = [content.count(f" {role}") for role in ("pm", "lo", "dpm", "dlo", "gw", "ow")]
+    assert max(kept) - min(kept) <= 2
+    assert all(f"START-{role}" in content and f"END-{role}" in content for role in ("pm", "lo", "dpm", "dlo", "gw", "ow"))
+
+
+def test_shrink_parts_keeps_short_parts():
+    parts = ["Label:", words(500), "Other:", words(1500)]
+    shrunk = shrink_parts(parts, 600)
+    assert shrunk[0] == "Label:" and shrunk[2] == "Other:"
+    assert sum(count_tokens(part) for part in shrunk) <= 620
+    assert count_tokens(shrunk[3]) > 2 * count_tokens(shrunk[1])
+
+
+def test_prompt_that_cannot_fit_raises():
+    parts = [words(10)] * 200
+    messages = [{"role": "system", "content": "Judge."}, message_with_parts("user", parts)]
+    with pytest.raises(ValueError):
+        fit_messages(messages, 256, 1024, "m")
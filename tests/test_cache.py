@@ -0,0 +1,188 @@
+import asyncio
+import time
+
+import pytest
+
+from models.LLM_Engine import cache
+from models.LLM_Engine.cache import GenerationCache, cache_key, cached_generation, prompt_version
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(tmp_path, monkeypatch):
+    store = GenerationCache(path=str(tmp_path / "generations.sqlite3"))
+    monkeypatch.setattr(cache, "generation_cache", store)
+    return store
+
+
+def test_cache_key_ignores_case_and_whitespace():
+    assert cache_key("speech", motion="THW  ban X ") == cache_key("speech", motion="thw ban x")
+    assert cache_key("speech", motion="thw ban x") != cache_key("speech", motion="thw ban y")
+    assert cache_key("speech", history=[{"role": "user", "content": "A"}]) != cache_key("speech", history=[])
+
+
+def test_prompt_version_changes_with_the_template_text():
+    def first():
+        return "Write a speech."
+
+    def second():
+        return "Write a short speech."
+
+    assert prompt_version(first) == prompt_version(first)
+    assert prompt_version(first) != prompt_version(second)
+    assert prompt_version("a", 1) != prompt_version("a", 2)
+
+
+def test_values_persist_expire_and_are_trimmed(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    store = GenerationCache(path=path, max_bytes=60)
+    store.set("a", "x" * 20)
+    assert GenerationCache(path=path).get("a") == "x" * 20
+
+    store.set("b", "y" * 20)
+    store.get("b")
+    store.set("c", "z" * 20)
+    fresh = GenerationCache(path=path)
+    assert fresh.get("a") is None and fresh.get("c") == "z" * 20
+
+    store.set("short", "v", ttl=0.01)
+    time.sleep(0.02)
+    assert store.get("short") is None and GenerationCache(path=path).get("short") is None
+
+
+def counting(version="v1"):
+    calls = []
+
+    @cached_generation("test", version=version, ignore=("session",))
+    def generate(Motion, role, session=None):
+        calls.append((Motion, role))
+        return f"{role} on {Motion} #{len(calls)}"
+
+    return generate, calls
+
+
+def test_motion_is_keyed_on_its_canonical_id():
+    generate, calls = counting()
+    first = generate("This House would ban cigarettes", "PM")
+    assert generate("thw ban ciggrate", "PM") == first
+    assert generate("thw ban ciggrate", "LO") != first
+    assert len(calls) == 2
+
+
+def test_ignored_arguments_and_bypass():
+    generate, calls = counting()
+    first = generate("THW ban zoos", "PM", session="a")
+    assert generate("THW ban zoos", "PM", session="b") == first
+    fresh = generate("THW ban zoos", "PM", bypass_cache=True)
+    assert fresh != first and generate("THW ban zoos", "PM") == fresh
+    assert len(calls) == 2
+
+
+def test_new_prompt_version_invalidates():
+    old, _ = counting("v1")
+    new, calls = counting("v2")
+    old("THW ban zoos", "PM")
+    new("THW ban zoos", "PM")
+    assert len(calls) == 1
+
+
+def test_sync_and_async_variants_share_entries():
+    generate, calls = counting()
+
+    @cached_generation("test", version="v1", ignore=("session",))
+    async def agenerate(Motion, role, session=None):
+        raise AssertionError("should have been cached")
+
+    value = generate("THW ban zoos", "PM")
+    assert generate.cache_key("THW ban zoos", "PM") == agenerate.cache_key("THW ban zoos", "PM")
+    assert asyncio.run(agenerate("THW ban zoos", "PM")) == value
+
+
+def test_concurrent_misses_share_one_generation():
+    calls = []
+
+    @cached_generation("test", version="v1")
+    async def generate(Motion):
+        calls.append(Motion)
+        await asyncio.sleep(0.05)
+        return "speech"
+
+    async def main():
+        return await asyncio.gather(*(generate("THW ban zoos") for _ in range(5)))
+
+    assert asyncio.run(main()) == ["speech"] * 5
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def speech_engine(monkeypatch):
+    pytest.importorskip("edge_tts")
+    pytest.importorskip("pygame")
+    pytest.importorskip("webscout")
+    from models.Asain_Par import common
+
+    calls = []
+
+    class Completion:
+        def __init__(self, messages):
+            calls.append(messages)
+            self.text = f"Speech {len(calls)}. (pauses)"
+
+    class Stream(Completion):
+        def __init__(self, client, messages, target, options):
+            super().__init__(messages)
+
+        async def __aiter__(self):
+            for word in self.text.split(" "):
+                await asyncio.sleep(0.01)
+                yield word + " "
+
+    async def afacts(motion):
+        return "facts"
+
+    async def atimed(client, messages, target, **options):
+        return Completion(messages)
+
+    monkeypatch.setattr(common, "afetch_latest_info", afacts)
+    monkeypatch.setattr(common, "fetch_latest_info", lambda motion: "facts")
+    monkeypatch.setattr(common, "atimed_chat", atimed)
+    monkeypatch.setattr(common, "timed_chat", lambda client, messages, target, **options: Completion(messages))
+    monkeypatch.setattr(common, "TimedStream", Stream)
+    monkeypatch.setattr(common, "for_call", lambda name: None)
+    monkeypatch.setattr(common, "generation_cache", cache.generation_cache)
+    return common, calls
+
+
+def turns(session_id):
+    from models.LLM_Engine.conversation import conversations
+
+    return [turn["content"] for turn in conversations.get(session_id).turns]
+
+
+def test_every_session_gets_its_turn_on_a_cache_hit(speech_engine):
+    common, calls = speech_engine
+    first = common.generate_speech("pm", "THW ban zoos", "hit-a")
+    assert common.generate_speech("pm", "THW ban zoos", "hit-b") == first
+    assert asyncio.run(common.generate_speech_async("pm", "THW ban zoos", "hit-c")) == first
+    assert len(calls) == 1
+    assert turns("hit-a") == turns("hit-b") == turns("hit-c") == ["Motion: THW ban zoos", first]
+
+    # The next speech of a session with history is its own generation.
+    common.generate_speech("pm", "THW ban zoos", "hit-a")
+    assert len(calls) == 2 and len(turns("hit-a")) == 4
+
+
+def test_every_joined_stream_gets_its_turn(speech_engine):
+    common, calls = speech_engine
+
+    async def collect(session_id):
+        return "".join([chunk async for chunk in common.stream_speech("pm", "THW ban zoos", session_id)])
+
+    async def main():
+        return await asyncio.gather(*(collect(f"stream-{i}") for i in range(3)))
+
+    texts = asyncio.run(main())
+    assert len(calls) == 1 and len(set(texts)) == 1
+    for i in range(3):
+        assert turns(f"stream-{i}") == ["Motion: THW ban zoos", texts[0].rstrip()]
+    assert asyncio.run(collect("stream-late")) == texts[0].rstrip()
+    assert turns("stream-late") == turns("stream-0")
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from models.LLM_Engine import gateway
+from models.LLM_Engine.clients import Completion
+from models.LLM_Engine.gateway import LatencyTracker, get_gateway
+from models.LLM_Engine.resilience import LLMError
+
+PRIMARY = ("groq", "llama3-70b-8192")
+FALLBACK = ("sambanova", "Meta-Llama-3.1-70B-Instruct")
+MESSAGES = [{"role": "user", "content": "THW ban zoos"}]
+
+
+class FakeStream:
+    def __init__(self, provider, model, messages, chunks=("Sir, ", "zoos."), error=None, fail_after=None, delay=0):
+        self.provider, self.model = provider, model
+        self.payload = {"messages": messages}
+        self.chunks, self.error, self.fail_after, self.delay = chunks, error, fail_after, delay
+        self.text, self.finish_reason, self.usage = "", None, {}
+        self.closed = False
+
+    def _next(self, i, chunk):
+        if self.fail_after == i:
+            raise self.error
+        self.text += chunk
+        return chunk
+
+    def __iter__(self):
+        if self.error and self.fail_after is None:
+            raise self.error
+        for i, chunk in enumerate(self.chunks):
+            yield self._next(i, chunk)
+        self.finish_reason = "stop"
+
+    def __aiter__(self):
+        return self._achunks()
+
+    async def _achunks(self):
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error and self.fail_after is None:
+                raise self.error
+            for i, chunk in enumerate(self.chunks):
+                yield self._next(i, chunk)
+            self.finish_reason = "stop"
+        finally:
+            self.closed = True
+
+
+class FakeClient:
+    def __init__(self, name, **behaviour):
+        self.name = name
+        self.behaviour = behaviour
+        self.streams = []
+
+    def chat(self, model, messages, stream=False, **options):
+        if not stream:
+            if self.behaviour.get("error"):
+                raise self.behaviour["error"]
+            return Completion('{"ok": true}', self.name, model, "stop")
+        self.streams.append(FakeStream(self.name, model, messages, **self.behaviour))
+        return self.streams[-1]
+
+    async def achat(self, model, messages, stream=False, **options):
+        return self.chat(model, messages, stream, **options)
+
+
+def unavailable(provider):
+    return LLMError("unavailable", provider, "m", "503", retryable=True)
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    clients = {}
+
+    def use(**behaviours):
+        clients.update({name: FakeClient(name, **behaviour) for name, behaviour in behaviours.items()})
+        return clients
+
+    monkeypatch.setattr(gateway, "get_client", lambda provider: clients[provider])
+    monkeypatch.setattr(gateway, "ttft", LatencyTracker())
+    return use
+
+
+def test_primary_is_used_when_it_works(providers):
+    clients = providers(groq={}, sambanova={})
+    completion = get_gateway("groq").chat(PRIMARY[1], MESSAGES)
+    assert (completion.provider, completion.model, completion.text) == (*PRIMARY, "Sir, zoos.")
+    assert completion.usage["estimated"] and not clients["sambanova"].streams
+
+
+def test_fails_over_before_the_first_chunk(providers):
+    providers(groq={"error": unavailable("groq")}, sambanova={})
+    completion = get_gateway("groq").chat(PRIMARY[1], MESSAGES)
+    assert (completion.provider, completion.model, completion.text) == (*FALLBACK, "Sir, zoos.")
+
+    completion = asyncio.run(get_gateway("groq").achat(PRIMARY[1], MESSAGES))
+    assert (completion.provider, completion.text) == ("sambanova", "Sir, zoos.")
+
+
+def test_no_failover_for_rejected_requests_or_after_text(providers):
+    rejected = LLMError("rejected", "groq", "m", "400")
+    clients = providers(groq={"error": rejected}, sambanova={})
+    with pytest.raises(LLMError) as error:
+        get_gateway("groq").chat(PRIMARY[1], MESSAGES)
+    assert error.value is rejected and not clients["sambanova"].streams
+
+    clients = providers(groq={"error": unavailable("groq"), "fail_after": 1}, sambanova={})
+    stream = get_gateway("groq").chat(PRIMARY[1], MESSAGES, stream=True)
+    with pytest.raises(LLMError):
+        list(stream)
+    assert stream.text == "Sir, " and not clients["sambanova"].streams
+
+
+def test_json_mode_fails_over_without_streaming(providers):
+    clients = providers(groq={"error": unavailable("groq")}, sambanova={})
+    completion = get_gateway("groq").chat(PRIMARY[1], MESSAGES, response_format={"type": "json_object"})
+    assert completion.provider == "sambanova" and not clients["sambanova"].streams
+
+
+def test_slow_primary_is_hedged_and_the_loser_cancelled(providers, monkeypatch):
+    monkeypatch.setattr(gateway, "hedge_delay", lambda provider, model: 0.05)
+    clients = providers(groq={"delay": 1}, sambanova={"chunks": ("Fast.",)})
+
+    async def main():
+        stream = await get_gateway("groq").achat(PRIMARY[1], MESSAGES, stream=True)
+        return stream, [chunk async for chunk in stream]
+
+    stream, chunks = asyncio.run(main())
+    assert chunks == ["Fast."] and stream.hedged and stream.provider == "sambanova"
+    assert clients["groq"].streams[0].closed
+    # The loser's wait is kept as a lower bound on its time to first token.
+    assert gateway.ttft.last_sample(*PRIMARY) is not None
+
+
+def test_fast_primary_is_not_hedged(providers, monkeypatch):
+    monkeypatch.setattr(gateway, "hedge_delay", lambda provider, model: 0.2)
+    clients = providers(groq={"delay": 0.01}, sambanova={})
+
+    async def main():
+        stream = await get_gateway("groq").achat(PRIMARY[1], MESSAGES, stream=True)
+        return stream, "".join([chunk async for chunk in stream])
+
+    stream, text = asyncio.run(main())
+    assert text == "Sir, zoos." and not stream.hedged and not clients["sambanova"].streams
+
+
+def test_p95_needs_enough_samples(monkeypatch):
+    monkeypatch.setattr(gateway, "HEDGE_MIN_SAMPLES", 20)
+    tracker = LatencyTracker(window=50)
+    for i in range(19):
+        tracker.record("groq", "m", i / 10)
+    assert tracker.p95("groq", "m") is None
+    tracker.record("groq", "m", 1.9)
+    assert tracker.p95("groq", "m") == pytest.approx(1.9)
+    assert tracker.p95("groq", "m", max_age=1e-9) is None
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from models.Research_Engine.index import EvidenceIndex, build_index, split_passages
+
+DOCUMENTS = [
+    {"title": "Tobacco report", "url": "https://who.int/tobacco", "date": "2023",
+     "text": "Cigarettes kill eight million people every year. Tobacco taxes cut smoking among the young."},
+    {"title": "Death penalty", "url": "https://amnesty.org/dp", "date": "2024",
+     "text": "More than two thirds of countries have abolished the death penalty in law or practice."},
+    {"title": "Voting", "url": "https://un.org/vote",
+     "text": "Compulsory voting in Australia keeps turnout above ninety percent."},
+]
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "docs.jsonl").write_text("\n".join(json.dumps(d) for d in DOCUMENTS), encoding="utf-8")
+    (corpus / "zoo.txt").write_text("Title: Zoos\nSource: https://bbc.com/zoos\n\nZoos breed endangered species.", encoding="utf-8")
+    build_index(str(corpus), str(tmp_path / "index"))
+    return str(tmp_path / "index")
+
+
+def test_search_returns_the_matching_passages(index_dir):
+    with EvidenceIndex(index_dir) as index:
+        assert len(index) == 4
+        passages = index.search("This House would ban cigarettes and tobacco")
+        assert [p.title for p in passages] == ["Tobacco report"]
+        assert passages[0].url == "https://who.int/tobacco" and passages[0].score > 0
+        assert index.search("abolish the death penalty")[0].date == "2024"
+        assert index.search("zoos")[0].url == "https://bbc.com/zoos"
+        assert index.search("quantum chromodynamics") == []
+
+
+def test_min_match_drops_passages_with_too_few_terms(index_dir):
+    with EvidenceIndex(index_dir) as index:
+        assert index.search("cigarettes zoos voting penalty", min_match=0.5) == []
+        assert index.search("cigarettes zoos voting penalty", k=5, min_match=0.2)
+
+
+def test_truncated_passages_file_raises_on_search(index_dir):
+    index = EvidenceIndex(index_dir)
+    with open(f"{index_dir}/passages.jsonl", "r+b") as file:
+        file.truncate(10)
+    with pytest.raises(ValueError):
+        index.search("cigarettes tobacco")
+    index.close()
+
+
+def test_broken_index_falls_back_to_the_web(index_dir, monkeypatch):
+    pytest.importorskip("webscout")
+    from models.Research_Engine import research
+
+    class Broken:
+        def search(self, *args):
+            raise OSError("I/O error")
+
+    monkeypatch.setattr(research, "evidence_index", lambda: Broken())
+    assert research.local_facts("THW ban cigarettes") is None
+
+
+def test_split_passages_caps_passage_length():
+    text = " ".join(f"w{i}" for i in range(250)) + "\n\nshort paragraph"
+    passages = list(split_passages(text, words=100))
+    assert [len(p.split()) for p in passages] == [100, 100, 52]
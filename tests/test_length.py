@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from models.LLM_Engine.clients import Completion
+from models.LLM_Engine.length import LengthTarget, TimedStream, _next_request, atimed_chat, count_words, timed_chat
+
+TARGET = LengthTarget(1, wpm=100)
+MESSAGES = [{"role": "system", "content": "Write speeches."}, {"role": "user", "content": "Motion: THW ban zoos"}]
+
+
+def words(n, word="word"):
+    return " ".join(f"{word}{i}" for i in range(n))
+
+
+def test_word_budget_follows_the_voice():
+    assert LengthTarget(7).words == 980 and LengthTarget(7).min_words == 833
+    assert LengthTarget.for_voice(7, "en-US-GuyNeural", "+10%").words == 1160
+    assert TARGET.max_tokens() == 150 and TARGET.max_tokens(20) == 30
+    assert TARGET.missing(words(85)) == 0 and TARGET.missing(words(60)) == 40
+
+
+def test_only_the_missing_part_is_requested():
+    assert _next_request(MESSAGES, TARGET, words(90), "stop") is None
+
+    follow_up, max_tokens = _next_request(MESSAGES, TARGET, words(60), "stop")
+    assert follow_up[0] == MESSAGES[0] and len(follow_up) == 2 and max_tokens == TARGET.max_tokens(40)
+    parts = follow_up[-1]["parts"]
+    assert parts[0] == MESSAGES[-1]["content"] and parts[-1] == words(60)
+    assert "one more section of about 40 words" in parts[2]
+
+    # Cut off by the token limit: continued even when it is nearly long enough.
+    follow_up, max_tokens = _next_request(MESSAGES, TARGET, words(95), "length")
+    assert "Continue it from exactly the next word" in follow_up[-1]["parts"][2]
+    assert max_tokens == TARGET.max_tokens(10)
+
+
+class Call:
+    """A RoutedCall that answers with the queued (text, finish_reason) pairs, whole or streamed."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.requests = []
+
+    def chat(self, messages, max_tokens=None, **options):
+        self.requests.append((messages, max_tokens))
+        text, finish_reason = self.answers.pop(0)
+        return Completion(text, "groq", "m", finish_reason)
+
+    async def achat(self, messages, max_tokens=None, stream=False, **options):
+        completion = self.chat(messages, max_tokens)
+        return Stream(completion) if stream else completion
+
+
+class Stream:
+    def __init__(self, completion):
+        self.completion = completion
+        self.finish_reason = None
+
+    async def __aiter__(self):
+        for piece in self.completion.text.split(" "):
+            yield piece + " "
+        self.finish_reason = self.completion.finish_reason
+
+
+SHORT = f"Opening {words(30, 'a')}\n{words(30, 'b')}\nIn conclusion {words(5, 'c')}"
+
+
+def test_short_speech_gets_a_section_before_its_conclusion():
+    call = Call((SHORT, "stop"), (f"Extension {words(30, 'd')}", "stop"))
+    speech = timed_chat(call, MESSAGES, TARGET)
+    assert speech.segments == 2 and len(call.requests) == 2
+    lines = speech.text.split("\n")
+    assert lines[2].startswith("Extension") and lines[-1].startswith("In conclusion")
+    assert call.requests[1][1] == TARGET.max_tokens(100 - count_words(SHORT))
+
+
+def test_cut_speech_is_continued_until_it_ends():
+    call = Call((words(40, "a") + " mid", "length"), ("sentence " + words(20, "b"), "length"), (words(40, "c"), "stop"))
+    speech = asyncio.run(atimed_chat(call, MESSAGES, TARGET))
+    assert speech.segments == 3 and speech.finish_reason == "stop"
+    assert " mid sentence b0 " in speech.text and speech.text.endswith("c39")
+
+
+@pytest.mark.parametrize("answers", [
+    [(SHORT, "stop"), (f"Extension {words(30, 'd')}", "stop")],
+    [(words(40, "a") + " mid", "length"), ("sentence " + words(60, "b"), "stop")],
+    [(words(90), "stop")],
+])
+def test_stream_yields_exactly_its_text(answers):
+    stream = TimedStream(Call(*answers), MESSAGES, TARGET, {})
+
+    async def collect():
+        return "".join([chunk async for chunk in stream])
+
+    assert asyncio.run(collect()) == stream.text
+    assert stream.segments == len(answers)
+
+
+def test_stream_puts_the_extension_before_the_conclusion():
+    stream = TimedStream(Call((SHORT, "stop"), (f"Extension {words(30, 'd')}", "stop")), MESSAGES, TARGET, {})
+
+    async def collect():
+        return [chunk async for chunk in stream]
+
+    chunks = asyncio.run(collect())
+    streamed = "".join(chunks)
+    assert len(chunks) > 1 and streamed.index("Extension") < streamed.index("In conclusion")
+    assert stream.text.split("\n")[-1].startswith("In conclusion")
@@ -0,0 +1,55 @@
+import pytest
+
+from models.LLM_Engine.motions import MotionIndex, expand, motion_hash
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    return MotionIndex(path=str(tmp_path_factory.mktemp("motions") / "motions.json"))
+
+
+@pytest.mark.parametrize("typed, known", [
+    ("thw ban ciggrate ", "This House would ban cigarettes"),
+    ("THW ban cigarettes", "This House would ban cigarettes"),
+    ("This House would ban cigarette", "This House would ban cigarettes"),
+    ("TH would ban tiktok", "This House would ban TikTok"),
+    ("THW ban cryptocurrency", "This House would ban cryptocurrencies"),
+    ("thw abolish death penalty", "This House would abolish the death penalty"),
+    ("thw ban private school", "This House would ban private schools"),
+    ("THBT tiktok has done more harm than good", "This House believes that TikTok has done more harm than good"),
+])
+def test_ways_of_typing_a_known_motion_match_it(index, typed, known):
+    motion, score = index.match(typed)
+    assert motion is not None and motion.text == known
+    assert motion.id == motion_hash(known)
+
+
+@pytest.mark.parametrize("typed", [
+    "THW ban cryptocurrency mining",
+    "THW abolish the death penalty in the US",
+    "THW not ban cigarettes",
+    "THW unban cigarettes",
+    "THW ban social media for children under 18",
+    "THBT TikTok has done more good than harm",
+    "THR ban cigarettes",
+    "THW ban tiktok for children",
+])
+def test_different_motions_do_not_match(index, typed):
+    motion, _ = index.match(typed)
+    assert motion is None
+
+
+def test_learned_motion_keeps_its_id(tmp_path):
+    index = MotionIndex(path=str(tmp_path / "motions.json"))
+    learned = index.learn("thw ban cars in city centres")
+    assert learned.text == "This House would ban cars in city centres"
+    assert index.match("This House would ban cars in city centres")[0] == learned
+    assert index.match("THW ban cars")[0] is None
+
+    index.save()
+    assert MotionIndex(path=str(tmp_path / "motions.json")).match("thw ban cars in city centres")[0] == learned
+
+
+def test_expand():
+    assert expand("thbt  x  y") == "This House believes that x y"
+    assert expand("ban cars") == "ban cars"
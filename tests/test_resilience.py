@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from models.LLM_Engine import resilience
+from models.LLM_Engine.resilience import CircuitBreaker, LLMError, aretry_call, aretry_stream, retry_call, retry_stream
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff", lambda attempt, error=None: 0)
+
+
+def breaker(name, failures=1, reset=0.05):
+    resilience._breakers[(name, "m")] = CircuitBreaker(name, "m", failures=failures, reset=reset)
+    return resilience._breakers[(name, "m")]
+
+
+def timeout():
+    raise httpx.ReadTimeout("slow")
+
+
+def opened(name):
+    b = breaker(name)
+    with pytest.raises(LLMError):
+        retry_call(name, "m", timeout, attempts=1)
+    assert b.state == "open"
+    return b
+
+
+def test_retries_transient_failures_then_succeeds():
+    breaker("flaky", failures=5)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) < 3:
+            raise httpx.ConnectError("down")
+        return "ok"
+
+    assert retry_call("flaky", "m", fn, attempts=3) == "ok"
+    assert len(calls) == 3
+
+
+def test_rejected_request_is_not_retried_and_keeps_the_breaker_closed():
+    b = breaker("rejecting")
+    calls = []
+
+    def fn():
+        calls.append(1)
+        request = httpx.Request("POST", "http://x")
+        raise httpx.HTTPStatusError("bad", request=request, response=httpx.Response(400, request=request))
+
+    with pytest.raises(LLMError) as error:
+        retry_call("rejecting", "m", fn, attempts=3)
+    assert error.value.kind == "rejected" and len(calls) == 1
+    assert b.state == "closed"
+
+
+def test_open_breaker_fails_fast_then_lets_one_trial_through():
+    b = opened("tripped")
+    with pytest.raises(LLMError) as error:
+        retry_call("tripped", "m", lambda: "ok", attempts=1)
+    assert error.value.kind == "circuit_open"
+    time.sleep(0.06)
+    assert retry_call("tripped", "m", lambda: "ok", attempts=1) == "ok"
+    assert b.state == "closed"
+
+
+def test_failed_trial_reopens():
+    b = opened("retripped")
+    time.sleep(0.06)
+    with pytest.raises(LLMError):
+        retry_call("retripped", "m", timeout, attempts=1)
+    assert b.state == "open"
+
+
+def test_cancelled_half_open_call_releases_the_trial():
+    b = opened("cancelled-call")
+    time.sleep(0.06)
+
+    async def main():
+        task = asyncio.create_task(aretry_call("cancelled-call", "m", lambda: asyncio.sleep(10), attempts=1))
+        await asyncio.sleep(0.01)
+        assert b.state == "half_open"
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await aretry_call("cancelled-call", "m", lambda: asyncio.sleep(0, "ok"), attempts=1)
+
+    assert asyncio.run(main()) == "ok"
+    assert b.state == "closed"
+
+
+def test_cancelled_half_open_stream_releases_the_trial():
+    b = opened("cancelled-stream")
+    time.sleep(0.06)
+
+    async def chunks():
+        yield "a"
+        await asyncio.sleep(10)
+        yield "b"
+
+    async def main():
+        stream = aretry_stream("cancelled-stream", "m", chunks, attempts=1)
+        assert await stream.__anext__() == "a"
+        assert b.state == "half_open"
+        await stream.aclose()
+
+    asyncio.run(main())
+    assert b.state == "open"
+    assert list(retry_stream("cancelled-stream", "m", lambda: iter("ok"), attempts=1)) == ["o", "k"]
+    assert b.state == "closed"
+
+
+def test_closed_sync_stream_releases_the_trial():
+    b = opened("closed-stream")
+    time.sleep(0.06)
+    stream = retry_stream("closed-stream", "m", lambda: iter("abc"), attempts=1)
+    next(stream)
+    stream.close()
+    assert b.state == "open"
+    assert retry_call("closed-stream", "m", lambda: "ok", attempts=1) == "ok"
+
+
+def test_trial_that_never_reports_back_is_replaced():
+    b = opened("lost-trial")
+    time.sleep(0.06)
+    b.allow()
+    assert b.state == "half_open"
+    with pytest.raises(LLMError):
+        b.allow()
+    time.sleep(0.06)
+    b.allow()
+    assert b.state == "half_open"
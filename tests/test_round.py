@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("edge_tts")
+pytest.importorskip("pygame")
+pytest.importorskip("webscout")
+
+from models.Asain_Par import common, thread_runner
+from models.Asain_Par.templates import ORDER
+from models.Asain_Par.thread_runner import Step, run_dag, run_round
+from models.LLM_Engine import motions
+from models.LLM_Engine.admission import current_priority
+
+
+def sleeper(seconds, result=None, levels=None):
+    async def run():
+        if levels is not None:
+            levels.append(current_priority())
+        await asyncio.sleep(seconds)
+        return result
+    return run
+
+
+def test_steps_start_as_soon_as_their_dependencies_finish():
+    levels = []
+    steps = [
+        Step("a", sleeper(0.05, "a")),
+        Step("b", sleeper(0, "b", levels), ("a",), "batch"),
+        Step("c", sleeper(0.05, "c", levels), (), "live"),
+    ]
+    done = asyncio.run(run_dag(steps))
+    assert [done[name].status for name in "abc"] == ["done"] * 3
+    assert done["c"].started < done["a"].finished <= done["b"].started
+    assert levels == ["live", "batch"]
+
+
+def test_failed_step_skips_what_waits_for_it_only():
+    async def fail():
+        raise RuntimeError("provider down")
+
+    steps = [
+        Step("a", fail),
+        Step("b", sleeper(0), ("a",)),
+        Step("c", sleeper(0), ("b",)),
+        Step("d", sleeper(0.01, "d")),
+    ]
+    done = asyncio.run(run_dag(steps))
+    assert done["a"].error == "provider down"
+    assert done["b"].error == "skipped: a failed" and done["c"].error == "skipped: b failed"
+    assert done["b"].started is None and done["d"].result == "d"
+
+
+def test_dependencies_must_be_listed_first():
+    async def main():
+        await run_dag([Step("b", sleeper(0), ("a",)), Step("a", sleeper(0))])
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+
+
+@pytest.fixture
+def fake_round(tmp_path, monkeypatch):
+    calls = []
+
+    async def research(motion):
+        calls.append(("research", current_priority()))
+        await asyncio.sleep(0.05)
+        return "facts"
+
+    async def speech(role, motion, earlier=(), bypass_cache=False):
+        calls.append((role, current_priority(), tuple(key for key, _ in earlier)))
+        return f"{role} speech"
+
+    async def audio(text, role, path):
+        calls.append((f"tts:{role}", text))
+
+    async def pois(motion, side, bypass_cache=False):
+        calls.append((f"poi:{side}", current_priority()))
+        return f"{side} POIs"
+
+    monkeypatch.setattr(motions, "_index", motions.MotionIndex(path=str(tmp_path / "motions.json")))
+    monkeypatch.setattr(thread_runner, "ROUNDS_DIR", str(tmp_path / "rounds"))
+    monkeypatch.setattr(thread_runner, "afetch_latest_info", research)
+    monkeypatch.setattr(thread_runner, "Chatbot_async", pois)
+    monkeypatch.setattr(common, "generate_speech_async", speech)
+    monkeypatch.setattr(common, "TextToSpeechAudioFile", audio)
+    return calls
+
+
+def test_round_chains_the_speeches_and_runs_the_rest_alongside(fake_round):
+    calls = fake_round
+    current = asyncio.run(run_round("thw ban zoos"))
+    data = current.to_dict()
+    assert data["status"] == "done" and data["speeches"] == {role: f"{role} speech" for role in ORDER}
+    assert set(data["pois"]) == {"proposition", "opposition"} and len(data["audio"]) == len(ORDER)
+
+    speeches = [call for call in calls if call[0] in ORDER]
+    assert [call[2] for call in speeches] == [tuple(ORDER[:i]) for i in range(len(ORDER))]
+    assert all(call[1] == "batch" for call in calls if not call[0].startswith("tts:"))
+    # The POIs wait for nothing: they start before the research is back.
+    steps = current.steps
+    assert steps["poi:proposition"].started < steps["research"].finished <= steps["speech:pm"].started
+    assert thread_runner.get_round("This House would ban zoos") is current
@@ -0,0 +1,132 @@
+import asyncio
+import random
+
+import pytest
+
+from models.LLM_Engine.sanitize import Sanitizer, sanitize, sanitize_stream
+
+
+def streamed(text, size):
+    async def chunks():
+        for i in range(0, len(text), size):
+            yield text[i:i + size]
+
+    async def collect():
+        return "".join([chunk async for chunk in sanitize_stream(chunks())]).rstrip()
+
+    return asyncio.run(collect())
+
+
+def assert_clean(text, expected):
+    assert sanitize(text) == expected
+    for size in (1, 3, 17):
+        assert streamed(text, size) == expected
+
+
+@pytest.mark.parametrize("line", [
+    "Note that the policy only binds the state:",
+    "Sources of revenue for the government:",
+    "Notes on the model:",
+    "References to the constitution matter here:",
+])
+def test_colon_lines_are_text(line):
+    text = f"Speech opening.\n{line}\nFirst, taxes on tobacco.\nSecond, fines."
+    assert_clean(text, text)
+
+
+def test_heading_followed_by_prose_is_text():
+    text = "Our case rests on evidence.\nSources:\nThe first source of harm is addiction.\nThank you."
+    assert_clean(text, text)
+
+
+def test_trailing_sources_section_is_dropped():
+    text = (
+        "Thank you, Madam Speaker.\n\nSources:\n1. WHO, Tobacco fact sheet, 2023\n"
+        "- https://www.who.int/news-room/fact-sheets\n[3] bbc.com"
+    )
+    assert_clean(text, "Thank you, Madam Speaker.")
+
+
+def test_word_count_line_is_dropped():
+    assert_clean("I beg to propose.\nWord count: 1,040", "I beg to propose.")
+
+
+@pytest.mark.parametrize("text", [
+    "The opposition (points of information were refused) never answered.",
+    "They looked away (looks matter less than substance) from the question.",
+    "The state turns (turns out it is not neutral) against its citizens.",
+    "Our policy [points 1 and 2 above] stands.",
+])
+def test_brackets_with_content_are_kept(text):
+    assert_clean(text, text)
+
+
+@pytest.mark.parametrize("direction", [
+    "(pause for emphasis)", "(Pause)", "[applause]", "(dramatic pause)", "(pauses briefly)",
+    "(turns to the opposition bench)", "(looks at the audience)", "(clears throat)", "[to the chair]",
+    "(smiles slowly and looks to the house)", "(speaking slowly)",
+])
+def test_stage_directions_are_removed(direction):
+    assert_clean(f"This motion matters {direction} to every smoker.", "This motion matters to every smoker.")
+
+
+def test_first_line_that_is_not_an_announcement_is_kept():
+    text = "Here is the thing: no speech this house hears today will change the facts.\nThe facts are clear."
+    assert_clean(text, text)
+
+
+@pytest.mark.parametrize("preamble", [
+    "Here is your 7 minute speech as the Prime Minister:",
+    "Sure! Here's a 7-minute speech for the Leader of Opposition on the motion:",
+    "Here is the Prime Minister's speech:",
+    "Here are three POIs for the Opposition:",
+])
+def test_preamble_is_dropped(preamble):
+    assert_clean(f"{preamble}\nMadam Speaker, we propose.", "Madam Speaker, we propose.")
+
+
+def test_sources_listed_by_name_are_dropped():
+    text = "I beg to propose.\nSources:\n- BBC News\n- The Guardian, climate desk\n- https://un.org/report"
+    assert_clean(text, "I beg to propose.")
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Longer than DECIDE_AT, so a stream lets the start of the line through before the rule.
+    ("The first point is that the state owes its citizens protection ---\nSecond point",
+     "The first point is that the state owes its citizens protection ---\nSecond point"),
+    ("First point\n---\nSecond point", "First point\nSecond point"),
+    ("First point\n  - - -  \nSecond point", "First point\nSecond point"),
+])
+def test_only_whole_lines_are_rules(text, expected):
+    assert_clean(text, expected)
+    for cut in (text.index("-"), text.index("-") - 1):
+        assert split_at(text, [cut], speech=True) == expected
+
+
+# Pieces that exercise every rule, joined at random so their boundaries fall anywhere.
+FRAGMENTS = [
+    "Here is your speech:", "Sure, here is the revised speech:", "Sources:", "References", "Note that:",
+    "https://bbc.com/x", "www.un.org", "- BBC News", "[1]", "2023", "Word count: 950",
+    "(pauses)", "[applause]", "(smiles and looks to the house)", "(points of information were refused)",
+    "**bold**", "# ", "> ", "---", "- - -", "===", "_", "*", "=", "-", "(", ")", "</s>", "<|eot_id|>",
+    "Madam Speaker, ", "The motion", "text", " ", " ", "\n", "\n", "\n\n", "x" * 60,
+]
+
+
+def split_at(text, cuts, speech):
+    sanitizer = Sanitizer(speech)
+    bounds = [0, *cuts, len(text)]
+    out = [sanitizer.feed(text[a:b]) for a, b in zip(bounds, bounds[1:])]
+    return ("".join(out) + sanitizer.finish()).rstrip()
+
+
+@pytest.mark.parametrize("speech", [True, False])
+def test_stream_matches_whole_text_however_it_is_split(speech):
+    rng = random.Random(16)
+    for _ in range(300):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 14)))
+        whole = sanitize(text, speech)
+        for cut in range(1, len(text)):
+            assert split_at(text, [cut], speech) == whole, (text, cut)
+        cuts = sorted(rng.sample(range(1, len(text)), min(len(text) - 1, 8))) if len(text) > 1 else []
+        assert split_at(text, cuts, speech) == whole, (text, cuts)